@@ -0,0 +1,82 @@
+"""Measure the cost of importing the client and building it
+
+Usage:
+    python -m benchmarks.import_time [--runs N] [--module killbill]
+
+Each run starts a fresh interpreter so nothing is cached between runs.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = {
+    "import": "import {module}",
+    "construct": (
+        "from killbill import KillBillClient; KillBillClient('admin', 'password')"
+    ),
+    "sub-client": (
+        "from killbill import KillBillClient; "
+        "KillBillClient('admin', 'password').account"
+    ),
+}
+
+TIMER = (
+    "import time; _start = time.perf_counter(); {snippet}; "
+    "print(time.perf_counter() - _start)"
+)
+
+
+def measure(snippet: str, runs: int) -> float:
+    """Median wall-clock time in seconds of running `snippet` in a new process"""
+
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(snippet=snippet)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output))
+
+    return statistics.median(timings)
+
+
+def heaviest_imports(module: str, count: int = 10) -> list:
+    """Slowest cumulative imports reported by `python -X importtime`"""
+
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.strip()))
+
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--module", default="killbill")
+    args = parser.parse_args()
+
+    for name, snippet in SNIPPETS.items():
+        seconds = measure(snippet.format(module=args.module), args.runs)
+        print(f"{name:<12} {seconds * 1000:8.1f} ms")
+
+    print("\nHeaviest imports (cumulative):")
+    for cumulative, name in heaviest_imports(args.module):
+        print(f"{cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
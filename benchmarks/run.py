@@ -0,0 +1,254 @@
+"""Benchmark the client's hot paths against a local Kill Bill stub
+
+Usage:
+    python -m benchmarks.run [--transport http|inprocess] [--calls N]
+                             [--threads N] [--compare results/old.json]
+
+Results are written to `benchmarks/results/` so they can be compared
+between releases.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+from benchmarks.stub_server import StubServer, handler
+from killbill import Header, InProcessTransport, KillBillClient
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+ACCOUNT_ID = str(uuid.UUID(int=1))
+
+# name -> (sync call, async call)
+SCENARIOS = {
+    "account.create": (
+        lambda kb, h: kb.account.create(h, name="Customer", currency="USD"),
+        lambda kb, h: kb.account.create(h, name="Customer", currency="USD"),
+    ),
+    "account.list": (
+        lambda kb, h: kb.account.list(h, limit=100),
+        lambda kb, h: kb.account.list(h, limit=100),
+    ),
+    "account.invoices": (
+        lambda kb, h: kb.account.invoices(h, ACCOUNT_ID),
+        lambda kb, h: kb.account.invoices(h, ACCOUNT_ID),
+    ),
+    "subscription.create_with_add_ons": (
+        lambda kb, h: kb.subscription.create_with_add_ons(
+            h, ACCOUNT_ID, "standard-monthly", ["standard-addon"]
+        ),
+        lambda kb, h: kb.subscription.create_with_add_ons(
+            h, ACCOUNT_ID, "standard-monthly", ["standard-addon"]
+        ),
+    ),
+    "catalog.retrieve": (
+        lambda kb, h: kb.catalog.retrieve(h),
+        lambda kb, h: kb.catalog.retrieve(h),
+    ),
+    "account.add_custom_fields": (
+        lambda kb, h: kb.account.add_custom_fields(h, ACCOUNT_ID, {"a": "b"}),
+        lambda kb, h: kb.account.add_custom_fields(h, ACCOUNT_ID, {"a": "b"}),
+    ),
+    "account.get_custom_fields": (
+        lambda kb, h: kb.account.get_custom_fields(h, ACCOUNT_ID),
+        lambda kb, h: kb.account.get_custom_fields(h, ACCOUNT_ID),
+    ),
+}
+
+HEADER = Header(api_key="bench", api_secret="bench", created_by="bench")
+
+
+def _version() -> str:
+    try:
+        return metadata.version("python-killbill-client")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+def _client(args, url):
+    if args.transport == "inprocess":
+        return KillBillClient(
+            "admin", "password", transport=InProcessTransport(handler)
+        )
+
+    return KillBillClient("admin", "password", api_url=url, pool_maxsize=args.threads)
+
+
+def _async_client(args, url):
+    from killbill.aio import (
+        AsyncInProcessTransport,
+        AsyncKillBillClient,
+    )
+
+    if args.transport == "inprocess":
+        return AsyncKillBillClient(
+            "admin", "password", transport=AsyncInProcessTransport(handler)
+        )
+
+    return AsyncKillBillClient(
+        "admin", "password", api_url=url, max_connections=args.concurrency
+    )
+
+
+def bench_sequential(call, client, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        call(client, HEADER)
+    return calls / (time.perf_counter() - started)
+
+
+def bench_threaded(call, client, calls, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: call(client, HEADER), range(calls)):
+            pass
+    return calls / (time.perf_counter() - started)
+
+
+async def bench_async(call, client, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call(client, HEADER)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(calls)])
+    return calls / (time.perf_counter() - started)
+
+
+def measure_allocations(call, client, calls):
+    """Peak traced memory and bytes allocated and kept per call"""
+
+    call(client, HEADER)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(calls):
+        call(client, HEADER)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_bytes": peak - before,
+        "retained_bytes_per_call": (after - before) / calls,
+    }
+
+
+def run(args):
+    server = StubServer().start() if args.transport == "http" else None
+    url = server.url if server else None
+    results = {}
+
+    try:
+        client = _client(args, url)
+
+        has_async = importlib.util.find_spec("httpx") is not None
+
+        for name, (sync_call, async_call) in SCENARIOS.items():
+            if args.scenario and name not in args.scenario:
+                continue
+
+            result = {
+                "sequential_calls_per_sec": bench_sequential(
+                    sync_call, client, args.calls
+                ),
+                "threaded_calls_per_sec": bench_threaded(
+                    sync_call, client, args.calls, args.threads
+                ),
+            }
+
+            if has_async:
+
+                async def run_async(call=async_call):
+                    async with _async_client(args, url) as async_client:
+                        return await bench_async(
+                            call, async_client, args.calls, args.concurrency
+                        )
+
+                result["async_calls_per_sec"] = asyncio.run(run_async())
+
+            result.update(measure_allocations(sync_call, client, min(args.calls, 200)))
+            results[name] = result
+            print(_format_row(name, result), flush=True)
+
+        client.close()
+    finally:
+        if server:
+            server.stop()
+
+    return results
+
+
+def _format_row(name, result):
+    rates = " ".join(
+        f"{key.replace('_calls_per_sec', '')}={value:,.0f}/s"
+        for key, value in result.items()
+        if key.endswith("_calls_per_sec")
+    )
+    return f"{name:<36} {rates} peak={result['peak_bytes'] / 1024:,.1f}KiB"
+
+
+def compare(results, previous_path):
+    previous = json.loads(Path(previous_path).read_text())["results"]
+    print(f"\nCompared to {previous_path}:")
+    for name, result in results.items():
+        old = previous.get(name)
+        if not old:
+            continue
+        for key, value in result.items():
+            if key in old and old[key]:
+                change = (value - old[key]) / old[key] * 100
+                print(f"  {name:<36} {key:<28} {change:+.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transport", choices=("http", "inprocess"), default="http")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--scenario", action="append", help="Run only this scenario")
+    parser.add_argument("--compare", help="Previous results file to compare with")
+    parser.add_argument(
+        "--output", help="Results file, defaults to benchmarks/results/"
+    )
+    args = parser.parse_args()
+
+    results = run(args)
+
+    document = {
+        "version": _version(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": vars(args),
+        "results": results,
+    }
+
+    output = (
+        Path(args.output)
+        if args.output
+        else RESULTS_DIR
+        / (
+            f"{document['version']}-{args.transport}-"
+            f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.json"
+        )
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
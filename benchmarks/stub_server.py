@@ -0,0 +1,220 @@
+"""Local stand-in speaking the Kill Bill endpoints used by the benchmarks
+
+Run it standalone with `python -m benchmarks.stub_server --port 8080`.
+"""
+
+import argparse
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from killbill.transport import Request, Response
+
+PREFIX = "/1.0/kb/"
+TOTAL_ACCOUNTS = 10_000
+
+
+def _account(index: int) -> dict:
+    return {
+        "accountId": str(uuid.UUID(int=index)),
+        "name": f"Customer {index}",
+        "externalKey": f"customer-{index}",
+        "email": f"customer-{index}@example.com",
+        "currency": "USD",
+        "billCycleDayLocal": 1,
+        "timeZone": "UTC",
+        "country": "US",
+        "isMigrated": False,
+        "auditLogs": [],
+    }
+
+
+def _invoice(account_id: str, index: int) -> dict:
+    invoice_id = str(uuid.UUID(int=index + 1_000_000))
+    return {
+        "invoiceId": invoice_id,
+        "accountId": account_id,
+        "amount": 24.95,
+        "currency": "USD",
+        "status": "COMMITTED",
+        "balance": 0,
+        "invoiceDate": "2024-01-01",
+        "targetDate": "2024-01-01",
+        "invoiceNumber": str(index),
+        "items": [
+            {
+                "invoiceItemId": str(uuid.UUID(int=index + 2_000_000)),
+                "invoiceId": invoice_id,
+                "accountId": account_id,
+                "itemType": "RECURRING",
+                "planName": "standard-monthly",
+                "phaseName": "standard-monthly-evergreen",
+                "amount": 24.95,
+                "currency": "USD",
+                "startDate": "2024-01-01",
+                "endDate": "2024-02-01",
+            }
+        ],
+        "auditLogs": [],
+    }
+
+
+CATALOG = [
+    {
+        "name": "Standard",
+        "effectiveDate": "2024-01-01T00:00:00.000Z",
+        "currencies": ["USD"],
+        "products": [
+            {
+                "type": "BASE",
+                "name": name,
+                "plans": [
+                    {
+                        "name": f"{name.lower()}-monthly",
+                        "billingPeriod": "MONTHLY",
+                        "phases": [
+                            {
+                                "type": "EVERGREEN",
+                                "prices": [{"currency": "USD", "value": 24.95}],
+                                "duration": {"unit": "UNLIMITED", "number": -1},
+                            }
+                        ],
+                    }
+                ],
+                "included": [],
+                "available": [f"{name.lower()}-addon"],
+            }
+            for name in ("Standard", "Sports", "Super", "Premium")
+        ],
+        "priceLists": [{"name": "DEFAULT", "plans": ["standard-monthly"]}],
+    }
+]
+
+CUSTOM_FIELDS = [
+    {
+        "customFieldId": str(uuid.UUID(int=3_000_000 + i)),
+        "objectType": "ACCOUNT",
+        "name": f"field-{i}",
+        "value": f"value-{i}",
+    }
+    for i in range(5)
+]
+
+_ID = r"[0-9a-f-]{36}"
+
+
+def handle(method: str, path: str, params: dict) -> Response:
+    """Route a request to its canned response"""
+
+    endpoint = path[len(PREFIX) :] if path.startswith(PREFIX) else path
+
+    if method == "POST" and endpoint == "accounts":
+        account_id = uuid.uuid4()
+        return Response(201, headers={"Location": f"{PREFIX}accounts/{account_id}"})
+
+    if method == "GET" and endpoint == "accounts/pagination":
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 100))
+        end = min(offset + limit, TOTAL_ACCOUNTS)
+        headers = {"X-Killbill-Pagination-TotalNbRecords": str(TOTAL_ACCOUNTS)}
+        if end < TOTAL_ACCOUNTS:
+            headers["X-Killbill-Pagination-NextOffset"] = str(end)
+        return Response(200, [_account(i) for i in range(offset, end)], headers)
+
+    match = re.fullmatch(rf"accounts/({_ID})/invoices", endpoint)
+    if method == "GET" and match:
+        return Response(200, [_invoice(match.group(1), i) for i in range(12)])
+
+    match = re.fullmatch(rf"accounts/({_ID})/customFields", endpoint)
+    if match:
+        if method == "POST":
+            location = f"{PREFIX}accounts/{match.group(1)}/customFields"
+            return Response(201, headers={"Location": location})
+        if method == "GET":
+            return Response(200, CUSTOM_FIELDS)
+
+    if method == "POST" and endpoint == "subscriptions/createSubscriptionWithAddOns":
+        bundle_id = uuid.uuid4()
+        return Response(201, headers={"Location": f"{PREFIX}bundles/{bundle_id}"})
+
+    if method == "GET" and endpoint == "catalog":
+        return Response(200, CATALOG)
+
+    return Response(404, {"message": f"No stub for {method} {path}"})
+
+
+def handler(request: Request) -> Response:
+    """Handler for `InProcessTransport`"""
+
+    return handle(request.method, request.path, request.params)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        response = handle(self.command, url.path, params)
+
+        self.send_response(response.status_code)
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering with canned Kill Bill responses"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _RequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread"""
+
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port)
+    print(f"Kill Bill stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
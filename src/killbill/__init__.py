@@ -1,7 +1,35 @@
+from killbill.cache import CacheStats, EntityCache
+from killbill.catalog_index import Catalog, CatalogIndex
+from killbill.codec import JsonCodec
 from killbill.header import Header
+from killbill.hooks import Hook, RequestContext
+from killbill.index import AccountIndex, ExternalKey
 from killbill.killbill import KillBillClient
+from killbill.metrics import Metrics
+from killbill.retry import RetryPolicy
+from killbill.transport import (
+    HttpxTransport,
+    InProcessTransport,
+    RequestsTransport,
+    Transport,
+)
 
 __all__ = [
     "KillBillClient",
     "Header",
+    "RetryPolicy",
+    "Hook",
+    "RequestContext",
+    "Metrics",
+    "Transport",
+    "RequestsTransport",
+    "HttpxTransport",
+    "InProcessTransport",
+    "EntityCache",
+    "CacheStats",
+    "AccountIndex",
+    "ExternalKey",
+    "JsonCodec",
+    "Catalog",
+    "CatalogIndex",
 ]
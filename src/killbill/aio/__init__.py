@@ -0,0 +1,13 @@
+from killbill.aio.killbill import AsyncKillBillClient
+from killbill.aio.transport import (
+    AsyncHttpxTransport,
+    AsyncInProcessTransport,
+    AsyncTransport,
+)
+
+__all__ = [
+    "AsyncKillBillClient",
+    "AsyncTransport",
+    "AsyncHttpxTransport",
+    "AsyncInProcessTransport",
+]
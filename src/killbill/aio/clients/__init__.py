@@ -0,0 +1,27 @@
+from killbill.aio.clients.account import AccountClient
+from killbill.aio.clients.base import (
+    AsyncBaseClientWithCustomFields,
+    AsyncBaseClientWithTags,
+)
+from killbill.aio.clients.bundle import BundleClient
+from killbill.aio.clients.catalog import CatalogClient
+from killbill.aio.clients.credit import CreditClient
+from killbill.aio.clients.invoice import InvoiceClient
+from killbill.aio.clients.overdue import OverdueClient
+from killbill.aio.clients.subscription import SubscriptionClient
+from killbill.aio.clients.tenant import TenantClient
+from killbill.aio.clients.test import TestClient
+
+__all__ = [
+    "AsyncBaseClientWithTags",
+    "AsyncBaseClientWithCustomFields",
+    "AccountClient",
+    "BundleClient",
+    "CatalogClient",
+    "SubscriptionClient",
+    "TenantClient",
+    "OverdueClient",
+    "TestClient",
+    "InvoiceClient",
+    "CreditClient",
+]
@@ -0,0 +1,791 @@
+from typing import Iterable, List, Optional, Union
+
+from killbill.aio.clients.base import (
+    AsyncBaseClientWithCustomFields,
+    AsyncBaseClientWithTags,
+)
+from killbill.bulk import AsyncBulkRun
+from killbill.clients.account import AccountClient as SyncAccountClient
+from killbill.enums import Audit, BlockingStateType, ObjectType, TransactionType
+from killbill.header import Header
+
+
+class AccountClient(AsyncBaseClientWithCustomFields, AsyncBaseClientWithTags):
+    """Asynchronous client for the Kill Bill account API"""
+
+    async def create(
+        self,
+        header: Header,
+        name=None,
+        first_name_length=None,
+        external_key=None,
+        email=None,
+        bill_cycle_day_local=None,
+        currency=None,
+        time_zone=None,
+        locale=None,
+        address1=None,
+        address2=None,
+        postal_code=None,
+        company=None,
+        city=None,
+        state=None,
+        country=None,
+        phone=None,
+        notes=None,
+        is_migrated: bool = None,
+    ):
+        """Creates account
+
+        Returns:
+            str or None: The account's ID or None if the request failed.
+        """
+
+        payload = SyncAccountClient._create_payload(
+            name=name,
+            first_name_length=first_name_length,
+            external_key=external_key,
+            email=email,
+            bill_cycle_day_local=bill_cycle_day_local,
+            currency=currency,
+            time_zone=time_zone,
+            locale=locale,
+            address1=address1,
+            address2=address2,
+            postal_code=postal_code,
+            company=company,
+            city=city,
+            state=state,
+            country=country,
+            phone=phone,
+            notes=notes,
+            is_migrated=is_migrated,
+        )
+
+        response = await self._post(
+            "accounts",
+            payload=payload,
+            headers=self._json_headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        account_id = self._get_uuid(response.headers.get("Location"))
+
+        if external_key and self.account_index is not None:
+            self.account_index.set(header.api_key, external_key, account_id)
+
+        return account_id
+
+    def create_many(
+        self,
+        header: Header,
+        accounts: Iterable[dict],
+        concurrency: int = 8,
+    ) -> AsyncBulkRun:
+        """Create accounts concurrently
+
+        Args:
+            accounts (Iterable[dict]): Keyword arguments of `create` for each
+                account, read lazily.
+            concurrency (int): Number of accounts created in parallel.
+
+        Returns:
+            AsyncBulkRun: Async iterator of `(input_index, account_id | error)`
+            in completion order, with throughput statistics in `stats`.
+        """
+
+        return AsyncBulkRun(
+            lambda account: self.create(header, **account), accounts, concurrency
+        )
+
+    async def list(
+        self,
+        header: Header,
+        offset: int = 0,
+        limit: int = 100,
+        account_with_balance: bool = False,
+        account_with_balance_and_cba: bool = False,
+        audit: Audit = Audit.NONE,
+        stream: bool = False,
+    ):
+        """List accounts
+
+        Args:
+            audit : "NONE", "MINIMAL", "FULL"
+            stream (bool): Return an iterator yielding the accounts as the
+                body is parsed instead of a list, memory stays flat whatever
+                the `limit`.
+        """
+
+        params = {
+            "offset": offset,
+            "limit": limit,
+            "accountWithBalance": account_with_balance,
+            "accountWithBalanceAndCBA": account_with_balance_and_cba,
+            "audit": str(audit),
+        }
+
+        if stream:
+            return self._get_stream(
+                "accounts/pagination", self._headers(header), params=params
+            )
+
+        response = await self._get(
+            "accounts/pagination",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def count(self, header: Header) -> Optional[int]:
+        """Return the number of accounts of the tenant"""
+
+        response = await self._get(
+            "accounts/pagination",
+            headers=self._headers(header),
+            params={"offset": 0, "limit": 1},
+        )
+
+        self._raise_for_status(response)
+
+        total = response.headers.get("X-Killbill-Pagination-TotalNbRecords")
+
+        return int(total) if total is not None else None
+
+    async def iter_accounts(
+        self,
+        header: Header,
+        limit: int = 100,
+        account_with_balance: bool = False,
+        account_with_balance_and_cba: bool = False,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+        offset: int = 0,
+    ):
+        """Iterate over all accounts, following the pagination
+
+        Args:
+            limit (int): Number of accounts fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+            offset (int): Number of accounts to skip.
+        """
+
+        params = {
+            "offset": offset,
+            "limit": limit,
+            "accountWithBalance": account_with_balance,
+            "accountWithBalanceAndCBA": account_with_balance_and_cba,
+            "audit": str(audit),
+        }
+
+        async for account in self._paginate(
+            header, "accounts/pagination", params, prefetch
+        ):
+            yield account
+
+    async def warm_index(
+        self, header: Header, limit: int = 1000, prefetch: bool = True
+    ) -> int:
+        """Fill the account index from the accounts pagination
+
+        Every account of the tenant is read once and its external key is
+        recorded, so that later `ExternalKey` lookups cost no request.
+
+        Args:
+            limit (int): Number of accounts fetched per page, and recorded
+                per transaction.
+
+        Returns:
+            int: Number of accounts indexed.
+        """
+
+        if self.account_index is None:
+            raise ValueError("the client has no account index")
+
+        indexed = 0
+        entries = []
+
+        async for account in self.iter_accounts(header, limit=limit, prefetch=prefetch):
+            entries.append((account.get("externalKey"), account["accountId"]))
+
+            if len(entries) >= limit:
+                indexed += self.account_index.update(header.api_key, entries)
+                entries = []
+
+        return indexed + self.account_index.update(header.api_key, entries)
+
+    async def close(
+        self,
+        header: Header,
+        account_id: str,
+        cancel_all_subscriptions: bool = False,
+        write_off_unpaid_invoices: bool = False,
+        item_adjust_unpaid_invoices: bool = False,
+        remove_future_notifications: bool = True,
+    ):
+        """Close account
+
+        Args:
+            account_id (str): uuid
+            cancel_all_subscriptions (bool, optional): Defaults to False.
+            write_off_unpaid_invoices (bool, optional): Defaults to False.
+            item_adjust_unpaid_invoices (bool, optional): Defaults to False.
+            remove_future_notifications (bool, optional): Defaults to True.
+
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        response = await self._delete(
+            f"accounts/{account_id}",
+            headers=self._headers(header),
+            params={
+                "cancelAllSubscriptions": cancel_all_subscriptions,
+                "writeOffUnpaidInvoices": write_off_unpaid_invoices,
+                "itemAdjustUnpaidInvoices": item_adjust_unpaid_invoices,
+                "removeFutureNotifications": remove_future_notifications,
+            },
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
+
+        return True
+
+    async def add_payment_method(
+        self,
+        header: Header,
+        account_id: str,
+        plugin_name: str = "__EXTERNAL_PAYMENT__",
+        is_default: bool = False,
+        pay_all_unpaid_invoices: bool = False,
+        external_key: str = None,
+    ):
+        """Add a payment method
+
+        Returns:
+            str or None: The payment method's ID or None if the request failed.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = {"pluginName": plugin_name, "externalKey": external_key}
+
+        response = await self._post(
+            f"accounts/{account_id}/paymentMethods",
+            headers=self._json_headers(header),
+            payload=payload,
+            params={
+                "isDefault": is_default,
+                "payAllUnpaidInvoices": pay_all_unpaid_invoices,
+            },
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
+
+        return self._get_uuid(response.headers.get("Location"))
+
+    async def get_payment_methods(
+        self,
+        header: Header,
+        account_id: str,
+        with_plugin_info: bool = False,
+        included_deleted=False,
+        plugin_property: List[str] = None,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve account payment methods"""
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {
+            "withPluginInfo": with_plugin_info,
+            "includedDeleted": included_deleted,
+            "pluginProperty": plugin_property,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"accounts/{account_id}/paymentMethods",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def invoices(
+        self,
+        header: Header,
+        account_id: str,
+        start_date: str = None,
+        end_date: str = None,
+        with_migration_invoices: bool = False,
+        unpaid_invoices_only: bool = False,
+        include_voided_invoices: bool = False,
+        include_invoice_components: bool = False,
+        audit: Audit = Audit.NONE,
+        stream: bool = False,
+    ):
+        """Retrieve account invoices
+
+        Args:
+            stream (bool): Return an iterator yielding the invoices as the
+                body is parsed instead of a list.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {
+            "startDate": start_date,
+            "endDate": end_date,
+            "withMigrationInvoices": with_migration_invoices,
+            "unpaidInvoicesOnly": unpaid_invoices_only,
+            "includeVoidedInvoices": include_voided_invoices,
+            "includeInvoiceComponents": include_invoice_components,
+            "audit": str(audit),
+        }
+
+        if stream:
+            return self._get_stream(
+                f"accounts/{account_id}/invoices", self._headers(header), params=params
+            )
+
+        response = await self._get(
+            f"accounts/{account_id}/invoices",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    def invoices_many(
+        self,
+        header: Header,
+        account_ids: Iterable[str],
+        concurrency: int = 8,
+        start_date: str = None,
+        end_date: str = None,
+        with_migration_invoices: bool = False,
+        unpaid_invoices_only: bool = False,
+        include_voided_invoices: bool = False,
+        include_invoice_components: bool = False,
+        audit: Audit = Audit.NONE,
+    ) -> AsyncBulkRun:
+        """Retrieve the invoices of many accounts concurrently, see `invoices`
+
+        Args:
+            account_ids (Iterable[str]): Account ids, read lazily.
+            concurrency (int): Number of accounts queried in parallel.
+
+        Returns:
+            AsyncBulkRun: Async iterator of `(input_index, invoices | error)`
+            in completion order.
+        """
+
+        return AsyncBulkRun(
+            lambda account_id: self.invoices(
+                header,
+                account_id,
+                start_date=start_date,
+                end_date=end_date,
+                with_migration_invoices=with_migration_invoices,
+                unpaid_invoices_only=unpaid_invoices_only,
+                include_voided_invoices=include_voided_invoices,
+                include_invoice_components=include_invoice_components,
+                audit=audit,
+            ),
+            account_ids,
+            concurrency,
+        )
+
+    async def retrieve(
+        self,
+        header: Header,
+        external_key: str,
+        account_with_balance: bool = False,
+        account_with_balance_and_cba: bool = False,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve an account by external key"""
+
+        # Balances change with every invoice and payment, they are not cached
+        cacheable = not (account_with_balance or account_with_balance_and_cba)
+        lookup = ("accounts", "externalKey", external_key, str(audit))
+
+        if cacheable:
+            account = self._cached_entity(header, lookup)
+            if account is not None:
+                return account
+
+        generation = self._entity_generation(header)
+
+        params = {
+            "externalKey": external_key,
+            "accountWithBalance": account_with_balance,
+            "accountWithBalanceAndCBA": account_with_balance_and_cba,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            "accounts",
+            params=params,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        account = self._decode(response)
+        self._index_account(header, account)
+
+        if cacheable:
+            self._cache_entity(header, lookup, account, generation)
+
+        return account
+
+    async def get_blocking_states(
+        self,
+        header: Header,
+        account_id: str,
+        blocking_state_types: Union[
+            BlockingStateType, List[BlockingStateType]
+        ] = BlockingStateType.ACCOUNT,
+        blocking_state_svcs: Union[str, List[str]] = None,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve account blocking states"""
+
+        account_id = await self._account_id(header, account_id)
+
+        if isinstance(blocking_state_types, list):
+            blocking_state_types = [str(x) for x in blocking_state_types]
+        else:
+            blocking_state_types = str(blocking_state_types)
+
+        params = {
+            "blockingStateTypes": blocking_state_types,
+            "blockingStateSvcs": blocking_state_svcs,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"accounts/{account_id}/block", headers=self._headers(header), params=params
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def bundles(
+        self,
+        header: Header,
+        account_id: str,
+        external_key: str = None,
+        bundles_filter: str = None,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve bundles for account"""
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {
+            "externalKey": external_key,
+            "bundlesFilter": bundles_filter,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"accounts/{account_id}/bundles",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def overdue(self, header: Header, account_id: str):
+        """Retrieve overdue state for account"""
+
+        account_id = await self._account_id(header, account_id)
+
+        response = await self._get(
+            f"accounts/{account_id}/overdue",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def retrieve_by_id(
+        self,
+        header: Header,
+        account_id: str,
+        account_with_balance: bool = False,
+        account_with_balance_and_cba: bool = False,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve account by id"""
+
+        account_id = await self._account_id(header, account_id)
+
+        # Balances change with every invoice and payment, they are not cached
+        cacheable = not (account_with_balance or account_with_balance_and_cba)
+        lookup = ("accounts", account_id, str(audit))
+
+        if cacheable:
+            account = self._cached_entity(header, lookup)
+            if account is not None:
+                return account
+
+        generation = self._entity_generation(header)
+
+        params = {
+            "accountWithBalance": account_with_balance,
+            "accountWithBalanceAndCBA": account_with_balance_and_cba,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"accounts/{account_id}",
+            params=params,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        account = self._decode(response)
+        self._index_account(header, account)
+
+        if cacheable:
+            self._cache_entity(header, lookup, account, generation)
+
+        return account
+
+    async def payments(
+        self,
+        header: Header,
+        account_id: str,
+        transaction_type: TransactionType,
+        amount: int | float,
+        payment_method_id: str | None = None,
+        control_plugin_name: List[str] | None = None,
+        plugin_property: List[str] | None = None,
+    ):
+        """Trigger a payment (authorization, purchase or credit) and return the payment id"""
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = {
+            "transactionType": str(transaction_type),
+            "amount": amount,
+        }
+
+        params = {
+            "paymentMethodId": payment_method_id,
+            "controlPluginName": control_plugin_name,
+            "pluginProperty": plugin_property,
+        }
+
+        response = await self._post(
+            f"accounts/{account_id}/payments",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._get_uuid(response.headers.get("Location"))
+
+    async def invoice_payments(
+        self,
+        header: Header,
+        account_id: str,
+        payment_method_id: str = None,
+        external_payment: bool = False,
+        payment_amount: int = None,
+        target_date: str = None,
+    ):
+        """Trigger a payment for all unpaid invoices"""
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {
+            "paymentMethodId": payment_method_id,
+            "externalPayment": external_payment,
+            "paymentAmount": payment_amount,
+            "targetDate": target_date,
+        }
+
+        response = await self._post(
+            f"accounts/{account_id}/invoicePayments",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+    async def bundles_pagination(
+        self,
+        header: Header,
+        account_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve bundles for account with pagination"""
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {
+            "offset": offset,
+            "limit": limit,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"accounts/{account_id}/bundles/pagination",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def iter_bundles(
+        self,
+        header: Header,
+        account_id: str,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+    ):
+        """Iterate over all bundles for account, following the pagination
+
+        Args:
+            limit (int): Number of bundles fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        params = {"offset": 0, "limit": limit, "audit": str(audit)}
+
+        async for bundle in self._paginate(
+            header, f"accounts/{account_id}/bundles/pagination", params, prefetch
+        ):
+            yield bundle
+
+    async def add_custom_fields(
+        self,
+        header: Header,
+        account_id: str,
+        fields: dict,
+    ):
+        """Add custom fields to account"""
+
+        account_id = await self._account_id(header, account_id)
+
+        await self._add_custom_fields(
+            header,
+            path="accounts",
+            object_id=account_id,
+            fields=fields,
+            object_type=ObjectType.ACCOUNT,
+        )
+
+    async def get_custom_fields(
+        self, header: Header, account_id: str, audit: Audit = Audit.NONE
+    ):
+        """Retrieve account custom fields"""
+
+        account_id = await self._account_id(header, account_id)
+
+        return await self._get_custom_fields(
+            header, path="accounts", object_id=account_id, audit=audit
+        )
+
+    async def update_custom_fields(
+        self,
+        header: Header,
+        account_id: str,
+        fields: List[dict],
+    ):
+        """Modify custom fields to account
+
+        Example:
+        ```python
+        await killbill.account.update_custom_fields(
+            header,
+            account_id="account_id",
+            fields=[
+                {
+                    "name": "name",
+                    "value": "value",
+                    "field_id": "field_id",
+                }
+            ],
+        )
+
+        ```
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        await self._update_custom_fields(
+            header,
+            path="accounts",
+            object_id=account_id,
+            fields=fields,
+            object_type=ObjectType.ACCOUNT,
+        )
+
+    async def add_tags(self, header: Header, account_id: str, tags: List[str]):
+        """Add tags to account
+
+        Example:
+        ```python
+        from killbill.enums import SystemTags
+
+        await killbill.account.add_tags(
+            header,
+            account_id=account_id,
+            tags=[SystemTags.AUTO_PAY_OFF, "00000000-0000-0000-0000-000000000002"],
+        )
+        ```
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        await self._add_tags(header, path="accounts", object_id=account_id, tags=tags)
+
+    async def get_tags(
+        self, header: Header, account_id: str, audit: Audit = Audit.NONE
+    ):
+        """Retrieve account tags"""
+
+        account_id = await self._account_id(header, account_id)
+
+        return await self._get_tags(
+            header, path="accounts", object_id=account_id, audit=audit
+        )
+
+    async def delete_tags(self, header: Header, account_id: str, tags: List[str]):
+        """Delete tags from an account"""
+
+        account_id = await self._account_id(header, account_id)
+
+        await self._delete_tag(header, path="accounts", object_id=account_id, tags=tags)
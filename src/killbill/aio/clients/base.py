@@ -0,0 +1,436 @@
+import asyncio
+import time
+from typing import List
+
+from killbill.aio.singleflight import AsyncSingleFlight
+from killbill.aio.transport import AsyncHttpxTransport, AsyncTransport
+from killbill.cache import EntityCache
+from killbill.catalog_index import CatalogIndex
+from killbill.clients.base import (
+    BaseClient,
+    BaseClientWithCustomFields,
+    BaseClientWithTags,
+    _basic_auth_header,
+)
+from killbill.codec import JsonCodec, drop_none, get_codec
+from killbill.enums import Audit, ObjectType
+from killbill.header import Header
+from killbill.hooks import Hook, RequestContext, endpoint_template
+from killbill.index import AccountIndex, ExternalKey
+from killbill.retry import RetryPolicy
+from killbill.singleflight import SharedResponse, request_key
+from killbill.streaming import aiter_json_array
+
+
+class AsyncBaseClient(BaseClient):
+    """Base class for the asynchronous Kill Bill API client
+
+    Payload building, `_raise_for_status` and `_get_uuid` are inherited from
+    `BaseClient`; only the I/O is asynchronous.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        api_url: str = "http://localhost:8080",
+        timeout: int = 30,
+        transport: AsyncTransport = None,
+        retry: RetryPolicy = None,
+        hooks: List[Hook] = None,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: JsonCodec = None,
+        catalog_index: CatalogIndex = None,
+    ):
+        self.api_url = api_url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.transport = transport if transport is not None else AsyncHttpxTransport()
+        self.retry = retry
+        self.hooks = hooks if hooks is not None else []
+        self.entity_cache = entity_cache
+        self.account_index = account_index
+        self.codec = get_codec(codec)
+        self.catalog_index = catalog_index
+        self._default_headers = (
+            ("Authorization", _basic_auth_header(username, password)),
+        )
+        self._single_flight = AsyncSingleFlight() if coalesce else None
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict,
+        payload: dict = None,
+        data=None,
+        params: dict = None,
+        stream: bool = False,
+    ):
+        """Make a request to the Kill Bill API through the client's transport
+
+        Transient errors are retried according to the client's retry policy.
+        A `stream` response body is left unread, see `Transport.iter_bytes`.
+        """
+
+        url = f"{self.api_url}/1.0/kb/{endpoint}"
+        started = time.monotonic()
+        attempt = 0
+
+        if payload is not None:
+            data = self.codec.dumps(drop_none(payload))
+            if "Content-Type" not in headers:
+                headers = {**headers, "Content-Type": "application/json"}
+
+        while True:
+            attempt += 1
+
+            try:
+                response = await self._send(
+                    method,
+                    endpoint,
+                    url,
+                    headers,
+                    payload,
+                    data,
+                    params,
+                    attempt,
+                    stream,
+                )
+            except self.transport.connection_errors as error:
+                delay = self._retry_delay(
+                    method, attempt, started, sent=not self.transport.unsent(error)
+                )
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(method, attempt, started, response)
+                if delay is None:
+                    return response
+                await self.transport.release(response)
+
+            await asyncio.sleep(delay)
+
+    async def _account_id(self, header: Header, account_id: str):
+        """Return the id of an account given by id or by `ExternalKey`"""
+
+        if not isinstance(account_id, ExternalKey):
+            return account_id
+
+        if self.account_index is not None:
+            resolved = self.account_index.get(header.api_key, account_id)
+            if resolved is not None:
+                return resolved
+
+        response = await self._get(
+            "accounts",
+            headers=self._headers(header),
+            params={"externalKey": str(account_id)},
+        )
+
+        self._raise_for_status(response)
+
+        return self._index_account(header, self._decode(response))
+
+    async def _validate_entitlements(
+        self, header: Header, entitlements: List[dict], on: str = None
+    ):
+        """Check subscription payloads against the indexed catalog, if any
+
+        See `BaseClient._validate_entitlements`.
+        """
+
+        catalog = self._indexed_catalog(header)
+
+        if catalog is None:
+            return
+
+        errors = catalog.validate(entitlements, on)
+
+        if not errors:
+            return
+
+        response = await self._get("catalog/versions", headers=self._headers(header))
+
+        self._raise_for_status(response)
+        self._reject_entitlements(header, catalog, errors, self._decode(response))
+
+    async def _get(
+        self,
+        endpoint: str,
+        headers: dict,
+        payload: dict = None,
+        params: dict = None,
+    ):
+        """Make a GET request to the Kill Bill API"""
+
+        if self._single_flight is None or payload is not None:
+            return await self._request("GET", endpoint, headers, payload, params=params)
+
+        async def shared():
+            return SharedResponse(
+                await self._request("GET", endpoint, headers, params=params),
+                self.codec.loads,
+            )
+
+        return await self._single_flight.do(
+            request_key(endpoint, params, headers), shared
+        )
+
+    async def _get_stream(
+        self,
+        endpoint: str,
+        headers: dict,
+        payload: dict = None,
+        params: dict = None,
+    ):
+        """Make a GET request and yield the elements of the JSON array body"""
+
+        response = await self._request(
+            "GET", endpoint, headers, payload, params=params, stream=True
+        )
+
+        self._raise_for_status(response)
+
+        async for element in aiter_json_array(self.transport.aiter_bytes(response)):
+            yield element
+
+    async def _send(
+        self, method, endpoint, url, headers, payload, data, params, attempt, stream
+    ):
+        """Send one attempt through the transport, running the hooks"""
+
+        send = self.transport.stream if stream else self.transport.request
+
+        if not self.hooks:
+            return await send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+            )
+
+        context = RequestContext(
+            method=method,
+            endpoint=endpoint,
+            endpoint_template=endpoint_template(endpoint),
+            url=url,
+            attempt=attempt,
+            params=params,
+            payload=payload,
+            data=data,
+        )
+
+        for hook in self.hooks:
+            hook.before_request(context)
+
+        started = time.perf_counter()
+
+        try:
+            response = await send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+            )
+        except Exception as error:
+            context.latency = time.perf_counter() - started
+            context.exception = error
+            for hook in reversed(self.hooks):
+                hook.on_error(context)
+            raise
+
+        context.latency = time.perf_counter() - started
+        context.status_code = response.status_code
+        if not stream:
+            context.response_bytes = len(response.content)
+
+        for hook in reversed(self.hooks):
+            hook.after_response(context)
+
+        return response
+
+    async def _get_page(self, header: Header, endpoint: str, params: dict):
+        """Retrieve one page and the offset of the next one, if any"""
+
+        response = await self._get(
+            endpoint, headers=self._headers(header), params=params
+        )
+
+        self._raise_for_status(response)
+
+        next_offset = response.headers.get("X-Killbill-Pagination-NextOffset")
+
+        return self._decode(response), next_offset
+
+    async def _paginate(
+        self, header: Header, endpoint: str, params: dict, prefetch: bool = True
+    ):
+        """Yield the records of every page of a pagination endpoint
+
+        With `prefetch`, the next page is downloaded in a background task
+        while the current one is consumed.
+        """
+
+        page, next_offset = await self._get_page(header, endpoint, params)
+
+        while True:
+            task = None
+
+            if next_offset is not None:
+                params = {**params, "offset": next_offset}
+                if prefetch:
+                    task = asyncio.ensure_future(
+                        self._get_page(header, endpoint, params)
+                    )
+
+            try:
+                for record in page:
+                    yield record
+            except BaseException:
+                if task is not None:
+                    task.cancel()
+                raise
+
+            if next_offset is None:
+                return
+
+            if task is not None:
+                page, next_offset = await task
+            else:
+                page, next_offset = await self._get_page(header, endpoint, params)
+
+
+class AsyncBaseClientWithCustomFields(AsyncBaseClient, BaseClientWithCustomFields):
+    """Base class for the asynchronous Kill Bill custom fields apis"""
+
+    async def _add_custom_fields(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        fields: dict,
+        object_type: ObjectType,
+    ):
+        """Add custom fields to object"""
+
+        payload = self._custom_fields_payload(fields, object_type)
+
+        response = await self._post(
+            f"{path}/{object_id}/customFields",
+            headers=self._json_headers(header),
+            payload=payload,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
+
+    async def _get_custom_fields(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve object custom fields"""
+
+        params = {"audit": str(audit)}
+
+        response = await self._get(
+            f"{path}/{object_id}/customFields",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def _update_custom_fields(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        fields: List[dict],
+        object_type: ObjectType,
+    ):
+        """Modify custom fields to object"""
+
+        payload = self._updated_custom_fields_payload(fields, object_type)
+
+        response = await self._put(
+            f"{path}/{object_id}/customFields",
+            headers=self._json_headers(header),
+            payload=payload,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
+
+
+class AsyncBaseClientWithTags(AsyncBaseClient, BaseClientWithTags):
+    """Base class for the asynchronous Kill Bill tags apis"""
+
+    async def _add_tags(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        tags: List[str],
+    ):
+        """Add tags to object"""
+
+        payload = [str(tag) for tag in tags]
+
+        response = await self._post(
+            f"{path}/{object_id}/tags",
+            headers=self._json_headers(header),
+            payload=payload,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
+
+    async def _get_tags(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve object tags"""
+
+        params = {"audit": str(audit)}
+
+        response = await self._get(
+            f"{path}/{object_id}/tags",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def _delete_tag(
+        self, header: Header, path: str, object_id: str, tags: List[str]
+    ):
+        """Delete tags from an object"""
+
+        params = {"tagDef": tags}
+
+        response = await self._delete(
+            f"{path}/{object_id}/tags",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
@@ -0,0 +1,201 @@
+from typing import List
+
+from killbill.aio.clients.base import AsyncBaseClientWithCustomFields
+from killbill.enums import Audit, ObjectType
+from killbill.header import Header
+
+
+class BundleClient(AsyncBaseClientWithCustomFields):
+    """Asynchronous client for the Kill Bill bundle API"""
+
+    async def list(
+        self,
+        header: Header,
+        offset: int = 0,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+        stream: bool = False,
+    ):
+        """List bundles
+
+        Args:
+            stream (bool): Return an iterator yielding the bundles as the body
+                is parsed instead of a list.
+        """
+
+        params = {"offset": offset, "limit": limit, "audit": str(audit)}
+
+        if stream:
+            return self._get_stream(
+                "bundles/pagination", self._headers(header), params=params
+            )
+
+        response = await self._get(
+            "bundles/pagination", headers=self._headers(header), params=params
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def iter_bundles(
+        self,
+        header: Header,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+    ):
+        """Iterate over all bundles, following the pagination
+
+        Args:
+            limit (int): Number of bundles fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+        """
+
+        params = {"offset": 0, "limit": limit, "audit": str(audit)}
+
+        async for bundle in self._paginate(
+            header, "bundles/pagination", params, prefetch
+        ):
+            yield bundle
+
+    async def pause(self, header: Header, bundle_id: str, requested_date: str = None):
+        """Pause a bundle"""
+
+        response = await self._put(
+            f"bundles/{bundle_id}/pause",
+            headers=self._headers(header),
+            params={"requestedDate": requested_date},
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
+
+    async def resume(self, header: Header, bundle_id: str, requested_date: str = None):
+        """Resume a bundle"""
+
+        response = await self._put(
+            f"bundles/{bundle_id}/resume",
+            headers=self._headers(header),
+            params={"requestedDate": requested_date},
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
+
+    async def retrieve(self, header: Header, bundle_id: str, audit: Audit = Audit.NONE):
+        """Retrieve a bundle by id"""
+
+        lookup = ("bundles", bundle_id, str(audit))
+
+        bundle = self._cached_entity(header, lookup)
+        if bundle is not None:
+            return bundle
+
+        generation = self._entity_generation(header)
+
+        params = {"audit": str(audit)}
+
+        response = await self._get(
+            f"bundles/{bundle_id}", headers=self._headers(header), params=params
+        )
+
+        self._raise_for_status(response)
+
+        bundle = self._decode(response)
+        self._cache_entity(header, lookup, bundle, generation)
+
+        return bundle
+
+    async def add_custom_fields(
+        self,
+        header: Header,
+        bundle_id: str,
+        fields: dict,
+    ):
+        """Add custom fields to bundle"""
+
+        await self._add_custom_fields(
+            header,
+            path="bundles",
+            object_id=bundle_id,
+            fields=fields,
+            object_type=ObjectType.BUNDLE,
+        )
+
+    async def get_custom_fields(
+        self, header: Header, bundle_id: str, audit: Audit = Audit.NONE
+    ):
+        """Retrieve bunlde custom fields"""
+
+        return await self._get_custom_fields(
+            header, path="bundles", object_id=bundle_id, audit=audit
+        )
+
+    async def update_custom_fields(
+        self,
+        header: Header,
+        bundle_id: str,
+        fields: List[dict],
+    ):
+        """Modify custom fields to bundle
+
+        Example:
+        ```python
+        await killbill.bundle.update_custom_fields(
+            header,
+            bundle_id="bundle_id",
+            fields=[
+                {
+                    "name": "name",
+                    "value": "value",
+                    "field_id": "field_id",
+                }
+            ],
+        )
+
+        ```
+        """
+        await self._update_custom_fields(
+            header,
+            path="bundles",
+            object_id=bundle_id,
+            fields=fields,
+            object_type=ObjectType.BUNDLE,
+        )
+
+    async def block(
+        self,
+        header: Header,
+        bundle_id: str,
+        state_name: str,
+        service: str,
+        is_block_change: bool = False,
+        is_block_entitlement: bool = False,
+        is_block_billing: bool = False,
+        requested_date: str = None,
+    ):
+        """
+        Provides a low level interface to add a BlockingState event for this bundle
+        """
+
+        payload = self._blocking_state_payload(
+            state_name,
+            service,
+            is_block_change=is_block_change,
+            is_block_entitlement=is_block_entitlement,
+            is_block_billing=is_block_billing,
+        )
+
+        params = {"requestedDate": requested_date}
+
+        response = await self._post(
+            f"bundles/{bundle_id}/block",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
@@ -0,0 +1,244 @@
+from typing import List, Union
+
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.aio.transport import AsyncTransport
+from killbill.cache import EntityCache
+from killbill.catalog_index import Catalog, CatalogIndex
+from killbill.clients.catalog import CatalogCache
+from killbill.clients.catalog import CatalogClient as SyncCatalogClient
+from killbill.codec import JsonCodec
+from killbill.enums import BillingPeriod, ProductCategory, TrialTimeUnit
+from killbill.header import Header
+from killbill.hooks import Hook
+from killbill.index import AccountIndex
+from killbill.retry import RetryPolicy
+
+
+class CatalogClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill catalog API
+
+    Args:
+        cache (bool): Cache retrieved catalogs in memory. Cached catalogs are
+            shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        api_url: str = "http://localhost:8080",
+        timeout: int = 30,
+        transport: AsyncTransport = None,
+        retry: RetryPolicy = None,
+        hooks: List[Hook] = None,
+        cache: bool = False,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: JsonCodec = None,
+        catalog_index: CatalogIndex = None,
+    ):
+        super().__init__(
+            username,
+            password,
+            api_url,
+            timeout,
+            transport,
+            retry,
+            hooks,
+            coalesce,
+            entity_cache,
+            account_index,
+            codec,
+            catalog_index,
+        )
+        self.cache = CatalogCache() if cache else None
+
+    async def add_simple_plan(
+        self,
+        header: Header,
+        plan_id: str,
+        product_name: str,
+        currency: str,
+        product_category: ProductCategory = ProductCategory.BASE,
+        amount: Union[float, int] = 0,
+        trial_length: int = 0,
+        trial_time_unit: TrialTimeUnit = TrialTimeUnit.UNLIMITED,
+        billing_period: BillingPeriod = BillingPeriod.MONTHLY,
+    ):
+        """Create a new simple plan in the catalog.
+
+        Args:
+            plan_id (str): The ID of the plan.
+            product_name (str): The name of the product.
+            product_category (str): The category of the product.
+            currency (str): The currency of the plan.
+            amount (Union[float, int]): The amount of the plan.
+            billing_period (str): The billing period of the plan.
+            trial_length (int): The trial length of the plan.
+            trial_time_unit (str): The trial time unit of the plan.
+            api_key (str): The API key of the user.
+            api_secret (str): The API secret of the user.
+            created_by (str): The ID of the user who created the plan.
+            reason (str, optional): The reason for creating the plan. Defaults to None.
+            comment (str, optional): The comment for creating the plan. Defaults to None.
+        """
+
+        payload = SyncCatalogClient._simple_plan_payload(
+            plan_id,
+            product_name,
+            currency,
+            product_category=product_category,
+            amount=amount,
+            trial_length=trial_length,
+            trial_time_unit=trial_time_unit,
+            billing_period=billing_period,
+        )
+
+        response = await self._post(
+            "catalog/simplePlan",
+            payload=payload,
+            headers=self._json_headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        self._invalidate_cache(header)
+
+    async def retrieve(
+        self,
+        header: Header,
+        account_id: str = None,
+        requested_date: str = None,
+        xml=False,
+    ):
+        """Retrieve catalogs.
+
+        if `xml = True`, returns the XML representation of the overdue config
+
+        if `xml = False`, returns the JSON representation of the overdue config
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        if self.cache is not None:
+            key = (header.api_key, account_id, requested_date, xml)
+            catalog = self.cache.get(key)
+            if catalog is not None:
+                return catalog
+            generation = self.cache.generation(header.api_key)
+
+        params = {
+            "accountId": account_id,
+            "requestedDate": requested_date,
+        }
+
+        if xml:
+            endpoint = "catalog/xml"
+            headers = self._headers(header)
+        else:
+            endpoint = "catalog"
+            headers = self._headers(header, (("Accept", "application/json"),))
+
+        response = await self._get(
+            endpoint,
+            params=params,
+            headers=headers,
+        )
+
+        self._raise_for_status(response)
+
+        catalog = response.text if xml else self._decode(response)
+
+        if self.cache is not None:
+            self.cache.set(key, catalog, generation)
+
+        return catalog
+
+    async def validate(self, header: Header, catalog_xml: str):
+        """Validate a XML catalog
+
+        Args:
+            header created_by is required
+        """
+
+        response = await self._post(
+            "catalog/xml/validate",
+            data=catalog_xml,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def create(self, header: Header, catalog_xml: str):
+        """Create a XML catalog
+
+        Args:
+            header created_by is required
+        """
+
+        response = await self._post(
+            "catalog/xml",
+            data=catalog_xml,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        self._invalidate_cache(header)
+
+    async def versions(self, header: Header):
+        """Retrieve a list of catalog versions"""
+
+        response = await self._get(
+            "catalog/versions",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        versions = self._decode(response)
+
+        if self.cache is not None:
+            self.cache.observe_versions(header.api_key, versions)
+
+        if self.catalog_index is not None:
+            self.catalog_index.observe_versions(header.api_key, versions)
+
+        return versions
+
+    async def index(self, header: Header, xml: bool = False) -> Catalog:
+        """Retrieve the catalog of the tenant and index it"""
+
+        catalog = Catalog.parse(await self.retrieve(header, xml=xml))
+
+        if self.catalog_index is not None:
+            self.catalog_index.set(header.api_key, catalog)
+
+        return catalog
+
+    async def delete(
+        self,
+        header: Header,
+    ):
+        """Delete all versions of a per tenant catalog"""
+
+        response = await self._delete(
+            "catalog",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        self._invalidate_cache(header)
+
+    def _invalidate_cache(self, header: Header):
+        """Drop the cached and indexed catalogs of the tenant"""
+
+        if self.cache is not None:
+            self.cache.invalidate(header.api_key)
+
+        if self.catalog_index is not None:
+            self.catalog_index.invalidate(header.api_key)
@@ -0,0 +1,119 @@
+from typing import Iterable, List
+
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.bulk import AsyncChunkRun, Chunk, chunked
+from killbill.clients.credit import CreditClient as SyncCreditClient
+from killbill.header import Header
+
+
+class CreditClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill credit API"""
+
+    async def add(
+        self,
+        header: Header,
+        account_id: str,
+        amount: int | float,
+        currency: str,
+        description: str = None,
+        auto_commit: bool = False,
+        plugin_property: List[str] = None,
+    ):
+        """Add a credit"""
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = [
+            SyncCreditClient._credit_payload(account_id, amount, currency, description)
+        ]
+
+        return await self._post_credits(header, payload, auto_commit, plugin_property)
+
+    def add_many(
+        self,
+        header: Header,
+        credits: Iterable[dict],
+        batch_size: int = 100,
+        concurrency: int = 8,
+        auto_commit: bool = False,
+        plugin_property: List[str] = None,
+    ) -> AsyncChunkRun:
+        """Add credits in bulk
+
+        Credits are read lazily and sent in `credits` requests of up to
+        `batch_size` credits, the requests are sent concurrently. A request
+        fails or succeeds as a whole.
+
+        Args:
+            credits (Iterable[dict]): `account_id`, `amount`, `currency` and
+                optional `description` of each credit.
+            batch_size (int): Maximum number of credits per request.
+            concurrency (int): Number of requests sent in parallel, keep it
+                below the client's pool size.
+
+        Returns:
+            AsyncChunkRun: Iterator of `(chunk, credit_ids | error)`. `results` maps
+            each input row to its credit ID and `failed` records the failed
+            chunks.
+
+        Example:
+        ```python
+        credits = (
+            {"account_id": row["account_id"], "amount": 10, "currency": "USD"}
+            for row in reader
+        )
+
+        run = await killbill.credit.add_many(header, credits, batch_size=200).run()
+
+        for chunk, error in run.failed:
+            print(f"rows {chunk.indexes} failed: {error}")
+        ```
+        """
+
+        return AsyncChunkRun(
+            lambda chunk: self._add_chunk(header, chunk, auto_commit, plugin_property),
+            chunked(credits, batch_size),
+            concurrency,
+        )
+
+    async def _add_chunk(
+        self, header: Header, chunk: Chunk, auto_commit: bool, plugin_property
+    ):
+        """Add the credits of a chunk, return their IDs in input order"""
+
+        payload = [
+            SyncCreditClient._credit_payload(
+                await self._account_id(header, credit["account_id"]),
+                credit["amount"],
+                credit["currency"],
+                credit.get("description"),
+            )
+            for credit in chunk.rows
+        ]
+
+        credits = await self._post_credits(
+            header, payload, auto_commit, plugin_property
+        )
+
+        return SyncCreditClient._credit_ids(payload, credits)
+
+    async def _post_credits(
+        self, header: Header, payload: list, auto_commit: bool, plugin_property
+    ):
+        """Post a list of credits, return the created credits"""
+
+        params = {
+            "autoCommit": auto_commit,
+            "pluginProperty": plugin_property,
+        }
+
+        response = await self._post(
+            "credits",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
@@ -0,0 +1,59 @@
+from typing import Iterable
+
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.bulk import AsyncBulkRun
+from killbill.enums import Audit
+from killbill.header import Header
+
+
+class InvoiceClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill invoice API"""
+
+    async def retrieve(
+        self,
+        header: Header,
+        invoice_id: str,
+        with_children_items: bool = False,
+        audit: Audit = Audit.NONE,
+    ):
+        """Retrieve an invoice by id"""
+
+        params = {
+            "withChildrenItems": with_children_items,
+            "audit": str(audit),
+        }
+
+        response = await self._get(
+            f"invoices/{invoice_id}", headers=self._headers(header), params=params
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    def retrieve_many(
+        self,
+        header: Header,
+        invoice_ids: Iterable[str],
+        concurrency: int = 8,
+        with_children_items: bool = False,
+        audit: Audit = Audit.NONE,
+    ) -> AsyncBulkRun:
+        """Retrieve invoices concurrently
+
+        Args:
+            invoice_ids (Iterable[str]): Invoice ids, read lazily.
+            concurrency (int): Number of invoices retrieved in parallel.
+
+        Returns:
+            AsyncBulkRun: Async iterator of `(input_index, invoice | error)`
+            in completion order.
+        """
+
+        return AsyncBulkRun(
+            lambda invoice_id: self.retrieve(
+                header, invoice_id, with_children_items, audit
+            ),
+            invoice_ids,
+            concurrency,
+        )
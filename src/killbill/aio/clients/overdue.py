@@ -0,0 +1,38 @@
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.header import Header
+
+
+class OverdueClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill overdue API"""
+
+    async def retrieve(self, header: Header, xml: bool = True):
+        """Retrieve overdue config
+
+        if `xml = True`, returns the XML representation of the overdue config
+
+        if `xml = False`, returns the JSON representation of the overdue config
+        """
+
+        response = await self._get(
+            "overdue/xml" if xml else "overdue",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        return response.text if xml else self._decode(response)
+
+    async def upload(self, header: Header, overdue_config_xml: str):
+        """Upload overdue config
+
+        Args:
+            overdue_config_xml (str): XML representation of the overdue config
+        """
+
+        response = await self._post(
+            "overdue/xml",
+            data=overdue_config_xml,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
@@ -0,0 +1,407 @@
+from typing import Iterable, List, Tuple
+
+from killbill.aio.clients.base import AsyncBaseClientWithCustomFields
+from killbill.bulk import AsyncChunkRun, chunk_by_account
+from killbill.clients.subscription import SubscriptionClient as SyncSubscriptionClient
+from killbill.enums import (
+    Audit,
+    BillingPeriod,
+    BillingPolicy,
+    EntitlementPolicy,
+    ObjectType,
+    ProductCategory,
+)
+from killbill.header import Header
+
+
+class SubscriptionClient(AsyncBaseClientWithCustomFields):
+    """Asynchronous client for the Kill Bill subscription API"""
+
+    async def create(
+        self,
+        header: Header,
+        account_id: str,
+        plan_name: str,
+        start_date: str = None,
+        external_key: str = None,
+        product_name: str = None,
+        product_category: ProductCategory = None,
+        billing_period: BillingPeriod = None,
+        price_list: str = None,
+        bundle_id: str = None,
+    ):
+        """Create an subscription
+
+        Returns:
+            str or None: The subscription's ID or None if the request failed.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = SyncSubscriptionClient._create_payload(
+            account_id,
+            plan_name,
+            external_key=external_key,
+            product_name=product_name,
+            product_category=product_category,
+            billing_period=billing_period,
+            price_list=price_list,
+            bundle_id=bundle_id,
+        )
+
+        await self._validate_entitlements(header, [payload], start_date)
+
+        params = {
+            "entitlementDate": start_date,
+            "billingDate": start_date,
+        }
+
+        response = await self._post(
+            "subscriptions",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id or account_id)
+
+        return self._get_uuid(response.headers.get("Location"))
+
+    async def retrieve(
+        self, header: Header, subscription_id: str, audit: Audit = Audit.NONE
+    ):
+        """Retrieve a subscription by id"""
+
+        lookup = ("subscriptions", subscription_id, str(audit))
+
+        subscription = self._cached_entity(header, lookup)
+        if subscription is not None:
+            return subscription
+
+        generation = self._entity_generation(header)
+
+        response = await self._get(
+            f"subscriptions/{subscription_id}",
+            headers=self._headers(header),
+            params={"audit": str(audit)},
+        )
+
+        self._raise_for_status(response)
+
+        subscription = self._decode(response)
+        self._cache_entity(header, lookup, subscription, generation)
+
+        return subscription
+
+    async def cancel(
+        self,
+        header: Header,
+        subscription_id: str,
+        requested_date: str = None,
+        use_requested_date_for_billing: bool = False,
+        entitlement_policy: EntitlementPolicy = None,
+        billing_policy: BillingPolicy = None,
+    ):
+        """Cancel an entitlement plan"""
+
+        params = {
+            "requestedDate": requested_date,
+            "entitlementPolicy": (
+                str(entitlement_policy) if entitlement_policy else None
+            ),
+            "billingPolicy": str(billing_policy) if billing_policy else None,
+            "useRequestedDateForBilling": use_requested_date_for_billing,
+        }
+
+        response = await self._delete(
+            f"subscriptions/{subscription_id}",
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
+
+    async def uncancel(self, header: Header, subscription_id: str):
+        """Un-cancel an entitlement"""
+
+        response = await self._put(
+            f"subscriptions/{subscription_id}/uncancel",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
+
+    async def create_with_add_ons(
+        self,
+        header: Header,
+        account_id: str,
+        plan_name: str,
+        add_ons_name: list[str],
+        start_date: str = None,
+    ):
+        """Create an entitlement with addOn products
+
+        Args:
+            add_ons_name (list[str]): List of add-ons (plan name) to be added to the subscription
+
+        Returns:
+            str or None: The bundle's ID or None if the request failed.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = SyncSubscriptionClient._with_add_ons_payload(
+            account_id, [plan_name, *add_ons_name]
+        )
+
+        await self._validate_entitlements(header, payload, start_date)
+
+        params = {"entitlementDate": start_date, "billingDate": start_date}
+
+        response = await self._post(
+            "subscriptions/createSubscriptionWithAddOns",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
+
+        return self._get_uuid(response.headers.get("Location"))
+
+    async def create_multiple_with_add_ons(
+        self,
+        header: Header,
+        account_id: str,
+        bundles: list[list],
+        start_date: str = None,
+    ):
+        """Create multiple entitlements with addOn products
+
+        >> Example
+        ```python
+        await killbill.subscription.create_multiple_with_add_ons(
+            header,
+            account_id="3d52ce98-104e-4cfe-af7d-732f9a264a9a",
+            bundles=[
+                ["standard-monthly", "standard-monthly-add-on"],
+                ["sport-monthly", "sport-monthly-add-on-1", "sport-monthly-add-on-2"],
+            ],
+        )
+        ```
+
+        Returns:
+            list: The IDs of the created bundles, in request order.
+        """
+
+        account_id = await self._account_id(header, account_id)
+
+        payload = [
+            {
+                "baseEntitlementAndAddOns": SyncSubscriptionClient._with_add_ons_payload(
+                    account_id, bundle
+                )
+            }
+            for bundle in bundles
+        ]
+
+        for bundle in payload:
+            await self._validate_entitlements(
+                header, bundle["baseEntitlementAndAddOns"], start_date
+            )
+
+        params = {"entitlementDate": start_date, "billingDate": start_date}
+
+        response = await self._post(
+            "subscriptions/createSubscriptionsWithAddOns",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
+
+        return SyncSubscriptionClient._bundle_ids(response.headers.get("Location"))
+
+    def provision(
+        self,
+        header: Header,
+        rows: Iterable[Tuple[str, list]],
+        batch_size: int = 50,
+        concurrency: int = 8,
+        start_date: str = None,
+    ) -> AsyncChunkRun:
+        """Create subscriptions with add-ons in bulk
+
+        `(account_id, [base_plan, *add_ons])` rows are read lazily, packed
+        into `createSubscriptionsWithAddOns` requests of up to `batch_size`
+        bundles of the same account, and the requests are sent
+        concurrently.
+
+        Args:
+            rows (Iterable[tuple]): Account id and plan names of each bundle.
+            batch_size (int): Maximum number of bundles per request.
+            concurrency (int): Number of requests sent in parallel, keep it
+                below the client's pool size.
+
+        Returns:
+            AsyncChunkRun: Iterator of `(chunk, bundle_ids | error)`. `results` maps
+            each input row to its bundle ID and `failed` records the failed
+            chunks.
+
+        Example:
+        ```python
+        rows = ((row["account_id"], row["plans"]) for row in reader)
+
+        run = await killbill.subscription.provision(
+            header, rows, batch_size=50, concurrency=16
+        ).run()
+
+        print(f"{len(run.results)} bundles, {len(run.failed)} failed chunks")
+
+        # retry the failed chunks
+        retry = await killbill.subscription.provision(
+            header, (row for _, row, _ in run.failed_rows())
+        ).run()
+        ```
+        """
+
+        return AsyncChunkRun(
+            lambda chunk: self.create_multiple_with_add_ons(
+                header,
+                chunk.account_id,
+                [plans for _, plans in chunk.rows],
+                start_date,
+            ),
+            chunk_by_account(rows, batch_size),
+            concurrency,
+        )
+
+    async def add_custom_fields(
+        self,
+        header: Header,
+        subscription_id: str,
+        fields: dict,
+    ):
+        """Add custom fields to subscription"""
+
+        await self._add_custom_fields(
+            header,
+            path="subscriptions",
+            object_id=subscription_id,
+            fields=fields,
+            object_type=ObjectType.SUBSCRIPTION,
+        )
+
+    async def get_custom_fields(
+        self, header: Header, subscription_id: str, audit: Audit = Audit.NONE
+    ):
+        """Retrieve subscription custom fields"""
+
+        return await self._get_custom_fields(
+            header, path="subscriptions", object_id=subscription_id, audit=audit
+        )
+
+    async def update_custom_fields(
+        self,
+        header: Header,
+        subscription_id: str,
+        fields: List[dict],
+    ):
+        """Modify custom fields to subscription
+
+        Example:
+        ```python
+        await killbill.subscription.update_custom_fields(
+            header,
+            subscription_id="subscription_id",
+            fields=[
+                {
+                    "name": "name",
+                    "value": "value",
+                    "field_id": "field_id",
+                }
+            ],
+        )
+
+        ```
+        """
+
+        await self._update_custom_fields(
+            header,
+            path="subscriptions",
+            object_id=subscription_id,
+            fields=fields,
+            object_type=ObjectType.SUBSCRIPTION,
+        )
+
+    async def update_bill_cycle_date(
+        self,
+        header: Header,
+        subscription_id: str,
+        day: int,
+        effective_from_date: str = None,
+        force_new_bcd_with_past_effective_date: bool = False,
+    ):
+        """Allows you to change the Bill Cycle Date"""
+
+        payload = {"billCycleDayLocal": day}
+
+        params = {
+            "effectiveFromDate": effective_from_date,
+            "forceNewBcdWithPastEffectiveDate": force_new_bcd_with_past_effective_date,
+        }
+
+        response = await self._put(
+            f"subscriptions/{subscription_id}/bcd",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
+
+    async def block(
+        self,
+        header: Header,
+        subscription_id: str,
+        state_name: str,
+        service: str,
+        is_block_change: bool = False,
+        is_block_entitlement: bool = False,
+        is_block_billing: bool = False,
+        requested_date: str = None,
+    ):
+        """
+        Provides a low level interface to add a BlockingState event for this subscription.
+
+        Return the URL to retrieve the subscription blocking states for the account.
+        """
+
+        payload = self._blocking_state_payload(
+            state_name,
+            service,
+            is_block_change=is_block_change,
+            is_block_entitlement=is_block_entitlement,
+            is_block_billing=is_block_billing,
+        )
+
+        params = {"requestedDate": requested_date}
+
+        response = await self._post(
+            f"subscriptions/{subscription_id}/block",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
+        )
+
+        self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
+
+        return response.headers.get("Location")
@@ -0,0 +1,134 @@
+from typing import Union
+
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.header import Header
+
+
+class TenantClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill tenant API"""
+
+    async def create(
+        self,
+        api_key: str,
+        api_secret: str,
+        created_by: str,
+        reason: str = None,
+        comment: str = None,
+        use_global_default: bool = False,
+    ) -> Union[str, None]:
+        """Creates a new tenant.
+
+        Returns:
+            str or None: The tenant's ID or None if the request failed.
+        """
+
+        params = {"useGlobalDefault": use_global_default}
+
+        payload = {
+            "apiKey": api_key,
+            "apiSecret": api_secret,
+        }
+
+        response = await self._post(
+            "tenants",
+            payload=payload,
+            params=params,
+            headers=self._json_headers(
+                Header(
+                    api_key=None,
+                    api_secret=None,
+                    created_by=created_by,
+                    reason=reason,
+                    comment=comment,
+                )
+            ),
+        )
+
+        self._raise_for_status(response)
+
+        return self._get_uuid(response.headers.get("Location"))
+
+    async def retrieve_configuration(self, header: Header):
+        """Retrieve a per tenant configuration (system properties)"""
+
+        response = await self._get(
+            "tenants/uploadPerTenantConfig",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def add_configuration(self, header: Header, config: str):
+        """Add a per tenant configuration (system properties)
+
+
+        >> Example
+        ```python
+        await killbill.tenant.add_configuration(
+            header, config='{"org.killbill.payment.retry.days":"1,8,4,7"}'
+        )
+        ```
+        """
+
+        response = await self._post(
+            "tenants/uploadPerTenantConfig",
+            data=config,
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+    async def delete_configuration(self, header: Header):
+        """Delete a per tenant configuration (system properties)"""
+
+        response = await self._delete(
+            "tenants/uploadPerTenantConfig",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+    async def retrieve_push_notifications(self, header: Header):
+        """Retrieve all push notification subscriptions for the tenant."""
+
+        response = await self._get(
+            "tenants/registerNotificationCallback",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    async def create_push_notification(self, header: Header, callback_url: str) -> None:
+        """Create a new push notification subscription for the tenant.
+
+        Args:
+            header (Header): The authentication headers.
+            callback_url (str): The callback URL for push notifications.
+        """
+        params = {
+            "cb": callback_url,
+        }
+
+        response = await self._post(
+            "tenants/registerNotificationCallback",
+            params=params,
+            headers=self._headers(header),
+        )
+        self._raise_for_status(response)
+
+    async def delete_push_notification(self, header: Header):
+        """Delete all existing push notification subscription.
+
+        Args:
+            header (Header): The authentication headers.
+        """
+        response = await self._delete(
+            "tenants/registerNotificationCallback/",
+            headers=self._headers(header),
+        )
+
+        self._raise_for_status(response)
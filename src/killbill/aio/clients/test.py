@@ -0,0 +1,26 @@
+from killbill.aio.clients.base import AsyncBaseClient
+from killbill.header import Header
+
+
+class TestClient(AsyncBaseClient):
+    """Asynchronous client for the Kill Bill test API"""
+
+    async def clock(self, header: Header, requested_date: str):
+        """Set the clock for the requested date"""
+
+        params = {"requestedDate": requested_date}
+
+        response = await self._post(
+            "test/clock", params=params, headers=self._headers(header)
+        )
+
+        self._raise_for_status(response)
+
+    async def retrieve_clock(self, header: Header):
+        """Retrieve current clock"""
+
+        response = await self._get("test/clock", headers=self._headers(header))
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
@@ -0,0 +1,185 @@
+from typing import TYPE_CHECKING, List, Union
+
+from killbill.aio.transport import AsyncTransport
+from killbill.cache import EntityCache
+from killbill.catalog_index import CatalogIndex
+from killbill.codec import JsonCodec, get_codec
+from killbill.config import ClientConfig, sub_client
+from killbill.hooks import Hook
+from killbill.index import AccountIndex
+from killbill.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from killbill.aio.clients import (
+        AccountClient,
+        BundleClient,
+        CatalogClient,
+        CreditClient,
+        InvoiceClient,
+        OverdueClient,
+        SubscriptionClient,
+        TenantClient,
+        TestClient,
+    )
+
+
+class AsyncKillBillClient:
+    """Asynchronous Kill Bill Client
+
+    Mirrors `KillBillClient` with awaitable methods. All sub-clients share a
+    single transport, by default an `httpx.AsyncClient` connection pool.
+    Sub-clients are created on first access from the shared `config`.
+
+    Args:
+        transport (AsyncTransport, optional): Transport sending the requests,
+            e.g. `AsyncInProcessTransport`. The pool arguments and `http2`
+            only apply to the default `AsyncHttpxTransport`.
+        http2 (bool): Negotiate HTTP/2 with the server.
+        max_connections (int): Maximum number of concurrent connections.
+        max_keepalive_connections (int): Maximum number of idle connections
+            kept alive in the pool.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        retry (RetryPolicy, optional): Retry policy for transient errors,
+            requests are not retried when None.
+        catalog_cache (bool): Cache retrieved catalogs in memory, see
+            `CatalogClient`.
+        hooks (List[Hook], optional): Ordered request hooks, see `Hook`.
+        coalesce (bool): Share one HTTP call between identical concurrent GET
+            requests.
+        entity_cache (EntityCache, optional): Cache of retrieved accounts,
+            bundles and subscriptions, see `EntityCache`.
+        account_index (AccountIndex, optional): Index from account external
+            key to account id, see `AccountIndex`.
+        codec (str | JsonCodec, optional): JSON codec, `"orjson"`,
+            `"msgspec"`, `"json"` or a `JsonCodec` instance. Defaults to the
+            fastest installed library.
+        catalog_index (CatalogIndex, optional): Indexed catalogs, filled by
+            `catalog.index`, against which subscriptions are checked before
+            being sent, see `CatalogIndex`.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        api_url: str = "http://localhost:8080",
+        timeout: int = 30,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        retry: RetryPolicy = None,
+        catalog_cache: bool = False,
+        hooks: List[Hook] = None,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: Union[str, JsonCodec] = None,
+        catalog_index: CatalogIndex = None,
+        transport: AsyncTransport = None,
+        http2: bool = False,
+    ):
+        if transport is None:
+            from killbill.aio.transport import AsyncHttpxTransport
+
+            transport = AsyncHttpxTransport(
+                http2=http2,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+
+        self.config = ClientConfig(
+            username=username,
+            password=password,
+            api_url=api_url,
+            timeout=timeout,
+            transport=transport,
+            retry=retry,
+            hooks=list(hooks or []),
+            catalog_cache=catalog_cache,
+            coalesce=coalesce,
+            entity_cache=entity_cache,
+            account_index=account_index,
+            codec=get_codec(codec),
+            catalog_index=catalog_index,
+        )
+
+    @property
+    def transport(self) -> AsyncTransport:
+        return self.config.transport
+
+    @property
+    def hooks(self) -> List[Hook]:
+        return self.config.hooks
+
+    @sub_client
+    def tenant(self) -> "TenantClient":
+        from killbill.aio.clients.tenant import TenantClient
+
+        return TenantClient(**self.config.client_kwargs())
+
+    @sub_client
+    def catalog(self) -> "CatalogClient":
+        from killbill.aio.clients.catalog import CatalogClient
+
+        return CatalogClient(
+            **self.config.client_kwargs(), cache=self.config.catalog_cache
+        )
+
+    @sub_client
+    def account(self) -> "AccountClient":
+        from killbill.aio.clients.account import AccountClient
+
+        return AccountClient(**self.config.client_kwargs())
+
+    @sub_client
+    def subscription(self) -> "SubscriptionClient":
+        from killbill.aio.clients.subscription import SubscriptionClient
+
+        return SubscriptionClient(**self.config.client_kwargs())
+
+    @sub_client
+    def bundle(self) -> "BundleClient":
+        from killbill.aio.clients.bundle import BundleClient
+
+        return BundleClient(**self.config.client_kwargs())
+
+    @sub_client
+    def overdue(self) -> "OverdueClient":
+        from killbill.aio.clients.overdue import OverdueClient
+
+        return OverdueClient(**self.config.client_kwargs())
+
+    @sub_client
+    def test(self) -> "TestClient":
+        from killbill.aio.clients.test import TestClient
+
+        return TestClient(**self.config.client_kwargs())
+
+    @sub_client
+    def invoice(self) -> "InvoiceClient":
+        from killbill.aio.clients.invoice import InvoiceClient
+
+        return InvoiceClient(**self.config.client_kwargs())
+
+    @sub_client
+    def credit(self) -> "CreditClient":
+        from killbill.aio.clients.credit import CreditClient
+
+        return CreditClient(**self.config.client_kwargs())
+
+    def add_hook(self, hook: Hook):
+        """Append a hook to the chain shared by every sub-client"""
+
+        self.hooks.append(hook)
+
+    async def aclose(self):
+        """Close the transport and its pooled connections"""
+
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
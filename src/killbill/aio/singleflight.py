@@ -0,0 +1,24 @@
+import asyncio
+from typing import Awaitable, Callable
+
+
+class AsyncSingleFlight:
+    """Asynchronous counterpart of `SingleFlight`
+
+    The shared call runs in its own task, cancelling one of the callers does
+    not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: tuple, func: Callable[[], Awaitable]):
+        """Await `func()`, or the identical call already in flight"""
+
+        task = self._calls.get(key)
+
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
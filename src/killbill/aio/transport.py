@@ -0,0 +1,227 @@
+import inspect
+from typing import TYPE_CHECKING, Callable, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+from killbill.transport import Request, Response, _drop_none
+
+
+class AsyncTransport:
+    """Base class of the transports used by `AsyncKillBillClient`"""
+
+    # Exceptions raised when the server could not be reached, used to retry
+    connection_errors: Tuple[type, ...] = (ConnectionError,)
+
+    # Connection errors raised before the request was sent, after which even
+    # a POST is retried
+    unsent_errors: Tuple[type, ...] = (ConnectionRefusedError,)
+
+    def unsent(self, error: Exception) -> bool:
+        """Whether a connection error was raised before the request was sent"""
+
+        return isinstance(error, self.unsent_errors)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        """Send a request and return the response"""
+
+        raise NotImplementedError
+
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        """Send a request whose body is then read with `aiter_bytes`
+
+        Error responses are read entirely so their body can be decoded.
+        Transports which cannot stream return a buffered response.
+        """
+
+        return await self.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            json=json,
+            data=data,
+            timeout=timeout,
+            auth=auth,
+        )
+
+    async def aiter_bytes(self, response, chunk_size: int = 65536):
+        """Yield the body of a streamed response, then release it"""
+
+        try:
+            yield response.content
+        finally:
+            response.close()
+
+    async def release(self, response):
+        """Release a response which is discarded, e.g. before a retry"""
+
+        response.close()
+
+    async def aclose(self):
+        """Release the transport resources"""
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """Transport backed by `httpx.AsyncClient`
+
+    Args:
+        http2 (bool): Negotiate HTTP/2 with the server, requires
+            `pip install python-killbill-client[http2]`.
+        max_connections (int): Maximum number of concurrent connections.
+        max_keepalive_connections (int): Maximum number of idle connections.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        client (httpx.AsyncClient, optional): Client to use instead of
+            creating one.
+    """
+
+    def __init__(
+        self,
+        http2: bool = False,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        client: "httpx.AsyncClient" = None,
+    ):
+        import httpx
+
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+
+        self.client = client
+        self.connection_errors = (httpx.TransportError,)
+        self.unsent_errors = (
+            httpx.ConnectError,
+            httpx.ConnectTimeout,
+            httpx.PoolTimeout,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        return await self.client.request(
+            method,
+            url,
+            json=json,
+            content=data,
+            timeout=timeout,
+            auth=auth,
+            headers=_drop_none(headers),
+            params=_drop_none(params),
+        )
+
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        request = self.client.build_request(
+            method,
+            url,
+            json=json,
+            content=data,
+            timeout=timeout,
+            headers=_drop_none(headers),
+            params=_drop_none(params),
+        )
+        response = await self.client.send(request, auth=auth, stream=True)
+
+        # Read error bodies so they can be decoded, releasing the connection
+        if response.status_code >= 400:
+            await response.aread()
+
+        return response
+
+    async def aiter_bytes(self, response, chunk_size: int = 65536):
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def release(self, response):
+        await response.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class AsyncInProcessTransport(AsyncTransport):
+    """Transport calling a Python handler instead of opening sockets
+
+    The handler receives a `killbill.transport.Request` and returns a
+    `killbill.transport.Response`; it may be a plain function or a
+    coroutine function.
+    """
+
+    def __init__(self, handler: Callable[[Request], Response]):
+        self.handler = handler
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        response = self.handler(
+            Request(
+                method=method,
+                url=url,
+                headers=_drop_none(headers) or {},
+                params=_drop_none(params) or {},
+                json=json,
+                data=data,
+                auth=auth,
+            )
+        )
+
+        if inspect.isawaitable(response):
+            response = await response
+
+        return response
@@ -0,0 +1,600 @@
+"""Revenue analytics over the invoices of a tenant
+
+Requires `pip install python-killbill-client[analytics]`.
+"""
+
+import math
+import threading
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from killbill.bulk import BulkRun
+from killbill.header import Header
+
+_EPOCH = date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min
+
+# Keys of the group-bys, and the table columns they are read from
+ITEM_KEYS = ("currency", "account", "plan", "product", "phase", "type", "period")
+INVOICE_KEYS = ("currency", "account", "status", "period")
+
+DateLike = Union[str, date]
+
+
+def _day(value) -> int:
+    """Days since the epoch of an ISO date or date-time, NaT when missing"""
+
+    if value is None:
+        return _NAT
+
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+
+    return value.toordinal() - _EPOCH
+
+
+def _add_months(start: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Shift dates by whole months, keeping their day of the month
+
+    The day is clamped to the end of shorter months, and a date on the last
+    day of its month stays on the last day, like a billing cycle day.
+    """
+
+    first = start.astype("datetime64[M]")
+    day = (start - first.astype("datetime64[D]")).astype(np.int64)
+    last = (first + 1).astype("datetime64[D]") - start == 1
+
+    shifted = first + months
+    shifted_day = shifted.astype("datetime64[D]")
+    length = ((shifted + 1).astype("datetime64[D]") - shifted_day).astype(np.int64)
+    day = np.where(last, length - 1, np.minimum(day, length - 1))
+
+    return shifted_day + day
+
+
+def _months(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Length in months of service periods
+
+    Whole billing months count as one whatever their number of days, the
+    rest of a period is prorated by the days of the month it falls in.
+    """
+
+    whole = end.astype("datetime64[M]") - start.astype("datetime64[M]")
+    whole = whole.astype(np.int64)
+    whole = np.where(_add_months(start, whole) > end, whole - 1, whole)
+
+    anchor = _add_months(start, whole)
+    rest = (end - anchor).astype(np.int64)
+    length = (_add_months(start, whole + 1) - anchor).astype(np.int64)
+
+    return whole + rest / length
+
+
+class Categories:
+    """Dictionary encoding of a string column"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value) -> int:
+        code = self.codes.get(value)
+
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class RevenueData:
+    """Invoices and invoice items of a tenant, stored as columns
+
+    Rows are appended to typed arrays, strings are dictionary encoded and
+    dates stored as days, so memory only grows with the columns. The
+    aggregates group the rows with vectorized NumPy operations; their
+    results map a tuple of the `by` keys to a value.
+
+    Example:
+    ```python
+    data = RevenueData.load(killbill, header, concurrency=16)
+
+    data.mrr("2024-06-01", by=("currency", "product"))
+    data.ar_aging("2024-06-01")
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.categories = {
+            name: Categories()
+            for name in (
+                "currency",
+                "account",
+                "status",
+                "plan",
+                "product",
+                "phase",
+                "type",
+            )
+        }
+        self.failed = []
+
+        # Invoice columns
+        self._invoice_account = array("i")
+        self._invoice_currency = array("i")
+        self._invoice_status = array("i")
+        self._invoice_date = array("q")
+        self._invoice_amount = array("d")
+        self._invoice_balance = array("d")
+
+        # Invoice item columns, `_item_invoice` is the row of the invoice
+        self._item_invoice = array("q")
+        self._item_account = array("i")
+        self._item_currency = array("i")
+        self._item_type = array("i")
+        self._item_plan = array("i")
+        self._item_product = array("i")
+        self._item_phase = array("i")
+        self._item_amount = array("d")
+        self._item_start = array("q")
+        self._item_end = array("q")
+
+    @classmethod
+    def load(
+        cls,
+        killbill,
+        header: Header,
+        account_ids: Iterable[str] = None,
+        concurrency: int = 8,
+    ) -> "RevenueData":
+        """Load the invoices and invoice items of many accounts
+
+        The invoices of an account are streamed from `account.invoices`,
+        then appended to the columns together, so that an account which
+        fails is not partially loaded. `concurrency` accounts are read at a
+        time.
+
+        Args:
+            killbill (KillBillClient): Client to read the invoices with.
+            account_ids (Iterable[str], optional): Accounts to load, every
+                account of the tenant by default.
+            concurrency (int): Number of accounts read in parallel.
+
+        Returns:
+            RevenueData: The loaded data, accounts which could not be read
+            are recorded in `failed` with their error.
+        """
+
+        data = cls()
+
+        if account_ids is None:
+            accounts = killbill.account.iter_accounts(header, limit=1000)
+            account_ids = (account["accountId"] for account in accounts)
+
+        def load_account(account_id: str):
+            try:
+                invoices = list(
+                    killbill.account.invoices(
+                        header, account_id, include_invoice_components=True, stream=True
+                    )
+                )
+            except Exception as error:
+                data.failed.append((account_id, error))
+                raise
+
+            return data.extend(invoices)
+
+        for _ in BulkRun(load_account, account_ids, concurrency):
+            pass
+
+        return data
+
+    def extend(self, invoices: Iterable[dict]) -> int:
+        """Append invoices, with their items, and return their number"""
+
+        count = 0
+
+        for invoice in invoices:
+            self.add_invoice(invoice)
+            count += 1
+
+        return count
+
+    def add_invoice(self, invoice: dict):
+        """Append an invoice, as returned by the API, and its items"""
+
+        categories = self.categories
+        invoice_date = _day(invoice.get("invoiceDate"))
+
+        with self._lock:
+            account = categories["account"].code(invoice.get("accountId"))
+            currency = categories["currency"].code(invoice.get("currency"))
+            status = categories["status"].code(invoice.get("status"))
+            row = len(self._invoice_account)
+            self._invoice_account.append(account)
+            self._invoice_currency.append(currency)
+            self._invoice_status.append(status)
+            self._invoice_date.append(invoice_date)
+            self._invoice_amount.append(invoice.get("amount") or 0.0)
+            self._invoice_balance.append(invoice.get("balance") or 0.0)
+
+            for item in invoice.get("items") or ():
+                self._item_invoice.append(row)
+                self._item_account.append(account)
+                self._item_currency.append(
+                    categories["currency"].code(item.get("currency"))
+                )
+                self._item_type.append(categories["type"].code(item.get("itemType")))
+                self._item_plan.append(categories["plan"].code(item.get("planName")))
+                self._item_product.append(
+                    categories["product"].code(item.get("productName"))
+                )
+                self._item_phase.append(categories["phase"].code(item.get("phaseName")))
+                self._item_amount.append(item.get("amount") or 0.0)
+                self._item_start.append(_day(item.get("startDate")))
+                self._item_end.append(_day(item.get("endDate")))
+
+    def __len__(self) -> int:
+        """Number of invoices"""
+
+        return len(self._invoice_account)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns"""
+
+        return sum(
+            column.itemsize * len(column)
+            for column in vars(self).values()
+            if isinstance(column, array)
+        )
+
+    def invoices(self) -> Dict[str, np.ndarray]:
+        """Invoice columns, as read-only NumPy views of the data
+
+        Invoices cannot be added while a view is alive.
+        """
+
+        return {
+            "account": _view(self._invoice_account, np.int32),
+            "currency": _view(self._invoice_currency, np.int32),
+            "status": _view(self._invoice_status, np.int32),
+            "date": _view(self._invoice_date, np.int64).view("datetime64[D]"),
+            "amount": _view(self._invoice_amount, np.float64),
+            "balance": _view(self._invoice_balance, np.float64),
+        }
+
+    def items(self) -> Dict[str, np.ndarray]:
+        """Invoice item columns, as read-only NumPy views of the data"""
+
+        return {
+            "invoice": _view(self._item_invoice, np.int64),
+            "account": _view(self._item_account, np.int32),
+            "currency": _view(self._item_currency, np.int32),
+            "type": _view(self._item_type, np.int32),
+            "plan": _view(self._item_plan, np.int32),
+            "product": _view(self._item_product, np.int32),
+            "phase": _view(self._item_phase, np.int32),
+            "amount": _view(self._item_amount, np.float64),
+            "start": _view(self._item_start, np.int64).view("datetime64[D]"),
+            "end": _view(self._item_end, np.int64).view("datetime64[D]"),
+        }
+
+    def mrr(
+        self, as_of: DateLike, by: Sequence[str] = ("currency",)
+    ) -> Dict[tuple, float]:
+        """Monthly recurring revenue on a date
+
+        The recurring items of the committed invoices whose service period
+        covers `as_of` are normalized to a month and summed.
+
+        Args:
+            as_of (str | date): Date of the measure.
+            by (Sequence[str]): Keys among "currency", "account", "plan",
+                "product", "phase", "type" and "period" (month of the
+                invoice).
+        """
+
+        items = self.items()
+        monthly = self._monthly(items)
+        day = np.datetime64(_day(as_of), "D")
+        mask = (items["start"] <= day) & (day < items["end"]) & (monthly != 0)
+
+        return self._group(by, self._item_keys(items, by), monthly, mask)
+
+    def arr(
+        self, as_of: DateLike, by: Sequence[str] = ("currency",)
+    ) -> Dict[tuple, float]:
+        """Annual recurring revenue on a date, twelve times the `mrr`"""
+
+        return {key: value * 12 for key, value in self.mrr(as_of, by).items()}
+
+    def billings(
+        self, by: Sequence[str] = ("currency", "period")
+    ) -> Dict[tuple, float]:
+        """Sum of the committed invoice item amounts
+
+        Args:
+            by (Sequence[str]): Keys, see `mrr`.
+        """
+
+        items = self.items()
+        mask = self._committed()[items["invoice"]]
+
+        return self._group(by, self._item_keys(items, by), items["amount"], mask)
+
+    def churn(
+        self, start: DateLike, end: DateLike, by: Sequence[str] = ("currency",)
+    ) -> Dict[tuple, dict]:
+        """Accounts and recurring revenue lost between two dates
+
+        An account churned when it had recurring revenue on `start` and none
+        on `end`.
+
+        Args:
+            by (Sequence[str]): Keys, see `mrr`, "account" and "period" are
+                not allowed.
+
+        Returns:
+            dict: Map the keys to `accounts` (with revenue on `start`),
+            `churned`, `rate`, `mrr` (on `start`), `churned_mrr` and
+            `mrr_rate`. Empty when no account had recurring revenue on
+            `start`.
+        """
+
+        if "account" in by or "period" in by:
+            raise ValueError("churn cannot be grouped by account or period")
+
+        items = self.items()
+        monthly = self._monthly(items)
+        first = np.datetime64(_day(start), "D")
+        last = np.datetime64(_day(end), "D")
+        at_start = (items["start"] <= first) & (first < items["end"])
+        at_end = (items["start"] <= last) & (last < items["end"])
+        mask = (at_start | at_end) & (monthly != 0)
+
+        keys = self._item_keys(items, tuple(by) + ("account",))
+        groups, inverse = _factorize([key[mask] for key in keys], mask.sum())
+        start_mrr = np.bincount(
+            inverse, weights=monthly[mask] * at_start[mask], minlength=len(groups)
+        )
+        end_mrr = np.bincount(
+            inverse, weights=monthly[mask] * at_end[mask], minlength=len(groups)
+        )
+
+        active = start_mrr > 0
+        churned = active & (end_mrr <= 0)
+        by_groups, by_inverse = _factorize(
+            [column[active] for column in groups.T[:-1]], active.sum()
+        )
+        count = np.bincount(by_inverse, minlength=len(by_groups))
+        lost = np.bincount(
+            by_inverse, weights=churned[active], minlength=len(by_groups)
+        )
+        revenue = np.bincount(
+            by_inverse, weights=start_mrr[active], minlength=len(by_groups)
+        )
+        lost_revenue = np.bincount(
+            by_inverse,
+            weights=start_mrr[active] * churned[active],
+            minlength=len(by_groups),
+        )
+
+        return {
+            key: {
+                "accounts": int(count[row]),
+                "churned": int(lost[row]),
+                "rate": float(lost[row] / count[row]),
+                "mrr": float(revenue[row]),
+                "churned_mrr": float(lost_revenue[row]),
+                "mrr_rate": float(lost_revenue[row] / revenue[row]),
+            }
+            for row, key in enumerate(self._labels(by, by_groups))
+            if count[row]
+        }
+
+    def ar_aging(
+        self,
+        as_of: DateLike,
+        buckets: Sequence[int] = (30, 60, 90),
+        by: Sequence[str] = ("currency",),
+    ) -> Dict[tuple, Dict[str, float]]:
+        """Unpaid balance of the committed invoices, by age in days
+
+        Args:
+            as_of (str | date): Date the ages are measured at.
+            buckets (Sequence[int]): Upper bounds, in days, of the buckets,
+                the last bucket holds the older invoices.
+            by (Sequence[str]): Keys among "currency", "account", "status"
+                and "period".
+
+        Returns:
+            dict: Map the keys to the balance of each bucket, e.g.
+            `{("USD",): {"0-30": 120.0, "31-60": 0.0, ..., "91+": 10.0}}`.
+        """
+
+        invoices = self.invoices()
+        day = np.datetime64(_day(as_of), "D")
+        age = (day - invoices["date"]).astype(np.int64)
+        mask = self._committed() & (invoices["balance"] > 0) & (age >= 0)
+        bucket = np.digitize(age, buckets, right=True)
+
+        keys = self._invoice_keys(invoices, by) + [bucket]
+        groups, inverse = _factorize([key[mask] for key in keys], mask.sum())
+        sums = np.bincount(
+            inverse, weights=invoices["balance"][mask], minlength=len(groups)
+        )
+
+        labels = [
+            f"{low + 1 if low else 0}-{high}"
+            for low, high in zip((0,) + tuple(buckets), buckets)
+        ] + [f"{buckets[-1] + 1}+"]
+        by_groups, by_inverse = _factorize(list(groups.T[:-1]), len(groups))
+        aging = {key: dict.fromkeys(labels, 0.0) for key in self._labels(by, by_groups)}
+        keys = list(aging)
+
+        for row, group in enumerate(groups):
+            aging[keys[by_inverse[row]]][labels[group[-1]]] = float(sums[row])
+
+        return aging
+
+    def to_arrow(self):
+        """Return the invoices and invoice items as two `pyarrow.Table`
+
+        String columns are dictionary arrays sharing the data's encoding.
+        Requires `pyarrow`.
+        """
+
+        import pyarrow
+
+        def table(columns: Dict[str, np.ndarray]):
+            arrays = {}
+
+            for name, column in columns.items():
+                if name in self.categories:
+                    arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                        column, self.categories[name].values
+                    )
+                else:
+                    arrays[name] = pyarrow.array(column)
+
+            return pyarrow.table(arrays)
+
+        return table(self.invoices()), table(self.items())
+
+    def _committed(self) -> np.ndarray:
+        """Mask of the invoices which are neither draft nor void"""
+
+        codes = self.categories["status"].codes
+        status = self.invoices()["status"]
+        excluded = [codes[name] for name in ("DRAFT", "VOID") if name in codes]
+
+        return ~np.isin(status, excluded)
+
+    def _monthly(self, items: Dict[str, np.ndarray]) -> np.ndarray:
+        """Amount of the committed recurring items, normalized to a month
+
+        The amount is divided by the number of months of the service period,
+        see `_months`, so a flat plan has the same MRR every month.
+        """
+
+        recurring = self.categories["type"].codes.get("RECURRING")
+        mask = (
+            (items["type"] == recurring)
+            & self._committed()[items["invoice"]]
+            & ~np.isnat(items["start"])
+            & ~np.isnat(items["end"])
+        )
+        mask[mask] = items["end"][mask] > items["start"][mask]
+
+        monthly = np.zeros(len(mask))
+        monthly[mask] = items["amount"][mask] / _months(
+            items["start"][mask], items["end"][mask]
+        )
+
+        return monthly
+
+    def _item_keys(self, items: Dict[str, np.ndarray], by: Sequence[str]):
+        keys = []
+
+        for name in by:
+            if name not in ITEM_KEYS:
+                raise ValueError(f"unknown key {name!r}, expected one of {ITEM_KEYS}")
+            if name == "period":
+                dates = self.invoices()["date"][items["invoice"]]
+                keys.append(dates.astype("datetime64[M]").astype(np.int64))
+            else:
+                keys.append(items[name])
+
+        return keys
+
+    def _invoice_keys(self, invoices: Dict[str, np.ndarray], by: Sequence[str]):
+        keys = []
+
+        for name in by:
+            if name not in INVOICE_KEYS:
+                raise ValueError(
+                    f"unknown key {name!r}, expected one of {INVOICE_KEYS}"
+                )
+            if name == "period":
+                keys.append(invoices["date"].astype("datetime64[M]").astype(np.int64))
+            else:
+                keys.append(invoices[name])
+
+        return keys
+
+    def _group(
+        self, by: Sequence[str], keys, values: np.ndarray, mask: np.ndarray
+    ) -> Dict[tuple, float]:
+        """Sum `values` where `mask` is set, by distinct `keys`"""
+
+        groups, inverse = _factorize([key[mask] for key in keys], mask.sum())
+        sums = np.bincount(inverse, weights=values[mask], minlength=len(groups))
+
+        return {key: float(total) for key, total in zip(self._labels(by, groups), sums)}
+
+    def _labels(self, by: Sequence[str], groups: np.ndarray):
+        """Decode the rows of group codes into tuples of values"""
+
+        labels = []
+
+        for group in groups:
+            label = []
+            for name, code in zip(by, group):
+                if name == "period":
+                    label.append(str(np.datetime64(int(code), "M")))
+                else:
+                    label.append(self.categories[name].values[code])
+            labels.append(tuple(label))
+
+        return labels
+
+
+def _view(column: array, dtype) -> np.ndarray:
+    """Read-only NumPy view of an array column, without copy"""
+
+    if not len(column):
+        return np.empty(0, dtype)
+
+    view = np.frombuffer(column, dtype)
+    view.flags.writeable = False
+    return view
+
+
+def _factorize(keys, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the distinct rows of the key columns and the row of each value
+
+    Without keys, the `size` values all belong to a single empty group.
+    """
+
+    if not keys:
+        return np.empty((1, 0), np.int64), np.zeros(size, np.intp)
+
+    keys = [np.asarray(key, np.int64) for key in keys]
+    bounds = [(int(key.min()), int(key.max())) if size else (0, 0) for key in keys]
+
+    if math.prod(high - low + 1 for low, high in bounds) >= 2**62:
+        groups, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+        return groups, inverse.reshape(-1)
+
+    # Combine the key columns into one integer, which sorts much faster
+    combined = np.zeros(size, np.int64)
+    for key, (low, high) in zip(keys, bounds):
+        combined = combined * (high - low + 1) + (key - low)
+
+    unique, inverse = np.unique(combined, return_inverse=True)
+    groups = np.empty((len(unique), len(keys)), np.int64)
+
+    for column in reversed(range(len(keys))):
+        low, high = bounds[column]
+        unique, groups[:, column] = np.divmod(unique, high - low + 1)
+        groups[:, column] += low
+
+    return groups, inverse.reshape(-1)
@@ -0,0 +1,307 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Tuple
+
+from killbill.exceptions import KillBillError
+
+
+@dataclass
+class BulkStats:
+    """Throughput statistics of a bulk operation"""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: float = None
+
+    @property
+    def completed(self) -> int:
+        """Number of finished items, successful or not"""
+
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the operation started"""
+
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def rate(self) -> float:
+        """Completed items per second"""
+
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+
+class BulkRun:
+    """Run `func` over `items` in a thread pool and iterate over the results
+
+    Items are read lazily and at most `2 * concurrency` are in flight, so
+    memory does not grow with the input. Iterating yields
+    `(input_index, result)` tuples in completion order, where `result` is
+    the exception raised for failed items. `stats` is updated as results
+    are consumed.
+    """
+
+    def __init__(self, func: Callable, items: Iterable, concurrency: int = 8):
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+
+        self.func = func
+        self.items = items
+        self.concurrency = concurrency
+        self.stats = BulkStats()
+
+    def _call(self, item):
+        try:
+            return True, self.func(item)
+        except Exception as error:
+            return False, error
+
+    def __iter__(self):
+        self.stats = BulkStats()
+        items = enumerate(self.items)
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    for index, item in items:
+                        pending[executor.submit(self._call, item)] = index
+                        self.stats.submitted += 1
+                        if len(pending) >= 2 * self.concurrency:
+                            break
+
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        index = pending.pop(future)
+                        ok, result = future.result()
+                        if ok:
+                            self.stats.succeeded += 1
+                        else:
+                            self.stats.failed += 1
+                        yield index, result
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.stats.finished = time.monotonic()
+
+
+class AsyncBulkRun:
+    """Run the coroutine function `func` over `items` concurrently
+
+    The asynchronous counterpart of `BulkRun`, iterated with `async for`.
+    """
+
+    def __init__(self, func: Callable, items: Iterable, concurrency: int = 8):
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+
+        self.func = func
+        self.items = items
+        self.concurrency = concurrency
+        self.stats = BulkStats()
+
+    async def _call(self, index, item):
+        try:
+            return index, True, await self.func(item)
+        except Exception as error:
+            return index, False, error
+
+    async def __aiter__(self):
+        self.stats = BulkStats()
+        items = enumerate(self.items)
+        pending = set()
+
+        try:
+            while True:
+                for index, item in items:
+                    pending.add(asyncio.ensure_future(self._call(index, item)))
+                    self.stats.submitted += 1
+                    if len(pending) >= self.concurrency:
+                        break
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    index, ok, result = task.result()
+                    if ok:
+                        self.stats.succeeded += 1
+                    else:
+                        self.stats.failed += 1
+                    yield index, result
+        finally:
+            for task in pending:
+                task.cancel()
+            self.stats.finished = time.monotonic()
+
+
+@dataclass
+class Chunk:
+    """Input rows sent in one bulk request, with their input indexes"""
+
+    indexes: List[int] = field(default_factory=list)
+    rows: list = field(default_factory=list)
+    account_id: str = None
+
+
+def chunked(rows: Iterable, batch_size: int = 100):
+    """Pack rows into chunks of up to `batch_size` consecutive rows"""
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+
+    chunk = Chunk()
+
+    for index, row in enumerate(rows):
+        chunk.indexes.append(index)
+        chunk.rows.append(row)
+
+        if len(chunk.rows) >= batch_size:
+            yield chunk
+            chunk = Chunk()
+
+    if chunk.rows:
+        yield chunk
+
+
+def chunk_by_account(
+    rows: Iterable[Tuple[str, list]], batch_size: int = 50, max_open: int = 1024
+):
+    """Pack `(account_id, plans)` rows into chunks of a single account
+
+    A chunk is emitted as soon as it holds `batch_size` rows. At most
+    `max_open` accounts are buffered, the oldest partial chunk is emitted
+    first, so rows of an account do not have to be contiguous and memory
+    does not grow with the input.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+
+    chunks = {}
+
+    for index, row in enumerate(rows):
+        account_id = row[0]
+
+        chunk = chunks.get(account_id)
+        if chunk is None:
+            chunk = chunks[account_id] = Chunk(account_id=account_id)
+
+        chunk.indexes.append(index)
+        chunk.rows.append(row)
+
+        if len(chunk.rows) >= batch_size:
+            yield chunks.pop(account_id)
+        elif len(chunks) > max_open:
+            yield chunks.pop(next(iter(chunks)))
+
+    yield from chunks.values()
+
+
+class ChunkRun(BulkRun):
+    """`BulkRun` over chunks of rows, where `func` returns one result per row
+
+    Iterating yields `(chunk, results | error)`. A chunk whose results do
+    not match its rows one for one fails with a `KillBillError`. As the run
+    is consumed, `results` maps each input index to its result and `failed`
+    records the failed chunks with their error. `failed_rows()` yields their
+    rows, to match them back to the input or feed them to a new run. `stats`
+    counts chunks.
+    """
+
+    def __init__(self, func: Callable, chunks: Iterable, concurrency: int = 8):
+        super().__init__(func, chunks, concurrency)
+        self.results = {}
+        self.failed = []
+
+    def _call(self, item):
+        ok, result = _check(item, *super()._call(item))
+        return ok, (item, result)
+
+    def __iter__(self):
+        self.results = {}
+        self.failed = []
+
+        for _, (chunk, result) in super().__iter__():
+            _record(self, chunk, result)
+            yield chunk, result
+
+    def run(self):
+        """Consume the whole run and return it"""
+
+        for _ in self:
+            pass
+
+        return self
+
+    def failed_rows(self):
+        """Yield `(input_index, row, error)` for the rows of the failed chunks"""
+
+        for chunk, error in self.failed:
+            for index, row in zip(chunk.indexes, chunk.rows):
+                yield index, row, error
+
+
+class AsyncChunkRun(AsyncBulkRun):
+    """Asynchronous counterpart of `ChunkRun`, iterated with `async for`"""
+
+    def __init__(self, func: Callable, chunks: Iterable, concurrency: int = 8):
+        super().__init__(func, chunks, concurrency)
+        self.results = {}
+        self.failed = []
+
+    async def _call(self, index, item):
+        index, ok, result = await super()._call(index, item)
+        ok, result = _check(item, ok, result)
+        return index, ok, (item, result)
+
+    async def __aiter__(self):
+        self.results = {}
+        self.failed = []
+
+        async for _, (chunk, result) in super().__aiter__():
+            _record(self, chunk, result)
+            yield chunk, result
+
+    async def run(self):
+        """Consume the whole run and return it"""
+
+        async for _ in self:
+            pass
+
+        return self
+
+    failed_rows = ChunkRun.failed_rows
+
+
+def _check(chunk: Chunk, ok: bool, result):
+    """Fail a chunk whose results do not match its rows one for one"""
+
+    if ok and len(result) != len(chunk.rows):
+        return False, KillBillError(
+            f"{len(result)} results returned for {len(chunk.rows)} rows"
+        )
+
+    return ok, result
+
+
+def _record(run, chunk: Chunk, result):
+    if isinstance(result, Exception):
+        run.failed.append((chunk, result))
+    else:
+        run.results.update(zip(chunk.indexes, result))
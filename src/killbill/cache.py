@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of an `EntityCache`"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache"""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _entity_ids(entity) -> set:
+    """Return the account, bundle and subscription ids found in an entity"""
+
+    ids = set()
+
+    if not isinstance(entity, dict):
+        return ids
+
+    for name in ("accountId", "bundleId", "subscriptionId"):
+        if entity.get(name):
+            ids.add(entity[name])
+
+    for subscription in entity.get("subscriptions") or ():
+        if subscription.get("subscriptionId"):
+            ids.add(subscription["subscriptionId"])
+
+    return ids
+
+
+class EntityCache:
+    """Bounded LRU cache, with expiry, of retrieved accounts, bundles and
+    subscriptions
+
+    Entries are keyed by tenant and lookup, and indexed by every account,
+    bundle and subscription id they contain. A mutation made through the
+    client invalidates all the entries of the objects it touches, e.g.
+    cancelling a subscription drops the subscription and its bundle. An
+    entity retrieved while its tenant was invalidated is not stored, see
+    `generation`. Changes made by other processes are only seen once the
+    entries expire.
+
+    Share a single instance between the sub-clients of a `KillBillClient`.
+    Cached entities are shared between callers and must not be mutated.
+
+    Args:
+        maxsize (int): Maximum number of entries, the least recently used
+            entry is evicted first.
+        ttl (float): Seconds an entry is kept.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._index = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: tuple):
+        """Return the cached entity, or None"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            expires, entity, _ = entry
+
+            if expires <= self.clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+
+            return entity
+
+    def generation(self, api_key: str) -> tuple:
+        """Return the invalidation generation of a tenant, to pass to `set`"""
+
+        return self._epoch, self._generations.get(api_key, 0)
+
+    def set(self, key: tuple, entity, generation: tuple = None):
+        """Store an entity, indexed by the ids it contains, unless its tenant
+        was invalidated since `generation` was taken"""
+
+        api_key = key[0]
+        ids = {(api_key, object_id) for object_id in _entity_ids(entity)}
+
+        with self._lock:
+            if generation is not None and generation != self.generation(api_key):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (self.clock() + self.ttl, entity, ids)
+
+            for object_ref in ids:
+                self._index.setdefault(object_ref, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, api_key: str, object_id: str):
+        """Drop every entry of the tenant containing `object_id`"""
+
+        with self._lock:
+            self._generations[api_key] = self._generations.get(api_key, 0) + 1
+
+            for key in self._index.pop((api_key, object_id), ()):
+                if key in self._entries:
+                    self._remove(key)
+                    self._stats.invalidations += 1
+
+    def clear(self):
+        """Drop every entry"""
+
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._index.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the counters"""
+
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
+
+    def _remove(self, key: tuple):
+        _, _, ids = self._entries.pop(key)
+
+        for object_ref in ids:
+            keys = self._index.get(object_ref)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[object_ref]
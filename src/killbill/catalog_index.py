@@ -0,0 +1,482 @@
+import bisect
+import calendar
+import difflib
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+DateLike = Union[str, date]
+
+
+def _date(value: DateLike) -> date:
+    """Date of an ISO date or date-time"""
+
+    if isinstance(value, date):
+        return value
+
+    return date.fromisoformat(value[:10])
+
+
+def _add_duration(start: date, unit: str, number: int) -> Optional[date]:
+    """Add a catalog phase duration to a date, None when unlimited"""
+
+    if unit == "UNLIMITED" or number < 0:
+        return None
+
+    if unit == "DAYS":
+        return start + timedelta(days=number)
+
+    if unit == "WEEKS":
+        return start + timedelta(weeks=number)
+
+    months = number * 12 if unit == "YEARS" else number
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    day = min(start.day, calendar.monthrange(year, month + 1)[1])
+
+    return date(year, month + 1, day)
+
+
+@dataclass(frozen=True)
+class CatalogPhase:
+    """Phase of a catalog plan, with its prices by currency"""
+
+    type: str
+    unit: str = "UNLIMITED"
+    number: int = -1
+    recurring: Mapping[str, float] = field(default_factory=dict)
+    fixed: Mapping[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CatalogPlan:
+    """Plan of a catalog version"""
+
+    name: str
+    product: str
+    category: str
+    billing_period: str
+    price_lists: Tuple[str, ...]
+    phases: Tuple[CatalogPhase, ...]
+
+
+@dataclass(frozen=True)
+class Price:
+    """Price of a plan phase in a currency, None when the phase has none"""
+
+    plan: str
+    phase: str
+    currency: str
+    billing_period: str
+    recurring: Optional[float]
+    fixed: Optional[float]
+
+
+class CatalogVersion:
+    """One version of a catalog, indexed for constant time lookups"""
+
+    def __init__(
+        self,
+        effective_date: date,
+        products: Dict[str, str],
+        available: Dict[str, FrozenSet[str]],
+        included: Dict[str, FrozenSet[str]],
+        plans: List[CatalogPlan],
+    ):
+        self.effective_date = effective_date
+        self.products = products
+        self.available = available
+        self.included = included
+        self.plans = {plan.name: plan for plan in plans}
+        self.by_product = {
+            (plan.product, plan.billing_period, price_list): plan
+            for plan in plans
+            for price_list in plan.price_lists
+        }
+
+
+class Catalog:
+    """Catalog of a tenant, every version, indexed in memory
+
+    Build it from `CatalogClient.retrieve`, in XML or JSON, with `parse`.
+    Plans are found by name or by product, billing period and price list
+    in constant time, in the version effective on a date (today by
+    default), so that subscription requests can be checked and prices
+    answered without calling Kill Bill.
+
+    Example:
+    ```python
+    catalog = Catalog.parse(killbill.catalog.retrieve(header))
+
+    catalog.plan("standard-monthly")
+    catalog.find("Standard", "MONTHLY")
+    catalog.price("standard-monthly", "USD", on="2024-06-01", start_date="2024-05-20")
+    ```
+    """
+
+    def __init__(self, versions: List[CatalogVersion]):
+        if not versions:
+            raise ValueError("the catalog has no version")
+
+        self.versions = sorted(versions, key=lambda version: version.effective_date)
+        self.effective_dates = [version.effective_date for version in self.versions]
+
+    @classmethod
+    def parse(cls, catalog) -> "Catalog":
+        """Build a catalog from the XML or JSON returned by `retrieve`"""
+
+        if isinstance(catalog, bytes):
+            catalog = catalog.decode()
+
+        if isinstance(catalog, str):
+            if catalog.lstrip().startswith("<"):
+                return cls.from_xml(catalog)
+            catalog = json.loads(catalog)
+
+        return cls.from_json(catalog)
+
+    @classmethod
+    def from_json(cls, catalog: Union[list, dict]) -> "Catalog":
+        """Build a catalog from its JSON representation"""
+
+        if isinstance(catalog, dict):
+            catalog = [catalog]
+
+        return cls([_json_version(version) for version in catalog])
+
+    @classmethod
+    def from_xml(cls, catalog: str) -> "Catalog":
+        """Build a catalog from its XML representation, a single `<catalog>`
+        or the `<catalogs>` of every version"""
+
+        from xml.etree import ElementTree
+
+        root = ElementTree.fromstring(catalog)
+
+        if root.tag == "catalog":
+            versions = [root]
+        else:
+            versions = root.findall("versions/version")
+
+        return cls([_xml_version(version) for version in versions])
+
+    def version(self, on: DateLike = None) -> CatalogVersion:
+        """Return the version effective on a date, today by default
+
+        Dates before the first effective date get the first version, so
+        every lookup answers from some version of the catalog.
+        """
+
+        on = _date(on) if on is not None else date.today()
+        position = bisect.bisect_right(self.effective_dates, on)
+
+        return self.versions[max(position - 1, 0)]
+
+    def plan(self, name: str, on: DateLike = None) -> Optional[CatalogPlan]:
+        """Return a plan by name"""
+
+        return self.version(on).plans.get(name)
+
+    def find(
+        self,
+        product: str,
+        billing_period: str,
+        price_list: str = "DEFAULT",
+        on: DateLike = None,
+    ) -> Optional[CatalogPlan]:
+        """Return the plan of a product, billing period and price list"""
+
+        return self.version(on).by_product.get(
+            (product, str(billing_period), price_list)
+        )
+
+    def add_ons(self, product: str, on: DateLike = None) -> FrozenSet[str]:
+        """Return the add-on products allowed with a base product"""
+
+        version = self.version(on)
+
+        return version.available.get(product, frozenset()) | version.included.get(
+            product, frozenset()
+        )
+
+    def price(
+        self,
+        plan_name: str,
+        currency: str,
+        on: DateLike = None,
+        start_date: DateLike = None,
+        phase: str = None,
+    ) -> Optional[Price]:
+        """Return the price of a plan in a currency on a date
+
+        The phase is the one named by `phase`, or the one reached on `on`
+        by a subscription started on `start_date`, or else the final phase.
+        Returns None for an unknown plan.
+        """
+
+        on = _date(on) if on is not None else date.today()
+        plan = self.plan(plan_name, on)
+
+        if plan is None:
+            return None
+
+        current = plan.phases[-1]
+
+        if phase is not None:
+            current = next((p for p in plan.phases if p.type == phase), None)
+            if current is None:
+                return None
+        elif start_date is not None:
+            end = _date(start_date)
+            for candidate in plan.phases:
+                end = _add_duration(end, candidate.unit, candidate.number)
+                if end is None or on < end:
+                    current = candidate
+                    break
+
+        return Price(
+            plan=plan.name,
+            phase=current.type,
+            currency=currency,
+            billing_period=plan.billing_period,
+            recurring=current.recurring.get(currency),
+            fixed=current.fixed.get(currency),
+        )
+
+    def validate(self, entitlements: List[dict], on: DateLike = None) -> List[str]:
+        """Check subscription payloads against the catalog
+
+        `entitlements` are the payloads of one request: a single
+        subscription, or a base plan followed by its add-ons.
+
+        Returns:
+            list: Description of each problem found, empty when valid.
+        """
+
+        if not entitlements:
+            return ["no subscription requested"]
+
+        version = self.version(on)
+        errors = []
+        plans = []
+
+        for entitlement in entitlements:
+            plan, error = self._resolve(version, entitlement)
+            if error:
+                errors.append(error)
+            plans.append(plan)
+
+        if errors:
+            return errors
+
+        base, add_ons = plans[0], plans[1:]
+
+        if not add_ons:
+            if base.category == "ADD_ON" and not entitlements[0].get("bundleId"):
+                errors.append(f"plan '{base.name}' is an add-on, a bundle is required")
+            return errors
+
+        if base.category != "BASE":
+            errors.append(f"plan '{base.name}' is not a base plan")
+            return errors
+
+        allowed = self.add_ons(base.product, on)
+
+        for plan in add_ons:
+            if plan.category != "ADD_ON":
+                errors.append(f"plan '{plan.name}' is not an add-on")
+            elif plan.product not in allowed:
+                errors.append(
+                    f"add-on '{plan.product}' is not available for '{base.product}'"
+                )
+
+        return errors
+
+    @staticmethod
+    def _resolve(version: CatalogVersion, entitlement: dict):
+        """Return the plan of a payload, or an error"""
+
+        name = entitlement.get("planName")
+
+        if name is not None:
+            plan = version.plans.get(name)
+            if plan is not None:
+                return plan, None
+
+            error = f"unknown plan '{name}'"
+            matches = difflib.get_close_matches(name, version.plans, n=1)
+            if matches:
+                error += f", did you mean '{matches[0]}'?"
+            return None, error
+
+        product = entitlement.get("productName")
+        billing_period = entitlement.get("billingPeriod")
+        price_list = entitlement.get("priceList") or "DEFAULT"
+
+        if product is None or billing_period is None:
+            return (
+                None,
+                "either a plan name or a product and billing period is required",
+            )
+
+        plan = version.by_product.get((product, billing_period, price_list))
+        if plan is None:
+            return None, (
+                f"no plan for product '{product}', billing period "
+                f"'{billing_period}' and price list '{price_list}'"
+            )
+
+        return plan, None
+
+
+class CatalogIndex:
+    """Indexed catalogs of the tenants, by API key
+
+    Filled by `CatalogClient.index`, and dropped when the catalog of the
+    tenant is changed through the client. Subscriptions created with a
+    client holding the index are checked against it before being sent.
+    """
+
+    def __init__(self):
+        self._catalogs = {}
+
+    def get(self, api_key: str) -> Optional[Catalog]:
+        return self._catalogs.get(api_key)
+
+    def set(self, api_key: str, catalog: Catalog):
+        self._catalogs[api_key] = catalog
+
+    def invalidate(self, api_key: str = None):
+        """Drop the catalog of a tenant, or of every tenant"""
+
+        if api_key is None:
+            self._catalogs.clear()
+        else:
+            self._catalogs.pop(api_key, None)
+
+    def observe_versions(self, api_key: str, versions: list):
+        """Drop the catalog of a tenant when its versions changed"""
+
+        catalog = self._catalogs.get(api_key)
+
+        if catalog is not None and catalog.effective_dates != sorted(
+            _date(version) for version in versions
+        ):
+            self.invalidate(api_key)
+
+
+def _prices(prices: list) -> Dict[str, float]:
+    return {price["currency"]: float(price["value"]) for price in prices or ()}
+
+
+def _json_version(version: dict) -> CatalogVersion:
+    price_lists = {}
+
+    for price_list in version.get("priceLists") or ():
+        for name in price_list.get("plans") or ():
+            price_lists.setdefault(name, []).append(price_list["name"])
+
+    products = {}
+    available = {}
+    included = {}
+    plans = []
+
+    for product in version.get("products") or ():
+        name = product["name"]
+        products[name] = product.get("type")
+        available[name] = frozenset(product.get("available") or ())
+        included[name] = frozenset(product.get("included") or ())
+
+        for plan in product.get("plans") or ():
+            phases = tuple(
+                CatalogPhase(
+                    type=phase.get("type"),
+                    unit=(phase.get("duration") or {}).get("unit", "UNLIMITED"),
+                    number=(phase.get("duration") or {}).get("number", -1),
+                    recurring=_prices(phase.get("prices")),
+                    fixed=_prices(phase.get("fixedPrices")),
+                )
+                for phase in plan.get("phases") or ()
+            )
+            plans.append(
+                CatalogPlan(
+                    name=plan["name"],
+                    product=name,
+                    category=product.get("type"),
+                    billing_period=plan.get("billingPeriod"),
+                    price_lists=tuple(price_lists.get(plan["name"], ("DEFAULT",))),
+                    phases=phases,
+                )
+            )
+
+    return CatalogVersion(
+        _date(version["effectiveDate"]), products, available, included, plans
+    )
+
+
+def _xml_prices(element) -> Dict[str, float]:
+    if element is None:
+        return {}
+
+    return {
+        price.findtext("currency"): float(price.findtext("value"))
+        for price in element.iter("price")
+    }
+
+
+def _xml_phase(element) -> CatalogPhase:
+    return CatalogPhase(
+        type=element.get("type"),
+        unit=element.findtext("duration/unit", "UNLIMITED"),
+        number=int(element.findtext("duration/number", "-1")),
+        recurring=_xml_prices(element.find("recurring/recurringPrice")),
+        fixed=_xml_prices(element.find("fixed")),
+    )
+
+
+def _xml_version(version) -> CatalogVersion:
+    price_lists = {}
+
+    for price_list in version.iterfind("priceLists/*"):
+        name = price_list.get("name", "DEFAULT")
+        for plan in price_list.iterfind("plans/plan"):
+            price_lists.setdefault(plan.text, []).append(name)
+
+    products = {}
+    available = {}
+    included = {}
+
+    for product in version.iterfind("products/product"):
+        name = product.get("name")
+        products[name] = product.findtext("category")
+        available[name] = frozenset(
+            add_on.text for add_on in product.iterfind("available/addonProduct")
+        )
+        included[name] = frozenset(
+            add_on.text for add_on in product.iterfind("included/addonProduct")
+        )
+
+    plans = []
+
+    for plan in version.iterfind("plans/plan"):
+        final = plan.find("finalPhase")
+        phases = [_xml_phase(phase) for phase in plan.iterfind("initialPhases/phase")]
+        phases.append(_xml_phase(final))
+        product = plan.findtext("product")
+        plans.append(
+            CatalogPlan(
+                name=plan.get("name"),
+                product=product,
+                category=products.get(product),
+                billing_period=final.findtext(
+                    "recurring/billingPeriod", "NO_BILLING_PERIOD"
+                ),
+                price_lists=tuple(price_lists.get(plan.get("name"), ("DEFAULT",))),
+                phases=tuple(phases),
+            )
+        )
+
+    return CatalogVersion(
+        _date(version.findtext("effectiveDate")), products, available, included, plans
+    )
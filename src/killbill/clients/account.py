@@ -1,16 +1,17 @@
-from typing import List, Union
+from typing import Callable, Iterable, List, Optional, Union
 
+from killbill.bulk import BulkRun
 from killbill.clients.base import BaseClientWithCustomFields, BaseClientWithTags
 from killbill.enums import Audit, BlockingStateType, ObjectType, TransactionType
+from killbill.export import ExportStats, TenantExport
 from killbill.header import Header
 
 
 class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     """Client for the Kill Bill account API"""
 
-    def create(
-        self,
-        header: Header,
+    @staticmethod
+    def _create_payload(
         name=None,
         first_name_length=None,
         external_key=None,
@@ -30,13 +31,9 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         notes=None,
         is_migrated: bool = None,
     ):
-        """Creates account
+        """Build the payload to create an account"""
 
-        Returns:
-            str or None: The account's ID or None if the request failed.
-        """
-
-        payload = {
+        return {
             "name": name,
             "firstNameLength": first_name_length,
             "externalKey": external_key,
@@ -57,15 +54,107 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
             "isMigrated": is_migrated,
         }
 
+    def create(
+        self,
+        header: Header,
+        name=None,
+        first_name_length=None,
+        external_key=None,
+        email=None,
+        bill_cycle_day_local=None,
+        currency=None,
+        time_zone=None,
+        locale=None,
+        address1=None,
+        address2=None,
+        postal_code=None,
+        company=None,
+        city=None,
+        state=None,
+        country=None,
+        phone=None,
+        notes=None,
+        is_migrated: bool = None,
+    ):
+        """Creates account
+
+        Returns:
+            str or None: The account's ID or None if the request failed.
+        """
+
+        payload = self._create_payload(
+            name=name,
+            first_name_length=first_name_length,
+            external_key=external_key,
+            email=email,
+            bill_cycle_day_local=bill_cycle_day_local,
+            currency=currency,
+            time_zone=time_zone,
+            locale=locale,
+            address1=address1,
+            address2=address2,
+            postal_code=postal_code,
+            company=company,
+            city=city,
+            state=state,
+            country=country,
+            phone=phone,
+            notes=notes,
+            is_migrated=is_migrated,
+        )
+
         response = self._post(
             "accounts",
             payload=payload,
-            headers=header.dict(),
+            headers=self._json_headers(header),
         )
 
         self._raise_for_status(response)
 
-        return self._get_uuid(response.headers.get("Location"))
+        account_id = self._get_uuid(response.headers.get("Location"))
+
+        if external_key and self.account_index is not None:
+            self.account_index.set(header.api_key, external_key, account_id)
+
+        return account_id
+
+    def create_many(
+        self,
+        header: Header,
+        accounts: Iterable[dict],
+        concurrency: int = 8,
+    ) -> BulkRun:
+        """Create accounts concurrently
+
+        Args:
+            accounts (Iterable[dict]): Keyword arguments of `create` for each
+                account, read lazily.
+            concurrency (int): Number of accounts created in parallel, keep
+                it below the client's `pool_maxsize`.
+
+        Returns:
+            BulkRun: Iterator of `(input_index, account_id | error)` in
+            completion order, with throughput statistics in `stats`.
+
+        Example:
+        ```python
+        run = killbill.account.create_many(
+            header,
+            ({"name": row["name"], "external_key": row["id"]} for row in rows),
+            concurrency=16,
+        )
+
+        for index, result in run:
+            if isinstance(result, Exception):
+                print(f"row {index} failed: {result}")
+
+        print(f"{run.stats.rate:.1f} accounts/s")
+        ```
+        """
+
+        return BulkRun(
+            lambda account: self.create(header, **account), accounts, concurrency
+        )
 
     def list(
         self,
@@ -75,14 +164,18 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         account_with_balance: bool = False,
         account_with_balance_and_cba: bool = False,
         audit: Audit = Audit.NONE,
+        stream: bool = False,
     ):
         """List accounts
 
         Args:
             audit : "NONE", "MINIMAL", "FULL"
+            stream (bool): Return an iterator yielding the accounts as the
+                body is parsed instead of a list, memory stays flat whatever
+                the `limit`.
         """
 
-        payload = {
+        params = {
             "offset": offset,
             "limit": limit,
             "accountWithBalance": account_with_balance,
@@ -90,15 +183,174 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
             "audit": str(audit),
         }
 
+        if stream:
+            return self._get_stream(
+                "accounts/pagination", self._headers(header), params=params
+            )
+
         response = self._get(
             "accounts/pagination",
-            payload=payload,
-            headers=header.dict(),
+            headers=self._headers(header),
+            params=params,
+        )
+
+        self._raise_for_status(response)
+
+        return self._decode(response)
+
+    def iter_accounts(
+        self,
+        header: Header,
+        limit: int = 100,
+        account_with_balance: bool = False,
+        account_with_balance_and_cba: bool = False,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+        offset: int = 0,
+    ):
+        """Iterate over all accounts, following the pagination
+
+        Args:
+            limit (int): Number of accounts fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+            offset (int): Number of accounts to skip.
+        """
+
+        params = {
+            "offset": offset,
+            "limit": limit,
+            "accountWithBalance": account_with_balance,
+            "accountWithBalanceAndCBA": account_with_balance_and_cba,
+            "audit": str(audit),
+        }
+
+        yield from self._paginate(header, "accounts/pagination", params, prefetch)
+
+    def count(self, header: Header) -> Optional[int]:
+        """Return the number of accounts of the tenant
+
+        Read from the pagination headers, None when the server omits them.
+        """
+
+        response = self._get(
+            "accounts/pagination",
+            headers=self._headers(header),
+            params={"offset": 0, "limit": 1},
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        total = response.headers.get("X-Killbill-Pagination-TotalNbRecords")
+
+        return int(total) if total is not None else None
+
+    def export(
+        self,
+        header: Header,
+        directory: str,
+        format: str = "ndjson",
+        page_size: int = 1000,
+        concurrency: int = 16,
+        partitions: Iterable[int] = None,
+        resume: bool = True,
+        progress: Callable[[ExportStats], None] = None,
+        audit: Audit = Audit.NONE,
+    ) -> TenantExport:
+        """Export every account of the tenant with its related objects
+
+        Accounts are exported by partitions of `page_size`, each written to
+        its own file in `directory` and recorded in a checkpoint, so that a
+        new run resumes an interrupted export. One row is written per
+        account, holding the account fields and the `bundles` (with their
+        subscriptions), `invoices` (with their items), `paymentMethods`,
+        `tags` and `customFields` keys.
+
+        Args:
+            directory (str): Output directory.
+            format (str): "ndjson", or "parquet" which requires
+                `pip install python-killbill-client[parquet]`.
+            page_size (int): Number of accounts per partition and file.
+            concurrency (int): Number of requests in flight.
+            partitions (Iterable[int], optional): Export only these
+                partitions, all of them by default.
+            resume (bool): Skip the partitions already exported.
+            progress (Callable, optional): Called with the `ExportStats`
+                after each partition.
+
+        Returns:
+            TenantExport: Call `run()` to export, failed partitions are left
+            in `failed` and retried by the next run.
+
+        Example:
+        ```python
+        export = killbill.account.export(header, "snapshot", progress=print)
+        stats = export.run()
+        ```
+        """
+
+        def fetch_page(offset: int, limit: int):
+            params = {"offset": offset, "limit": limit, "audit": str(audit)}
+            return self._get_page(header, "accounts/pagination", params)[0]
+
+        sections = {
+            "bundles": lambda account_id: self.bundles(header, account_id, audit=audit),
+            "invoices": lambda account_id: self.invoices(
+                header, account_id, include_invoice_components=True, audit=audit
+            ),
+            "paymentMethods": lambda account_id: self.get_payment_methods(
+                header, account_id, audit=audit
+            ),
+            "tags": lambda account_id: self.get_tags(header, account_id, audit),
+            "customFields": lambda account_id: self.get_custom_fields(
+                header, account_id, audit
+            ),
+        }
+
+        return TenantExport(
+            fetch_page,
+            sections,
+            directory,
+            count=lambda: self.count(header),
+            format=format,
+            page_size=page_size,
+            concurrency=concurrency,
+            partitions=partitions,
+            resume=resume,
+            progress=progress,
+            dumps=self.codec.dumps,
+        )
+
+    def warm_index(
+        self, header: Header, limit: int = 1000, prefetch: bool = True
+    ) -> int:
+        """Fill the account index from the accounts pagination
+
+        Every account of the tenant is read once and its external key is
+        recorded, so that later `ExternalKey` lookups cost no request.
+
+        Args:
+            limit (int): Number of accounts fetched per page, and recorded
+                per transaction.
+
+        Returns:
+            int: Number of accounts indexed.
+        """
+
+        if self.account_index is None:
+            raise ValueError("the client has no account index")
+
+        indexed = 0
+        entries = []
+
+        for account in self.iter_accounts(header, limit=limit, prefetch=prefetch):
+            entries.append((account.get("externalKey"), account["accountId"]))
+
+            if len(entries) >= limit:
+                indexed += self.account_index.update(header.api_key, entries)
+                entries = []
+
+        return indexed + self.account_index.update(header.api_key, entries)
 
     def close(
         self,
@@ -120,9 +372,11 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
 
         """
 
+        account_id = self._account_id(header, account_id)
+
         response = self._delete(
             f"accounts/{account_id}",
-            headers=header.dict(),
+            headers=self._headers(header),
             params={
                 "cancelAllSubscriptions": cancel_all_subscriptions,
                 "writeOffUnpaidInvoices": write_off_unpaid_invoices,
@@ -132,6 +386,7 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
 
         return True
 
@@ -150,11 +405,13 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
             str or None: The payment method's ID or None if the request failed.
         """
 
+        account_id = self._account_id(header, account_id)
+
         payload = {"pluginName": plugin_name, "externalKey": external_key}
 
         response = self._post(
             f"accounts/{account_id}/paymentMethods",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params={
                 "isDefault": is_default,
@@ -163,6 +420,7 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
 
         return self._get_uuid(response.headers.get("Location"))
 
@@ -177,6 +435,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve account payment methods"""
 
+        account_id = self._account_id(header, account_id)
+
         params = {
             "withPluginInfo": with_plugin_info,
             "includedDeleted": included_deleted,
@@ -186,13 +446,13 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
 
         response = self._get(
             f"accounts/{account_id}/paymentMethods",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def invoices(
         self,
@@ -205,26 +465,91 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         include_voided_invoices: bool = False,
         include_invoice_components: bool = False,
         audit: Audit = Audit.NONE,
+        stream: bool = False,
     ):
-        """Retrieve account invoices"""
+        """Retrieve account invoices
+
+        Args:
+            stream (bool): Return an iterator yielding the invoices as the
+                body is parsed instead of a list.
+        """
+
+        account_id = self._account_id(header, account_id)
+
+        params = {
+            "startDate": start_date,
+            "endDate": end_date,
+            "withMigrationInvoices": with_migration_invoices,
+            "unpaidInvoicesOnly": unpaid_invoices_only,
+            "includeVoidedInvoices": include_voided_invoices,
+            "includeInvoiceComponents": include_invoice_components,
+            "audit": str(audit),
+        }
+
+        if stream:
+            return self._get_stream(
+                f"accounts/{account_id}/invoices", self._headers(header), params=params
+            )
 
         response = self._get(
             f"accounts/{account_id}/invoices",
-            headers=header.dict(),
-            params={
-                "startDate": start_date,
-                "endDate": end_date,
-                "withMigrationInvoices": with_migration_invoices,
-                "unpaidInvoicesOnly": unpaid_invoices_only,
-                "includeVoidedInvoices": include_voided_invoices,
-                "includeInvoiceComponents": include_invoice_components,
-                "audit": str(audit),
-            },
+            headers=self._headers(header),
+            params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
+
+    def invoices_many(
+        self,
+        header: Header,
+        account_ids: Iterable[str],
+        concurrency: int = 8,
+        start_date: str = None,
+        end_date: str = None,
+        with_migration_invoices: bool = False,
+        unpaid_invoices_only: bool = False,
+        include_voided_invoices: bool = False,
+        include_invoice_components: bool = False,
+        audit: Audit = Audit.NONE,
+    ) -> BulkRun:
+        """Retrieve the invoices of many accounts concurrently, see `invoices`
+
+        Args:
+            account_ids (Iterable[str]): Account ids, read lazily.
+            concurrency (int): Number of accounts queried in parallel.
+
+        Returns:
+            BulkRun: Iterator of `(input_index, invoices | error)` in
+            completion order. At most `2 * concurrency` accounts are in
+            flight, so memory does not grow with the input.
+
+        Example:
+        ```python
+        accounts = killbill.account.iter_accounts(header)
+        account_ids = (account["accountId"] for account in accounts)
+
+        for index, invoices in killbill.account.invoices_many(header, account_ids, 16):
+            ...
+        ```
+        """
+
+        return BulkRun(
+            lambda account_id: self.invoices(
+                header,
+                account_id,
+                start_date=start_date,
+                end_date=end_date,
+                with_migration_invoices=with_migration_invoices,
+                unpaid_invoices_only=unpaid_invoices_only,
+                include_voided_invoices=include_voided_invoices,
+                include_invoice_components=include_invoice_components,
+                audit=audit,
+            ),
+            account_ids,
+            concurrency,
+        )
 
     def retrieve(
         self,
@@ -236,6 +561,17 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve an account by external key"""
 
+        # Balances change with every invoice and payment, they are not cached
+        cacheable = not (account_with_balance or account_with_balance_and_cba)
+        lookup = ("accounts", "externalKey", external_key, str(audit))
+
+        if cacheable:
+            account = self._cached_entity(header, lookup)
+            if account is not None:
+                return account
+
+        generation = self._entity_generation(header)
+
         params = {
             "externalKey": external_key,
             "accountWithBalance": account_with_balance,
@@ -246,12 +582,18 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         response = self._get(
             "accounts",
             params=params,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        account = self._decode(response)
+        self._index_account(header, account)
+
+        if cacheable:
+            self._cache_entity(header, lookup, account, generation)
+
+        return account
 
     def get_blocking_states(
         self,
@@ -265,6 +607,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve account blocking states"""
 
+        account_id = self._account_id(header, account_id)
+
         if isinstance(blocking_state_types, list):
             blocking_state_types = [str(x) for x in blocking_state_types]
         else:
@@ -277,12 +621,12 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         }
 
         response = self._get(
-            f"accounts/{account_id}/block", headers=header.dict(), params=params
+            f"accounts/{account_id}/block", headers=self._headers(header), params=params
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def bundles(
         self,
@@ -294,6 +638,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve bundles for account"""
 
+        account_id = self._account_id(header, account_id)
+
         params = {
             "externalKey": external_key,
             "bundlesFilter": bundles_filter,
@@ -301,24 +647,28 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         }
 
         response = self._get(
-            f"accounts/{account_id}/bundles", headers=header.dict(), params=params
+            f"accounts/{account_id}/bundles",
+            headers=self._headers(header),
+            params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def overdue(self, header: Header, account_id: str):
         """Retrieve overdue state for account"""
 
+        account_id = self._account_id(header, account_id)
+
         response = self._get(
             f"accounts/{account_id}/overdue",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def retrieve_by_id(
         self,
@@ -330,6 +680,19 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve account by id"""
 
+        account_id = self._account_id(header, account_id)
+
+        # Balances change with every invoice and payment, they are not cached
+        cacheable = not (account_with_balance or account_with_balance_and_cba)
+        lookup = ("accounts", account_id, str(audit))
+
+        if cacheable:
+            account = self._cached_entity(header, lookup)
+            if account is not None:
+                return account
+
+        generation = self._entity_generation(header)
+
         params = {
             "accountWithBalance": account_with_balance,
             "accountWithBalanceAndCBA": account_with_balance_and_cba,
@@ -339,12 +702,18 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         response = self._get(
             f"accounts/{account_id}",
             params=params,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        account = self._decode(response)
+        self._index_account(header, account)
+
+        if cacheable:
+            self._cache_entity(header, lookup, account, generation)
+
+        return account
 
     def payments(
         self,
@@ -358,6 +727,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Trigger a payment (authorization, purchase or credit) and return the payment id"""
 
+        account_id = self._account_id(header, account_id)
+
         payload = {
             "transactionType": str(transaction_type),
             "amount": amount,
@@ -371,7 +742,7 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
 
         response = self._post(
             f"accounts/{account_id}/payments",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
@@ -391,6 +762,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Trigger a payment for all unpaid invoices"""
 
+        account_id = self._account_id(header, account_id)
+
         params = {
             "paymentMethodId": payment_method_id,
             "externalPayment": external_payment,
@@ -400,7 +773,7 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
 
         response = self._post(
             f"accounts/{account_id}/invoicePayments",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
@@ -416,6 +789,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve bundles for account with pagination"""
 
+        account_id = self._account_id(header, account_id)
+
         params = {
             "offset": offset,
             "limit": limit,
@@ -424,13 +799,37 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
 
         response = self._get(
             f"accounts/{account_id}/bundles/pagination",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
+
+    def iter_bundles(
+        self,
+        header: Header,
+        account_id: str,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+    ):
+        """Iterate over all bundles for account, following the pagination
+
+        Args:
+            limit (int): Number of bundles fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+        """
+
+        account_id = self._account_id(header, account_id)
+
+        params = {"offset": 0, "limit": limit, "audit": str(audit)}
+
+        yield from self._paginate(
+            header, f"accounts/{account_id}/bundles/pagination", params, prefetch
+        )
 
     def add_custom_fields(
         self,
@@ -440,6 +839,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Add custom fields to account"""
 
+        account_id = self._account_id(header, account_id)
+
         self._add_custom_fields(
             header,
             path="accounts",
@@ -453,6 +854,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     ):
         """Retrieve account custom fields"""
 
+        account_id = self._account_id(header, account_id)
+
         return self._get_custom_fields(
             header, path="accounts", object_id=account_id, audit=audit
         )
@@ -482,6 +885,8 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         ```
         """
 
+        account_id = self._account_id(header, account_id)
+
         self._update_custom_fields(
             header,
             path="accounts",
@@ -505,11 +910,15 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
         ```
         """
 
+        account_id = self._account_id(header, account_id)
+
         self._add_tags(header, path="accounts", object_id=account_id, tags=tags)
 
     def get_tags(self, header: Header, account_id: str, audit: Audit = Audit.NONE):
         """Retrieve account tags"""
 
+        account_id = self._account_id(header, account_id)
+
         return self._get_tags(
             header, path="accounts", object_id=account_id, audit=audit
         )
@@ -517,4 +926,6 @@ class AccountClient(BaseClientWithCustomFields, BaseClientWithTags):
     def delete_tags(self, header: Header, account_id: str, tags: List[str]):
         """Delete tags from an account"""
 
+        account_id = self._account_id(header, account_id)
+
         self._delete_tag(header, path="accounts", object_id=account_id, tags=tags)
@@ -1,21 +1,44 @@
+import time
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from urllib.parse import urlparse
 
-import requests
-from requests.exceptions import JSONDecodeError
-
+from killbill.cache import EntityCache
+from killbill.catalog_index import CatalogIndex
+from killbill.codec import JsonCodec, drop_none, get_codec
 from killbill.enums import Audit, ObjectType
 from killbill.exceptions import (
     AuthError,
     BadRequestError,
+    CatalogValidationError,
     KillBillError,
     NotFoundError,
 )
 from killbill.header import Header
+from killbill.hooks import Hook, RequestContext, endpoint_template
+from killbill.index import AccountIndex, ExternalKey
+from killbill.retry import RetryPolicy
+from killbill.singleflight import SharedResponse, SingleFlight, request_key
+from killbill.streaming import iter_json_array
+from killbill.transport import RequestsTransport, Transport
+
+_JSON_CONTENT = (("Content-Type", "application/json"),)
+
+
+def _basic_auth_header(username: str, password: str) -> str:
+    """Return the value of the Basic `Authorization` header"""
+
+    credentials = b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {credentials}"
 
 
 class BaseClient:
-    """Base class for the Kill Bill API client"""
+    """Base class for the Kill Bill API client
+
+    With `coalesce`, identical GET requests made concurrently (same endpoint,
+    params and tenant headers) share a single HTTP call and its decoded body.
+    """
 
     def __init__(
         self,
@@ -23,33 +46,181 @@ class BaseClient:
         password: str,
         api_url: str = "http://localhost:8080",
         timeout: int = 30,
+        transport: Transport = None,
+        retry: RetryPolicy = None,
+        hooks: List[Hook] = None,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: JsonCodec = None,
+        catalog_index: CatalogIndex = None,
     ):
         self.api_url = api_url
         self.username = username
         self.password = password
         self.timeout = timeout
+        self.transport = transport if transport is not None else RequestsTransport()
+        self.retry = retry
+        self.hooks = hooks if hooks is not None else []
+        self.entity_cache = entity_cache
+        self.account_index = account_index
+        self.codec = get_codec(codec)
+        self.catalog_index = catalog_index
+        self._default_headers = (
+            ("Authorization", _basic_auth_header(username, password)),
+        )
+        self._single_flight = SingleFlight() if coalesce else None
 
-    def _post(
+    def _headers(self, header: Header, overrides: tuple = ()):
+        """Return the cached, read-only headers of a request"""
+
+        return header.merged(self._default_headers, overrides)
+
+    def _json_headers(self, header: Header):
+        """Return the cached headers of a request with a JSON body"""
+
+        return header.merged(self._default_headers, _JSON_CONTENT)
+
+    def _request(
         self,
+        method: str,
         endpoint: str,
         headers: dict,
         payload: dict = None,
         data=None,
         params: dict = None,
+        stream: bool = False,
     ):
-        """Make a POST request to the Kill Bill API"""
+        """Make a request to the Kill Bill API through the client's transport
 
-        response = requests.post(
-            f"{self.api_url}/1.0/kb/{endpoint}",
-            json=payload,
-            data=data,
-            timeout=self.timeout,
-            auth=(self.username, self.password),
-            headers=headers,
+        Transient errors are retried according to the client's retry policy.
+        A `stream` response body is left unread, see `Transport.iter_bytes`.
+        """
+
+        url = f"{self.api_url}/1.0/kb/{endpoint}"
+        started = time.monotonic()
+        attempt = 0
+
+        if payload is not None:
+            data = self.codec.dumps(drop_none(payload))
+            if "Content-Type" not in headers:
+                headers = {**headers, "Content-Type": "application/json"}
+
+        while True:
+            attempt += 1
+
+            try:
+                response = self._send(
+                    method,
+                    endpoint,
+                    url,
+                    headers,
+                    payload,
+                    data,
+                    params,
+                    attempt,
+                    stream,
+                )
+            except self.transport.connection_errors as error:
+                delay = self._retry_delay(
+                    method, attempt, started, sent=not self.transport.unsent(error)
+                )
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(method, attempt, started, response)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+
+    def _send(
+        self, method, endpoint, url, headers, payload, data, params, attempt, stream
+    ):
+        """Send one attempt through the transport, running the hooks"""
+
+        send = self.transport.stream if stream else self.transport.request
+
+        if not self.hooks:
+            return send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+            )
+
+        context = RequestContext(
+            method=method,
+            endpoint=endpoint,
+            endpoint_template=endpoint_template(endpoint),
+            url=url,
+            attempt=attempt,
             params=params,
+            payload=payload,
+            data=data,
         )
+
+        for hook in self.hooks:
+            hook.before_request(context)
+
+        started = time.perf_counter()
+
+        try:
+            response = send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+            )
+        except Exception as error:
+            context.latency = time.perf_counter() - started
+            context.exception = error
+            for hook in reversed(self.hooks):
+                hook.on_error(context)
+            raise
+
+        context.latency = time.perf_counter() - started
+        context.status_code = response.status_code
+        if not stream:
+            context.response_bytes = len(response.content)
+
+        for hook in reversed(self.hooks):
+            hook.after_response(context)
+
         return response
 
+    def _retry_delay(self, method, attempt, started, response=None, sent=True):
+        """Return the delay before the next attempt, or None to stop retrying"""
+
+        if self.retry is None:
+            return None
+
+        return self.retry.next_delay(
+            method,
+            attempt,
+            time.monotonic() - started,
+            status_code=response.status_code if response is not None else None,
+            response_headers=response.headers if response is not None else None,
+            sent=sent,
+        )
+
+    def _post(
+        self,
+        endpoint: str,
+        headers: dict,
+        payload: dict = None,
+        data=None,
+        params: dict = None,
+    ):
+        """Make a POST request to the Kill Bill API"""
+
+        return self._request("POST", endpoint, headers, payload, data, params)
+
     def _delete(
         self,
         endpoint: str,
@@ -60,16 +231,7 @@ class BaseClient:
     ):
         """Make a DELETE request to the Kill Bill API"""
 
-        response = requests.delete(
-            f"{self.api_url}/1.0/kb/{endpoint}",
-            json=payload,
-            data=data,
-            timeout=self.timeout,
-            auth=(self.username, self.password),
-            headers=headers,
-            params=params,
-        )
-        return response
+        return self._request("DELETE", endpoint, headers, payload, data, params)
 
     def _get(
         self,
@@ -80,15 +242,37 @@ class BaseClient:
     ):
         """Make a GET request to the Kill Bill API"""
 
-        response = requests.get(
-            f"{self.api_url}/1.0/kb/{endpoint}",
-            json=payload,
-            timeout=self.timeout,
-            auth=(self.username, self.password),
-            headers=headers,
-            params=params,
+        if self._single_flight is None or payload is not None:
+            return self._request("GET", endpoint, headers, payload, params=params)
+
+        return self._single_flight.do(
+            request_key(endpoint, params, headers),
+            lambda: SharedResponse(
+                self._request("GET", endpoint, headers, params=params),
+                self.codec.loads,
+            ),
         )
-        return response
+
+    def _get_stream(
+        self,
+        endpoint: str,
+        headers: dict,
+        payload: dict = None,
+        params: dict = None,
+    ):
+        """Make a GET request and yield the elements of the JSON array body
+
+        Elements are parsed as the body is received, so only one of them is
+        held in memory. The request is sent when iteration starts.
+        """
+
+        response = self._request(
+            "GET", endpoint, headers, payload, params=params, stream=True
+        )
+
+        self._raise_for_status(response)
+
+        yield from iter_json_array(self.transport.iter_bytes(response))
 
     def _put(
         self,
@@ -98,18 +282,62 @@ class BaseClient:
         data=None,
         params: dict = None,
     ):
-        """Make a POST request to the Kill Bill API"""
+        """Make a PUT request to the Kill Bill API"""
 
-        response = requests.put(
-            f"{self.api_url}/1.0/kb/{endpoint}",
-            json=payload,
-            data=data,
-            timeout=self.timeout,
-            auth=(self.username, self.password),
-            headers=headers,
-            params=params,
-        )
-        return response
+        return self._request("PUT", endpoint, headers, payload, data, params)
+
+    def _get_page(self, header: Header, endpoint: str, params: dict):
+        """Retrieve one page and the offset of the next one, if any"""
+
+        response = self._get(endpoint, headers=self._headers(header), params=params)
+
+        self._raise_for_status(response)
+
+        next_offset = response.headers.get("X-Killbill-Pagination-NextOffset")
+
+        return self._decode(response), next_offset
+
+    def _paginate(
+        self, header: Header, endpoint: str, params: dict, prefetch: bool = True
+    ):
+        """Yield the records of every page of a pagination endpoint
+
+        Pages are followed through the `X-Killbill-Pagination-NextOffset`
+        header. With `prefetch`, the next page is downloaded in the
+        background while the current one is consumed, so at most two pages
+        are held in memory.
+        """
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page, next_offset = self._get_page(header, endpoint, params)
+
+            while True:
+                future = None
+
+                if next_offset is not None:
+                    params = {**params, "offset": next_offset}
+                    if prefetch:
+                        future = executor.submit(
+                            self._get_page, header, endpoint, params
+                        )
+
+                yield from page
+
+                if next_offset is None:
+                    return
+
+                if future is not None:
+                    page, next_offset = future.result()
+                else:
+                    page, next_offset = self._get_page(header, endpoint, params)
+
+    def _decode(self, response):
+        """Decode a JSON response body with the client's codec"""
+
+        if isinstance(response, SharedResponse):
+            return response.json()
+
+        return self.codec.loads(response.content)
 
     def _raise_for_status(self, response):
         """Raise an exception if the response status code is not 2xx"""
@@ -122,8 +350,8 @@ class BaseClient:
             error_message = None
 
             try:
-                error_message = response.json().get("message")
-            except JSONDecodeError:
+                error_message = self._decode(response).get("message")
+            except ValueError:
                 error_message = response.text
 
             if status_code == 400:
@@ -137,6 +365,24 @@ class BaseClient:
 
             raise KillBillError(error_message)
 
+    @staticmethod
+    def _blocking_state_payload(
+        state_name: str,
+        service: str,
+        is_block_change: bool = False,
+        is_block_entitlement: bool = False,
+        is_block_billing: bool = False,
+    ):
+        """Build the payload of a BlockingState event"""
+
+        return {
+            "stateName": state_name,
+            "service": service,
+            "isBlockChange": is_block_change,
+            "isBlockEntitlement": is_block_entitlement,
+            "isBlockBilling": is_block_billing,
+        }
+
     def _get_uuid(self, url: str = None):
         """Return uuid from url location"""
 
@@ -146,19 +392,117 @@ class BaseClient:
 
             return data[-1]
 
+    def _account_id(self, header: Header, account_id: str):
+        """Return the id of an account given by id or by `ExternalKey`"""
+
+        if not isinstance(account_id, ExternalKey):
+            return account_id
+
+        if self.account_index is not None:
+            resolved = self.account_index.get(header.api_key, account_id)
+            if resolved is not None:
+                return resolved
+
+        response = self._get(
+            "accounts",
+            headers=self._headers(header),
+            params={"externalKey": str(account_id)},
+        )
+
+        self._raise_for_status(response)
+
+        return self._index_account(header, self._decode(response))
+
+    def _index_account(self, header: Header, account: dict) -> str:
+        """Record the external key of a retrieved account, return its id"""
+
+        if self.account_index is not None:
+            self.account_index.set(
+                header.api_key, account.get("externalKey"), account["accountId"]
+            )
+
+        return account["accountId"]
+
+    def _validate_entitlements(
+        self, header: Header, entitlements: List[dict], on: str = None
+    ):
+        """Check subscription payloads against the indexed catalog, if any
+
+        The index does not see catalogs uploaded by other processes, so the
+        catalog versions are retrieved once before rejecting a request; when
+        they changed, the request is left to Kill Bill.
+        """
+
+        catalog = self._indexed_catalog(header)
+
+        if catalog is None:
+            return
+
+        errors = catalog.validate(entitlements, on)
+
+        if not errors:
+            return
+
+        response = self._get("catalog/versions", headers=self._headers(header))
+
+        self._raise_for_status(response)
+        self._reject_entitlements(header, catalog, errors, self._decode(response))
+
+    def _indexed_catalog(self, header: Header):
+        """Return the indexed catalog of the tenant, or None"""
+
+        if self.catalog_index is None:
+            return None
+
+        return self.catalog_index.get(header.api_key)
+
+    def _reject_entitlements(
+        self, header: Header, catalog, errors: List[str], versions: list
+    ):
+        """Raise the validation errors, unless the catalog versions changed"""
+
+        self.catalog_index.observe_versions(header.api_key, versions)
+
+        if self.catalog_index.get(header.api_key) is catalog:
+            raise CatalogValidationError(errors)
+
+    def _cached_entity(self, header: Header, lookup: tuple):
+        """Return the cached entity of a lookup, or None"""
+
+        if self.entity_cache is None:
+            return None
+
+        return self.entity_cache.get((header.api_key, *lookup))
+
+    def _entity_generation(self, header: Header):
+        """Return the cache generation of the tenant, taken before a lookup"""
+
+        if self.entity_cache is None:
+            return None
+
+        return self.entity_cache.generation(header.api_key)
+
+    def _cache_entity(
+        self, header: Header, lookup: tuple, entity, generation: tuple = None
+    ):
+        """Store a retrieved entity in the cache, if any"""
+
+        if self.entity_cache is not None:
+            self.entity_cache.set((header.api_key, *lookup), entity, generation)
+
+    def _invalidate_entity(self, header: Header, object_id: str):
+        """Drop the cached entities containing an object after a mutation"""
+
+        if self.entity_cache is not None:
+            self.entity_cache.invalidate(header.api_key, object_id)
+
 
 class BaseClientWithCustomFields(BaseClient):
     """Base class for the Kill Bill custom fields apis"""
 
-    def _add_custom_fields(
-        self,
-        header: Header,
-        path: str,
-        object_id: str,
-        fields: dict,
-        object_type: ObjectType,
-    ):
-        """Add custom fields to object"""
+    @staticmethod
+    def _custom_fields_payload(fields: dict, object_type: ObjectType):
+        """Build the payload to add custom fields"""
 
         payload = []
 
@@ -171,13 +515,62 @@ class BaseClientWithCustomFields(BaseClient):
                 }
             )
 
+        return payload
+
+    @staticmethod
+    def _updated_custom_fields_payload(fields: List[dict], object_type: ObjectType):
+        """Validate and build the payload to modify custom fields"""
+
+        if not isinstance(fields, (list, tuple)):
+            raise TypeError("fields must be a list or tuple")
+
+        for item in fields:
+            if not isinstance(item, dict):
+                raise TypeError("fields must be a list of dict")
+
+            if not item.get("name"):
+                raise ValueError("name is required")
+
+            if not item.get("value"):
+                raise ValueError("value is required")
+
+            if not item.get("field_id"):
+                raise ValueError("field_id is required")
+
+        payload = []
+
+        for item in fields:
+            payload.append(
+                {
+                    "objectType": str(object_type),
+                    "name": item.get("name"),
+                    "value": item.get("value"),
+                    "customFieldId": item.get("field_id"),
+                }
+            )
+
+        return payload
+
+    def _add_custom_fields(
+        self,
+        header: Header,
+        path: str,
+        object_id: str,
+        fields: dict,
+        object_type: ObjectType,
+    ):
+        """Add custom fields to object"""
+
+        payload = self._custom_fields_payload(fields, object_type)
+
         response = self._post(
             f"{path}/{object_id}/customFields",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
 
     def _get_custom_fields(
         self,
@@ -192,13 +585,13 @@ class BaseClientWithCustomFields(BaseClient):
 
         response = self._get(
             f"{path}/{object_id}/customFields",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def _update_custom_fields(
         self,
@@ -210,41 +603,16 @@ class BaseClientWithCustomFields(BaseClient):
     ):
         """Modify custom fields to subscription"""
 
-        if not isinstance(fields, (list, tuple)):
-            raise TypeError("fields must be a list or tuple")
-
-        for item in fields:
-            if not isinstance(item, dict):
-                raise TypeError("fields must be a list of dict")
-
-            if not item.get("name"):
-                raise ValueError("name is required")
-
-            if not item.get("value"):
-                raise ValueError("value is required")
-
-            if not item.get("field_id"):
-                raise ValueError("field_id is required")
-
-        payload = []
-
-        for item in fields:
-            payload.append(
-                {
-                    "objectType": str(object_type),
-                    "name": item.get("name"),
-                    "value": item.get("value"),
-                    "customFieldId": item.get("field_id"),
-                }
-            )
+        payload = self._updated_custom_fields_payload(fields, object_type)
 
         response = self._put(
             f"{path}/{object_id}/customFields",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
 
 
 class BaseClientWithTags(BaseClient):
@@ -263,11 +631,12 @@ class BaseClientWithTags(BaseClient):
 
         response = self._post(
             f"{path}/{object_id}/tags",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
 
     def _get_tags(
         self,
@@ -282,13 +651,13 @@ class BaseClientWithTags(BaseClient):
 
         response = self._get(
             f"{path}/{object_id}/tags",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def _delete_tag(self, header: Header, path: str, object_id: str, tags: List[str]):
         """Delete tags from an object"""
@@ -297,8 +666,9 @@ class BaseClientWithTags(BaseClient):
 
         response = self._delete(
             f"{path}/{object_id}/tags",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, object_id)
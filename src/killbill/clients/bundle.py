@@ -6,6 +6,7 @@ from killbill.header import Header
 
 
 class BundleClient(BaseClientWithCustomFields):
+    """Client for the Kill Bill bundle API"""
 
     def list(
         self,
@@ -13,53 +14,96 @@ class BundleClient(BaseClientWithCustomFields):
         offset: int = 0,
         limit: int = 100,
         audit: Audit = Audit.NONE,
+        stream: bool = False,
     ):
-        """List bundles"""
+        """List bundles
+
+        Args:
+            stream (bool): Return an iterator yielding the bundles as the body
+                is parsed instead of a list.
+        """
+
+        params = {"offset": offset, "limit": limit, "audit": str(audit)}
+
+        if stream:
+            return self._get_stream(
+                "bundles/pagination", self._headers(header), params=params
+            )
 
         response = self._get(
-            "bundles/pagination",
-            headers=header.dict(),
-            params={"offset": offset, "limit": limit, "audit": str(audit)},
+            "bundles/pagination", headers=self._headers(header), params=params
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
+
+    def iter_bundles(
+        self,
+        header: Header,
+        limit: int = 100,
+        audit: Audit = Audit.NONE,
+        prefetch: bool = True,
+    ):
+        """Iterate over all bundles, following the pagination
+
+        Args:
+            limit (int): Number of bundles fetched per page.
+            prefetch (bool): Download the next page while the current one is
+                consumed.
+        """
+
+        params = {"offset": 0, "limit": limit, "audit": str(audit)}
+
+        yield from self._paginate(header, "bundles/pagination", params, prefetch)
 
     def pause(self, header: Header, bundle_id: str, requested_date: str = None):
         """Pause a bundle"""
 
         response = self._put(
             f"bundles/{bundle_id}/pause",
-            headers=header.dict(),
+            headers=self._headers(header),
             params={"requestedDate": requested_date},
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
 
     def resume(self, header: Header, bundle_id: str, requested_date: str = None):
         """Resume a bundle"""
 
         response = self._put(
             f"bundles/{bundle_id}/resume",
-            headers=header.dict(),
+            headers=self._headers(header),
             params={"requestedDate": requested_date},
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
 
     def retrieve(self, header: Header, bundle_id: str, audit: Audit = Audit.NONE):
         """Retrieve a bundle by id"""
 
+        lookup = ("bundles", bundle_id, str(audit))
+
+        bundle = self._cached_entity(header, lookup)
+        if bundle is not None:
+            return bundle
+
+        generation = self._entity_generation(header)
+
         params = {"audit": str(audit)}
 
         response = self._get(
-            f"bundles/{bundle_id}", headers=header.dict(), params=params
+            f"bundles/{bundle_id}", headers=self._headers(header), params=params
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        bundle = self._decode(response)
+        self._cache_entity(header, lookup, bundle, generation)
+
+        return bundle
 
     def add_custom_fields(
         self,
@@ -133,21 +177,22 @@ class BundleClient(BaseClientWithCustomFields):
         Provides a low level interface to add a BlockingState event for this bundle
         """
 
-        payload = {
-            "stateName": state_name,
-            "service": service,
-            "isBlockChange": is_block_change,
-            "isBlockEntitlement": is_block_entitlement,
-            "isBlockBilling": is_block_billing,
-        }
+        payload = self._blocking_state_payload(
+            state_name,
+            service,
+            is_block_change=is_block_change,
+            is_block_entitlement=is_block_entitlement,
+            is_block_billing=is_block_billing,
+        )
 
         params = {"requestedDate": requested_date}
 
         response = self._post(
             f"bundles/{bundle_id}/block",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id)
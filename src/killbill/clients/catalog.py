@@ -1,12 +1,161 @@
-from typing import Union
+import threading
+from collections import OrderedDict
+from typing import List, Union
 
+from killbill.cache import EntityCache
+from killbill.catalog_index import Catalog, CatalogIndex
 from killbill.clients.base import BaseClient
+from killbill.codec import JsonCodec
 from killbill.enums import BillingPeriod, ProductCategory, TrialTimeUnit
 from killbill.header import Header
+from killbill.hooks import Hook
+from killbill.index import AccountIndex
+from killbill.retry import RetryPolicy
+from killbill.transport import Transport
+
+
+class CatalogCache:
+    """Bounded LRU cache of retrieved catalogs
+
+    Entries are keyed by tenant, account, requested date and format. All
+    entries of a tenant are dropped when the catalog is modified or when a
+    new catalog version is reported. A catalog retrieved while its tenant
+    was invalidated is not stored, see `generation`.
+
+    Args:
+        maxsize (int): Maximum number of entries, the least recently used
+            entry is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+
+        self.maxsize = maxsize
+        self._catalogs = OrderedDict()
+        self._versions = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """Return the cached catalog, or None"""
+
+        with self._lock:
+            catalog = self._catalogs.get(key)
+            if catalog is not None:
+                self._catalogs.move_to_end(key)
+
+            return catalog
+
+    def generation(self, api_key: str) -> tuple:
+        """Return the invalidation generation of a tenant, to pass to `set`"""
+
+        return self._epoch, self._generations.get(api_key, 0)
+
+    def set(self, key: tuple, catalog, generation: tuple = None):
+        """Store a catalog, unless its tenant was invalidated since
+        `generation` was taken"""
+
+        with self._lock:
+            if generation is not None and generation != self.generation(key[0]):
+                return
+
+            self._catalogs[key] = catalog
+            self._catalogs.move_to_end(key)
+
+            while len(self._catalogs) > self.maxsize:
+                self._catalogs.popitem(last=False)
+
+    def invalidate(self, api_key: str = None):
+        """Drop the catalogs of a tenant, or of every tenant"""
+
+        with self._lock:
+            if api_key is None:
+                self._epoch += 1
+                self._catalogs.clear()
+                self._versions.clear()
+            else:
+                self._generations[api_key] = self._generations.get(api_key, 0) + 1
+                for key in [k for k in self._catalogs if k[0] == api_key]:
+                    del self._catalogs[key]
+                self._versions.pop(api_key, None)
+
+    def observe_versions(self, api_key: str, versions: list):
+        """Invalidate the tenant when its catalog versions changed"""
+
+        known = self._versions.get(api_key)
+
+        if known is not None and known != versions:
+            self.invalidate(api_key)
+
+        with self._lock:
+            self._versions[api_key] = versions
 
 
 class CatalogClient(BaseClient):
-    """Client for the Kill Bill catalog API"""
+    """Client for the Kill Bill catalog API
+
+    Args:
+        cache (bool): Cache retrieved catalogs in memory. Cached catalogs are
+            shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        api_url: str = "http://localhost:8080",
+        timeout: int = 30,
+        transport: Transport = None,
+        retry: RetryPolicy = None,
+        hooks: List[Hook] = None,
+        cache: bool = False,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: JsonCodec = None,
+        catalog_index: CatalogIndex = None,
+    ):
+        super().__init__(
+            username,
+            password,
+            api_url,
+            timeout,
+            transport,
+            retry,
+            hooks,
+            coalesce,
+            entity_cache,
+            account_index,
+            codec,
+            catalog_index,
+        )
+        self.cache = CatalogCache() if cache else None
+
+    @staticmethod
+    def _simple_plan_payload(
+        plan_id: str,
+        product_name: str,
+        currency: str,
+        product_category: ProductCategory = ProductCategory.BASE,
+        amount: Union[float, int] = 0,
+        trial_length: int = 0,
+        trial_time_unit: TrialTimeUnit = TrialTimeUnit.UNLIMITED,
+        billing_period: BillingPeriod = BillingPeriod.MONTHLY,
+    ):
+        """Build the payload of a simple plan"""
+
+        return {
+            "planId": plan_id,
+            "productName": product_name,
+            "productCategory": str(product_category),
+            "currency": currency,
+            "amount": amount,
+            "billingPeriod": str(billing_period),
+            "trialLength": trial_length,
+            "trialTimeUnit": str(trial_time_unit),
+        }
 
     def add_simple_plan(
         self,
@@ -38,25 +187,27 @@ class CatalogClient(BaseClient):
             comment (str, optional): The comment for creating the plan. Defaults to None.
         """
 
-        payload = {
-            "planId": plan_id,
-            "productName": product_name,
-            "productCategory": str(product_category),
-            "currency": currency,
-            "amount": amount,
-            "billingPeriod": str(billing_period),
-            "trialLength": trial_length,
-            "trialTimeUnit": str(trial_time_unit),
-        }
+        payload = self._simple_plan_payload(
+            plan_id,
+            product_name,
+            currency,
+            product_category=product_category,
+            amount=amount,
+            trial_length=trial_length,
+            trial_time_unit=trial_time_unit,
+            billing_period=billing_period,
+        )
 
         response = self._post(
             "catalog/simplePlan",
             payload=payload,
-            headers=header.dict(),
+            headers=self._json_headers(header),
         )
 
         self._raise_for_status(response)
 
+        self._invalidate_cache(header)
+
     def retrieve(
         self,
         header: Header,
@@ -71,28 +222,41 @@ class CatalogClient(BaseClient):
         if `xml = False`, returns the JSON representation of the overdue config
         """
 
-        payload = {
+        account_id = self._account_id(header, account_id)
+
+        if self.cache is not None:
+            key = (header.api_key, account_id, requested_date, xml)
+            catalog = self.cache.get(key)
+            if catalog is not None:
+                return catalog
+            generation = self.cache.generation(header.api_key)
+
+        params = {
             "accountId": account_id,
             "requestedDate": requested_date,
         }
 
         if xml:
             endpoint = "catalog/xml"
-            headers = header.dict()
+            headers = self._headers(header)
         else:
             endpoint = "catalog"
-            headers = header.dict().copy()
-            headers.update({"Accept": "application/json"})
+            headers = self._headers(header, (("Accept", "application/json"),))
 
         response = self._get(
             endpoint,
-            payload=payload,
+            params=params,
             headers=headers,
         )
 
         self._raise_for_status(response)
 
-        return response.text if xml else response.json()
+        catalog = response.text if xml else self._decode(response)
+
+        if self.cache is not None:
+            self.cache.set(key, catalog, generation)
+
+        return catalog
 
     def validate(self, header: Header, catalog_xml: str):
         """Validate a XML catalog
@@ -104,12 +268,12 @@ class CatalogClient(BaseClient):
         response = self._post(
             "catalog/xml/validate",
             data=catalog_xml,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def create(self, header: Header, catalog_xml: str):
         """Create a XML catalog
@@ -121,22 +285,54 @@ class CatalogClient(BaseClient):
         response = self._post(
             "catalog/xml",
             data=catalog_xml,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
+        self._invalidate_cache(header)
+
     def versions(self, header: Header):
         """Retrieve a list of catalog versions"""
 
         response = self._get(
             "catalog/versions",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        versions = self._decode(response)
+
+        if self.cache is not None:
+            self.cache.observe_versions(header.api_key, versions)
+
+        if self.catalog_index is not None:
+            self.catalog_index.observe_versions(header.api_key, versions)
+
+        return versions
+
+    def index(self, header: Header, xml: bool = False) -> Catalog:
+        """Retrieve the catalog of the tenant and index it
+
+        The catalog is stored in the client's `catalog_index`, if any, and
+        subscriptions created through the client are then checked against
+        it before being sent.
+
+        Args:
+            xml (bool): Retrieve and parse the XML representation instead of
+                the JSON one.
+
+        Returns:
+            Catalog: The indexed catalog.
+        """
+
+        catalog = Catalog.parse(self.retrieve(header, xml=xml))
+
+        if self.catalog_index is not None:
+            self.catalog_index.set(header.api_key, catalog)
+
+        return catalog
 
     def delete(
         self,
@@ -146,7 +342,18 @@ class CatalogClient(BaseClient):
 
         response = self._delete(
             "catalog",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
+
+        self._invalidate_cache(header)
+
+    def _invalidate_cache(self, header: Header):
+        """Drop the cached and indexed catalogs of the tenant"""
+
+        if self.cache is not None:
+            self.cache.invalidate(header.api_key)
+
+        if self.catalog_index is not None:
+            self.catalog_index.invalidate(header.api_key)
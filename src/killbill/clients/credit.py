@@ -1,12 +1,57 @@
-from typing import List
+from typing import Iterable, List
 
+from killbill.bulk import Chunk, ChunkRun, chunked
 from killbill.clients.base import BaseClient
+from killbill.exceptions import KillBillError
 from killbill.header import Header
 
 
 class CreditClient(BaseClient):
     """Client for the Kill Bill credit API"""
 
+    @staticmethod
+    def _credit_payload(
+        account_id: str,
+        amount: int | float,
+        currency: str,
+        description: str = None,
+    ):
+        """Build a single credit of the credits payload"""
+
+        return {
+            "accountId": account_id,
+            "description": description,
+            "amount": amount,
+            "currency": currency,
+        }
+
+    @staticmethod
+    def _credit_ids(payload: list, credits: list):
+        """Return the IDs of the created credits, in payload order
+
+        Raises `KillBillError` when the created credits do not match the
+        payload one for one, so that no credit is attributed to another row.
+        """
+
+        if len(credits) != len(payload):
+            raise KillBillError(
+                f"{len(credits)} credits created for {len(payload)} requested"
+            )
+
+        for index, (requested, credit) in enumerate(zip(payload, credits)):
+            account_id = credit.get("accountId", requested["accountId"])
+            amount = credit.get("amount", requested["amount"])
+
+            if account_id != requested["accountId"] or float(amount) != float(
+                requested["amount"]
+            ):
+                raise KillBillError(
+                    f"credit {index} does not match the requested one, "
+                    "the response is out of order"
+                )
+
+        return [credit.get("invoiceItemId") for credit in credits]
+
     def add(
         self,
         header: Header,
@@ -19,24 +64,95 @@ class CreditClient(BaseClient):
     ):
         """Add a credit"""
 
+        account_id = self._account_id(header, account_id)
+
+        payload = [self._credit_payload(account_id, amount, currency, description)]
+
+        return self._post_credits(header, payload, auto_commit, plugin_property)
+
+    def add_many(
+        self,
+        header: Header,
+        credits: Iterable[dict],
+        batch_size: int = 100,
+        concurrency: int = 8,
+        auto_commit: bool = False,
+        plugin_property: List[str] = None,
+    ) -> ChunkRun:
+        """Add credits in bulk
+
+        Credits are read lazily and sent in `credits` requests of up to
+        `batch_size` credits, the requests are sent concurrently. A request
+        fails or succeeds as a whole.
+
+        Args:
+            credits (Iterable[dict]): `account_id`, `amount`, `currency` and
+                optional `description` of each credit.
+            batch_size (int): Maximum number of credits per request.
+            concurrency (int): Number of requests sent in parallel, keep it
+                below the client's pool size.
+
+        Returns:
+            ChunkRun: Iterator of `(chunk, credit_ids | error)`. `results` maps
+            each input row to its credit ID and `failed` records the failed
+            chunks.
+
+        Example:
+        ```python
+        credits = (
+            {"account_id": row["account_id"], "amount": 10, "currency": "USD"}
+            for row in reader
+        )
+
+        run = killbill.credit.add_many(header, credits, batch_size=200).run()
+
+        for chunk, error in run.failed:
+            print(f"rows {chunk.indexes} failed: {error}")
+        ```
+        """
+
+        return ChunkRun(
+            lambda chunk: self._add_chunk(header, chunk, auto_commit, plugin_property),
+            chunked(credits, batch_size),
+            concurrency,
+        )
+
+    def _add_chunk(
+        self, header: Header, chunk: Chunk, auto_commit: bool, plugin_property
+    ):
+        """Add the credits of a chunk, return their IDs in input order"""
+
         payload = [
-            {
-                "accountId": account_id,
-                "description": description,
-                "amount": amount,
-                "currency": currency,
-            }
+            self._credit_payload(
+                self._account_id(header, credit["account_id"]),
+                credit["amount"],
+                credit["currency"],
+                credit.get("description"),
+            )
+            for credit in chunk.rows
         ]
 
+        credits = self._post_credits(header, payload, auto_commit, plugin_property)
+
+        return self._credit_ids(payload, credits)
+
+    def _post_credits(
+        self, header: Header, payload: list, auto_commit: bool, plugin_property
+    ):
+        """Post a list of credits, return the created credits"""
+
         params = {
             "autoCommit": auto_commit,
             "pluginProperty": plugin_property,
         }
 
         response = self._post(
-            "credits", headers=header.dict(), payload=payload, params=params
+            "credits",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
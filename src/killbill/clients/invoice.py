@@ -1,3 +1,6 @@
+from typing import Iterable
+
+from killbill.bulk import BulkRun
 from killbill.clients.base import BaseClient
 from killbill.enums import Audit
 from killbill.header import Header
@@ -21,9 +24,47 @@ class InvoiceClient(BaseClient):
         }
 
         response = self._get(
-            f"invoices/{invoice_id}", headers=header.dict(), params=params
+            f"invoices/{invoice_id}", headers=self._headers(header), params=params
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
+
+    def retrieve_many(
+        self,
+        header: Header,
+        invoice_ids: Iterable[str],
+        concurrency: int = 8,
+        with_children_items: bool = False,
+        audit: Audit = Audit.NONE,
+    ) -> BulkRun:
+        """Retrieve invoices concurrently
+
+        Args:
+            invoice_ids (Iterable[str]): Invoice ids, read lazily.
+            concurrency (int): Number of invoices retrieved in parallel, keep
+                it below the client's `pool_maxsize`.
+
+        Returns:
+            BulkRun: Iterator of `(input_index, invoice | error)` in
+            completion order. At most `2 * concurrency` invoices are in
+            flight, so memory does not grow with the input.
+
+        Example:
+        ```python
+        ids = (line.strip() for line in open("invoice_ids.txt"))
+
+        for index, invoice in killbill.invoice.retrieve_many(header, ids, 16):
+            if not isinstance(invoice, Exception):
+                archive.write(json.dumps(invoice) + "\\n")
+        ```
+        """
+
+        return BulkRun(
+            lambda invoice_id: self.retrieve(
+                header, invoice_id, with_children_items, audit
+            ),
+            invoice_ids,
+            concurrency,
+        )
@@ -15,12 +15,12 @@ class OverdueClient(BaseClient):
 
         response = self._get(
             "overdue/xml" if xml else "overdue",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.text if xml else response.json()
+        return response.text if xml else self._decode(response)
 
     def upload(self, header: Header, overdue_config_xml: str):
         """Upload overdue config
@@ -32,7 +32,7 @@ class OverdueClient(BaseClient):
         response = self._post(
             "overdue/xml",
             data=overdue_config_xml,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
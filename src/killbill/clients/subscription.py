@@ -1,5 +1,7 @@
-from typing import List
+from typing import Iterable, List, Tuple
+from urllib.parse import parse_qs, urlparse
 
+from killbill.bulk import ChunkRun, chunk_by_account
 from killbill.clients.base import BaseClientWithCustomFields
 from killbill.enums import (
     Audit,
@@ -13,13 +15,12 @@ from killbill.header import Header
 
 
 class SubscriptionClient(BaseClientWithCustomFields):
+    """Client for the Kill Bill subscription API"""
 
-    def create(
-        self,
-        header: Header,
+    @staticmethod
+    def _create_payload(
         account_id: str,
         plan_name: str,
-        start_date: str = None,
         external_key: str = None,
         product_name: str = None,
         product_category: ProductCategory = None,
@@ -27,13 +28,9 @@ class SubscriptionClient(BaseClientWithCustomFields):
         price_list: str = None,
         bundle_id: str = None,
     ):
-        """Create an subscription
+        """Build the payload to create a subscription"""
 
-        Returns:
-            str or None: The subscription's ID or None if the request failed.
-        """
-
-        payload = {
+        return {
             "accountId": account_id,
             "planName": plan_name,
             "externalKey": external_key,
@@ -44,31 +41,97 @@ class SubscriptionClient(BaseClientWithCustomFields):
             "bundleId": bundle_id,
         }
 
+    @staticmethod
+    def _bundle_ids(location: str = None):
+        """Return the bundle IDs of the `bundlesFilter` of a Location URL"""
+
+        if not location:
+            return []
+
+        bundles_filter = parse_qs(urlparse(location).query).get("bundlesFilter")
+
+        return bundles_filter[0].split(",") if bundles_filter else []
+
+    @staticmethod
+    def _with_add_ons_payload(account_id: str, plans: list[str]):
+        """Build the entitlements of a base plan followed by its add-ons"""
+
+        return [{"accountId": account_id, "planName": plan} for plan in plans]
+
+    def create(
+        self,
+        header: Header,
+        account_id: str,
+        plan_name: str,
+        start_date: str = None,
+        external_key: str = None,
+        product_name: str = None,
+        product_category: ProductCategory = None,
+        billing_period: BillingPeriod = None,
+        price_list: str = None,
+        bundle_id: str = None,
+    ):
+        """Create an subscription
+
+        Returns:
+            str or None: The subscription's ID or None if the request failed.
+        """
+
+        account_id = self._account_id(header, account_id)
+
+        payload = self._create_payload(
+            account_id,
+            plan_name,
+            external_key=external_key,
+            product_name=product_name,
+            product_category=product_category,
+            billing_period=billing_period,
+            price_list=price_list,
+            bundle_id=bundle_id,
+        )
+
+        self._validate_entitlements(header, [payload], start_date)
+
         params = {
             "entitlementDate": start_date,
             "billingDate": start_date,
         }
 
         response = self._post(
-            "subscriptions", headers=header.dict(), payload=payload, params=params
+            "subscriptions",
+            headers=self._json_headers(header),
+            payload=payload,
+            params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, bundle_id or account_id)
 
         return self._get_uuid(response.headers.get("Location"))
 
     def retrieve(self, header: Header, subscription_id: str, audit: Audit = Audit.NONE):
         """Retrieve a subscription by id"""
 
+        lookup = ("subscriptions", subscription_id, str(audit))
+
+        subscription = self._cached_entity(header, lookup)
+        if subscription is not None:
+            return subscription
+
+        generation = self._entity_generation(header)
+
         response = self._get(
             f"subscriptions/{subscription_id}",
-            headers=header.dict(),
+            headers=self._headers(header),
             params={"audit": str(audit)},
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        subscription = self._decode(response)
+        self._cache_entity(header, lookup, subscription, generation)
+
+        return subscription
 
     def cancel(
         self,
@@ -92,21 +155,23 @@ class SubscriptionClient(BaseClientWithCustomFields):
 
         response = self._delete(
             f"subscriptions/{subscription_id}",
-            headers=header.dict(),
+            headers=self._headers(header),
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
 
     def uncancel(self, header: Header, subscription_id: str):
         """Un-cancel an entitlement"""
 
         response = self._put(
             f"subscriptions/{subscription_id}/uncancel",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
 
     def create_with_add_ons(
         self,
@@ -125,31 +190,23 @@ class SubscriptionClient(BaseClientWithCustomFields):
             str or None: The bundle's ID or None if the request failed.
         """
 
-        payload = [
-            {
-                "accountId": account_id,
-                "planName": plan_name,
-            }
-        ]
+        account_id = self._account_id(header, account_id)
 
-        params = {"entitlementDate": start_date, "billingDate": start_date}
+        payload = self._with_add_ons_payload(account_id, [plan_name, *add_ons_name])
 
-        for add_ons in add_ons_name:
-            payload.append(
-                {
-                    "accountId": account_id,
-                    "planName": add_ons,
-                }
-            )
+        self._validate_entitlements(header, payload, start_date)
+
+        params = {"entitlementDate": start_date, "billingDate": start_date}
 
         response = self._post(
             "subscriptions/createSubscriptionWithAddOns",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
 
         return self._get_uuid(response.headers.get("Location"))
 
@@ -173,32 +230,90 @@ class SubscriptionClient(BaseClientWithCustomFields):
             ],
         )
         ```
+
+        Returns:
+            list: The IDs of the created bundles, in request order.
         """
 
-        payload = []
+        account_id = self._account_id(header, account_id)
 
-        for bundle in bundles:
-            base_and_add_ons = []
-            for plan in bundle:
-                base_and_add_ons.append(
-                    {
-                        "accountId": account_id,
-                        "planName": plan,
-                    }
-                )
+        payload = [
+            {"baseEntitlementAndAddOns": self._with_add_ons_payload(account_id, bundle)}
+            for bundle in bundles
+        ]
 
-            payload.append({"baseEntitlementAndAddOns": base_and_add_ons})
+        for bundle in payload:
+            self._validate_entitlements(
+                header, bundle["baseEntitlementAndAddOns"], start_date
+            )
 
         params = {"entitlementDate": start_date, "billingDate": start_date}
 
         response = self._post(
             "subscriptions/createSubscriptionsWithAddOns",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, account_id)
+
+        return self._bundle_ids(response.headers.get("Location"))
+
+    def provision(
+        self,
+        header: Header,
+        rows: Iterable[Tuple[str, list]],
+        batch_size: int = 50,
+        concurrency: int = 8,
+        start_date: str = None,
+    ) -> ChunkRun:
+        """Create subscriptions with add-ons in bulk
+
+        `(account_id, [base_plan, *add_ons])` rows are read lazily, packed
+        into `createSubscriptionsWithAddOns` requests of up to `batch_size`
+        bundles of the same account, and the requests are sent
+        concurrently.
+
+        Args:
+            rows (Iterable[tuple]): Account id and plan names of each bundle.
+            batch_size (int): Maximum number of bundles per request.
+            concurrency (int): Number of requests sent in parallel, keep it
+                below the client's pool size.
+
+        Returns:
+            ChunkRun: Iterator of `(chunk, bundle_ids | error)`. `results` maps
+            each input row to its bundle ID and `failed` records the failed
+            chunks.
+
+        Example:
+        ```python
+        rows = ((row["account_id"], row["plans"]) for row in reader)
+
+        run = killbill.subscription.provision(
+            header, rows, batch_size=50, concurrency=16
+        ).run()
+
+        print(f"{len(run.results)} bundles, {len(run.failed)} failed chunks")
+
+        # retry the failed chunks
+        retry = killbill.subscription.provision(
+            header, (row for _, row, _ in run.failed_rows())
+        ).run()
+        ```
+        """
+
+        return ChunkRun(
+            lambda chunk: self.create_multiple_with_add_ons(
+                header,
+                chunk.account_id,
+                [plans for _, plans in chunk.rows],
+                start_date,
+            ),
+            chunk_by_account(rows, batch_size),
+            concurrency,
+        )
 
     def add_custom_fields(
         self,
@@ -277,12 +392,13 @@ class SubscriptionClient(BaseClientWithCustomFields):
 
         response = self._put(
             f"subscriptions/{subscription_id}/bcd",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
 
     def block(
         self,
@@ -301,23 +417,24 @@ class SubscriptionClient(BaseClientWithCustomFields):
         Return the URL to retrieve the subscription blocking states for the account.
         """
 
-        payload = {
-            "stateName": state_name,
-            "service": service,
-            "isBlockChange": is_block_change,
-            "isBlockEntitlement": is_block_entitlement,
-            "isBlockBilling": is_block_billing,
-        }
+        payload = self._blocking_state_payload(
+            state_name,
+            service,
+            is_block_change=is_block_change,
+            is_block_entitlement=is_block_entitlement,
+            is_block_billing=is_block_billing,
+        )
 
         params = {"requestedDate": requested_date}
 
         response = self._post(
             f"subscriptions/{subscription_id}/block",
-            headers=header.dict(),
+            headers=self._json_headers(header),
             payload=payload,
             params=params,
         )
 
         self._raise_for_status(response)
+        self._invalidate_entity(header, subscription_id)
 
         return response.headers.get("Location")
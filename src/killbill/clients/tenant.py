@@ -33,11 +33,15 @@ class TenantClient(BaseClient):
             "tenants",
             payload=payload,
             params=params,
-            headers={
-                "X-Killbill-CreatedBy": created_by,
-                "X-Killbill-Reason": reason,
-                "X-Killbill-Comment": comment,
-            },
+            headers=self._json_headers(
+                Header(
+                    api_key=None,
+                    api_secret=None,
+                    created_by=created_by,
+                    reason=reason,
+                    comment=comment,
+                )
+            ),
         )
 
         self._raise_for_status(response)
@@ -49,12 +53,12 @@ class TenantClient(BaseClient):
 
         response = self._get(
             "tenants/uploadPerTenantConfig",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def add_configuration(self, header: Header, config: str):
         """Add a per tenant configuration (system properties)
@@ -71,7 +75,7 @@ class TenantClient(BaseClient):
         response = self._post(
             "tenants/uploadPerTenantConfig",
             data=config,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
@@ -81,7 +85,7 @@ class TenantClient(BaseClient):
 
         response = self._delete(
             "tenants/uploadPerTenantConfig",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
@@ -91,12 +95,12 @@ class TenantClient(BaseClient):
 
         response = self._get(
             "tenants/registerNotificationCallback",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
 
     def create_push_notification(self, header: Header, callback_url: str) -> None:
         """Create a new push notification subscription for the tenant.
@@ -112,7 +116,7 @@ class TenantClient(BaseClient):
         response = self._post(
             "tenants/registerNotificationCallback",
             params=params,
-            headers=header.dict(),
+            headers=self._headers(header),
         )
         self._raise_for_status(response)
 
@@ -124,7 +128,7 @@ class TenantClient(BaseClient):
         """
         response = self._delete(
             "tenants/registerNotificationCallback/",
-            headers=header.dict(),
+            headers=self._headers(header),
         )
 
         self._raise_for_status(response)
@@ -10,15 +10,17 @@ class TestClient(BaseClient):
 
         params = {"requestedDate": requested_date}
 
-        response = self._post("test/clock", params=params, headers=header.dict())
+        response = self._post(
+            "test/clock", params=params, headers=self._headers(header)
+        )
 
         self._raise_for_status(response)
 
     def retrieve_clock(self, header: Header):
         """Retrieve current clock"""
 
-        response = self._get("test/clock", headers=header.dict())
+        response = self._get("test/clock", headers=self._headers(header))
 
         self._raise_for_status(response)
 
-        return response.json()
+        return self._decode(response)
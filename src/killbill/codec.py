@@ -0,0 +1,91 @@
+import json
+
+
+def drop_none(value):
+    """Remove the None fields of a payload, recursively"""
+
+    if isinstance(value, dict):
+        return {key: drop_none(item) for key, item in value.items() if item is not None}
+
+    if isinstance(value, list):
+        return [drop_none(item) for item in value]
+
+    return value
+
+
+class JsonCodec:
+    """Encode request payloads and decode response bodies with `json`
+
+    Subclass it to plug in another JSON library, `loads` must raise
+    `ValueError` on invalid documents.
+    """
+
+    name = "json"
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by `orjson`"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgspecCodec(JsonCodec):
+    """Codec backed by `msgspec`"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._errors = msgspec.DecodeError
+        self.dumps = self._encoder.encode
+
+    def loads(self, data: bytes):
+        try:
+            return self._decoder.decode(data)
+        except self._errors as error:
+            raise ValueError(str(error)) from error
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(codec=None) -> JsonCodec:
+    """Return a codec from an instance or a name
+
+    The fastest installed library, `orjson` then `msgspec`, is used when
+    `codec` is None, falling back to the standard `json` module.
+    """
+
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is not None:
+        if codec not in CODECS:
+            raise ValueError(f"codec must be one of {', '.join(CODECS)}")
+
+        return CODECS[codec]()
+
+    for factory in CODECS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
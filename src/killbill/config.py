@@ -0,0 +1,97 @@
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from killbill.cache import EntityCache
+from killbill.catalog_index import CatalogIndex
+from killbill.codec import JsonCodec
+from killbill.hooks import Hook
+from killbill.index import AccountIndex
+from killbill.retry import RetryPolicy
+
+
+@dataclass
+class ClientConfig:
+    """Settings shared by every sub-client of a Kill Bill client"""
+
+    username: str
+    password: str
+    api_url: str = "http://localhost:8080"
+    timeout: int = 30
+    transport: object = None
+    retry: Optional[RetryPolicy] = None
+    hooks: List[Hook] = field(default_factory=list)
+    catalog_cache: bool = False
+    coalesce: bool = False
+    entity_cache: Optional[EntityCache] = None
+    account_index: Optional[AccountIndex] = None
+    codec: Optional[JsonCodec] = None
+    catalog_index: Optional[CatalogIndex] = None
+
+    def client_kwargs(self) -> dict:
+        """Keyword arguments of the sub-client constructors"""
+
+        return {
+            "username": self.username,
+            "password": self.password,
+            "api_url": self.api_url,
+            "timeout": self.timeout,
+            "transport": self.transport,
+            "retry": self.retry,
+            "hooks": self.hooks,
+            "coalesce": self.coalesce,
+            "entity_cache": self.entity_cache,
+            "account_index": self.account_index,
+            "codec": self.codec,
+            "catalog_index": self.catalog_index,
+        }
+
+    def worker_kwargs(self) -> dict:
+        """Keyword arguments of a `KillBillClient` with the same settings
+
+        Only picklable settings are kept, to create a client in another
+        process: the transport, hooks, caches and indexes are bound to this
+        process and left out.
+        """
+
+        return {
+            "username": self.username,
+            "password": self.password,
+            "api_url": self.api_url,
+            "timeout": self.timeout,
+            "retry": self.retry,
+            "catalog_cache": self.catalog_cache,
+            "coalesce": self.coalesce,
+            "codec": self.codec.name if self.codec is not None else None,
+        }
+
+
+class sub_client:
+    """`functools.cached_property` creating the sub-client under a lock
+
+    `cached_property` has no lock since Python 3.12, so threads first
+    accessing a sub-client at the same time would each create one, with
+    its own caches and single-flight group.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        # Once created, the sub-client is found in the instance dict and
+        # this descriptor is no longer called
+        with self._lock:
+            client = instance.__dict__.get(self.name)
+            if client is None:
+                client = instance.__dict__[self.name] = self.func(instance)
+
+        return client
@@ -31,3 +31,12 @@ class BadRequestError(Exception):
         if msg is None:
             msg = "Bad Request"
         super().__init__(msg)
+
+
+class CatalogValidationError(BadRequestError):
+    """Raised when a request does not match the indexed catalog, before it
+    is sent"""
+
+    def __init__(self, errors: list) -> None:
+        self.errors = errors
+        super().__init__("; ".join(errors))
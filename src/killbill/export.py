@@ -0,0 +1,352 @@
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from killbill.bulk import BulkRun
+
+CHECKPOINT = "checkpoint-{partition:06d}.json"
+
+
+@dataclass
+class ExportStats:
+    """Progress and throughput of a `TenantExport`"""
+
+    partitions: Optional[int] = None
+    exported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    accounts: int = 0
+    requests: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: float = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the export started"""
+
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def rate(self) -> float:
+        """Exported accounts per second"""
+
+        elapsed = self.elapsed
+        return self.accounts / elapsed if elapsed > 0 else 0.0
+
+
+class NdjsonWriter:
+    """Write one JSON document per line"""
+
+    suffix = ".ndjson"
+
+    def __init__(self, path: str, dumps: Callable):
+        self._file = open(path, "wb")
+        self._dumps = dumps
+
+    def write(self, row: dict):
+        self._file.write(self._dumps(row))
+        self._file.write(b"\n")
+
+    def close(self):
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._file.name)
+
+
+class ParquetWriter:
+    """Write rows to a Parquet file, requires `pyarrow`
+
+    Each account field is a column; the related objects, whose shape varies
+    between Kill Bill versions, are stored as JSON strings.
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, path: str, dumps: Callable):
+        import pyarrow
+
+        self._pyarrow = pyarrow
+        self._path = path
+        self._dumps = dumps
+        self._rows = []
+
+    def write(self, row: dict):
+        self._rows.append(
+            {
+                key: (
+                    self._dumps(value).decode()
+                    if isinstance(value, (dict, list))
+                    else value
+                )
+                for key, value in row.items()
+            }
+        )
+
+    def close(self):
+        import pyarrow.parquet
+
+        table = self._pyarrow.Table.from_pylist(self._rows)
+        pyarrow.parquet.write_table(table, self._path)
+        self._rows = []
+
+    def abort(self):
+        self._rows = []
+
+
+WRITERS = {"ndjson": NdjsonWriter, "parquet": ParquetWriter}
+
+
+class TenantExport:
+    """Export every account of a tenant with its related objects
+
+    The accounts pagination range is cut into partitions of `page_size`
+    accounts. For each account of a partition, every `sections` function is
+    called with the account id, at most `concurrency` at a time, and one row
+    holding the account and its sections is written. Each partition is
+    written to its own file, which is renamed into place once complete and
+    recorded in its own checkpoint file, so an interrupted or failed export
+    is resumed where it stopped. Runs exporting disjoint `partitions` can
+    share the directory, as none of them rewrites another's checkpoint.
+
+    Args:
+        fetch_page (Callable): Return the accounts at `(offset, limit)`.
+        sections (dict): Map a row key to a function of the account id.
+        directory (str): Output directory, created if needed.
+        count (Callable, optional): Return the number of accounts, or None
+            to follow the pages until a short one.
+        format (str): "ndjson" or "parquet".
+        page_size (int): Number of accounts per partition.
+        concurrency (int): Number of requests in flight.
+        partitions (Iterable[int], optional): Export only these partitions,
+            e.g. to share an export between several machines.
+        resume (bool): Skip the partitions recorded in the checkpoints.
+        progress (Callable, optional): Called with the `ExportStats` after
+            each partition.
+        dumps (Callable): Encode a row as JSON bytes.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], List[dict]],
+        sections: Dict[str, Callable[[str], object]],
+        directory: str,
+        count: Callable[[], Optional[int]] = None,
+        format: str = "ndjson",
+        page_size: int = 1000,
+        concurrency: int = 16,
+        partitions: Iterable[int] = None,
+        resume: bool = True,
+        progress: Callable[[ExportStats], None] = None,
+        dumps: Callable = None,
+    ):
+        if format not in WRITERS:
+            raise ValueError(
+                f"unknown format {format!r}, expected one of {', '.join(WRITERS)}"
+            )
+
+        if page_size < 1:
+            raise ValueError("page_size must be greater than 0")
+
+        self.fetch_page = fetch_page
+        self.sections = sections
+        self.directory = directory
+        self.count = count
+        self.format = format
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.partitions = partitions
+        self.resume = resume
+        self.progress = progress
+        self.dumps = dumps or (lambda value: json.dumps(value).encode())
+        self.stats = ExportStats()
+        self.failed = {}
+
+    def path(self, partition: int) -> str:
+        """Return the file of a partition"""
+
+        suffix = WRITERS[self.format].suffix
+        return os.path.join(self.directory, f"accounts-{partition:06d}{suffix}")
+
+    def run(self) -> ExportStats:
+        """Export the partitions not yet done, and return the statistics
+
+        Partitions which failed are kept in `failed`, with their error, and
+        are retried by the next run.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.stats = ExportStats()
+        self.failed = {}
+        done = self._load_checkpoints()
+        bounded = self.partitions is not None or self._count()
+        partitions = self._todo(done, bounded)
+
+        # The next page is downloaded while the current partition is exported
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            partition = next(partitions, None)
+            if partition is not None:
+                future = executor.submit(self._page, partition)
+
+            while partition is not None:
+                try:
+                    accounts = future.result()
+                except Exception as error:
+                    accounts = error
+
+                self.stats.requests += 1
+
+                # Without the count, the pages are followed until a short one
+                last = not bounded and (
+                    isinstance(accounts, Exception) or len(accounts) < self.page_size
+                )
+                following = None if last else next(partitions, None)
+                if following is not None:
+                    future = executor.submit(self._page, following)
+
+                if isinstance(accounts, Exception):
+                    self._fail(partition, accounts)
+                else:
+                    self._export(partition, accounts)
+
+                if self.progress is not None:
+                    self.progress(self.stats)
+
+                partition = following
+
+        self.stats.finished = time.monotonic()
+
+        return self.stats
+
+    def _count(self) -> bool:
+        """Set the number of partitions from the count, if there is one"""
+
+        total = self.count() if self.count is not None else None
+
+        if total is None:
+            return False
+
+        self.stats.partitions = math.ceil(total / self.page_size)
+
+        return True
+
+    def _todo(self, done: dict, bounded: bool):
+        """Yield the partitions missing from the checkpoints"""
+
+        if self.partitions is not None:
+            partitions = list(self.partitions)
+            self.stats.partitions = len(partitions)
+        elif bounded:
+            partitions = range(self.stats.partitions)
+        else:
+            partitions = itertools.count()
+
+        for partition in partitions:
+            exported = done.get(partition)
+
+            if exported is None:
+                yield partition
+                continue
+
+            self.stats.skipped += 1
+
+            if not bounded and exported < self.page_size:
+                return
+
+    def _page(self, partition: int) -> List[dict]:
+        return self.fetch_page(partition * self.page_size, self.page_size)
+
+    def _export(self, partition: int, accounts: List[dict]):
+        """Write the rows of a partition, then record it in the checkpoint"""
+
+        names = list(self.sections)
+        rows = [{**account, **dict.fromkeys(names)} for account in accounts]
+        remaining = [len(names)] * len(rows)
+
+        def fetch(item):
+            position, name = item
+            return self.sections[name](accounts[position]["accountId"])
+
+        items = ((position, name) for position in range(len(rows)) for name in names)
+
+        path = self.path(partition)
+        writer = WRITERS[self.format](f"{path}.part", self.dumps)
+
+        try:
+            for index, result in BulkRun(fetch, items, self.concurrency):
+                self.stats.requests += 1
+
+                if isinstance(result, Exception):
+                    raise result
+
+                position, name = divmod(index, len(names))
+                rows[position][names[name]] = result
+                remaining[position] -= 1
+
+                if not remaining[position]:
+                    writer.write(rows[position])
+                    rows[position] = None
+        except Exception as error:
+            writer.abort()
+            self._fail(partition, error)
+            return
+
+        writer.close()
+        os.replace(f"{path}.part", path)
+
+        self._save_checkpoint(partition, len(accounts))
+
+        self.stats.exported += 1
+        self.stats.accounts += len(accounts)
+
+    def _fail(self, partition: int, error: Exception):
+        self.failed[partition] = error
+        self.stats.failed += 1
+
+    def _load_checkpoints(self) -> Dict[int, int]:
+        """Return the number of accounts of each exported partition"""
+
+        done = {}
+
+        if not self.resume:
+            return done
+
+        for name in os.listdir(self.directory):
+            if not (name.startswith("checkpoint-") and name.endswith(".json")):
+                continue
+
+            with open(os.path.join(self.directory, name)) as file:
+                saved = json.load(file)
+
+            for key in ("format", "page_size"):
+                if saved[key] != getattr(self, key):
+                    raise ValueError(
+                        f"the checkpoint was written with {key}={saved[key]!r}, "
+                        "export to another directory or pass resume=False"
+                    )
+
+            done[saved["partition"]] = saved["count"]
+
+        return done
+
+    def _save_checkpoint(self, partition: int, count: int):
+        path = os.path.join(self.directory, CHECKPOINT.format(partition=partition))
+        checkpoint = {
+            "format": self.format,
+            "page_size": self.page_size,
+            "partition": partition,
+            "count": count,
+        }
+
+        with open(f"{path}.part", "w") as file:
+            json.dump(checkpoint, file)
+
+        os.replace(f"{path}.part", path)
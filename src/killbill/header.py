@@ -1,19 +1,77 @@
 from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class Header:
+    """Kill Bill tenant and actor headers
+
+    Headers are immutable: the HTTP header set is built once, without the
+    unset values, and reused by every request. Use `dataclasses.replace` to
+    derive a header, e.g. with a `request_id`.
+    """
+
     api_key: str
     api_secret: str
     created_by: str
     reason: str = None
     comment: str = None
+    request_id: str = None
 
-    def dict(self):
-        return {
+    def __post_init__(self):
+        headers = {
             "X-Killbill-ApiKey": self.api_key,
             "X-Killbill-ApiSecret": self.api_secret,
             "X-Killbill-CreatedBy": self.created_by,
             "X-Killbill-Reason": self.reason,
             "X-Killbill-Comment": self.comment,
+            "X-Request-Id": self.request_id,
         }
+
+        object.__setattr__(
+            self,
+            "_headers",
+            MappingProxyType({k: v for k, v in headers.items() if v is not None}),
+        )
+        object.__setattr__(self, "_merged", {})
+
+    def __reduce__(self):
+        return (
+            Header,
+            (
+                self.api_key,
+                self.api_secret,
+                self.created_by,
+                self.reason,
+                self.comment,
+                self.request_id,
+            ),
+        )
+
+    def dict(self) -> Mapping[str, str]:
+        """Return the read-only HTTP headers"""
+
+        return self._headers
+
+    def merged(
+        self,
+        defaults: Tuple[Tuple[str, str], ...],
+        overrides: Tuple[Tuple[str, str], ...] = (),
+    ) -> Mapping[str, str]:
+        """Return the headers layered between `defaults` and `overrides`
+
+        The result is read-only and cached on the header, so the same
+        mapping is reused by every request with the same defaults.
+        """
+
+        key = (defaults, overrides)
+        headers = self._merged.get(key)
+
+        if headers is None:
+            headers = MappingProxyType(
+                {**dict(defaults), **self._headers, **dict(overrides)}
+            )
+            self._merged[key] = headers
+
+        return headers
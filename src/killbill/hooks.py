@@ -0,0 +1,81 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+_ID_SEGMENT = re.compile(
+    r"(?<=/)[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replace the ids of an endpoint by `{id}`, e.g. `accounts/{id}/invoices`"""
+
+    return _ID_SEGMENT.sub("{id}", "/" + endpoint)[1:]
+
+
+def body_size(payload=None, data=None) -> int:
+    """Size in bytes of a request body"""
+
+    if data is not None:
+        return len(data.encode() if isinstance(data, str) else data)
+
+    if payload is not None:
+        return len(json.dumps(payload).encode())
+
+    return 0
+
+
+@dataclass
+class RequestContext:
+    """Information about one attempt of a request, passed to the hooks"""
+
+    method: str
+    endpoint: str
+    endpoint_template: str
+    url: str
+    attempt: int = 1
+    params: Optional[dict] = None
+    payload: object = None
+    data: object = None
+    status_code: Optional[int] = None
+    response_bytes: Optional[int] = None
+    latency: Optional[float] = None
+    exception: Optional[BaseException] = None
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def request_bytes(self) -> int:
+        """Size of the request body, computed on each access"""
+
+        return body_size(self.payload, self.data)
+
+
+class Hook:
+    """Base class of the request hooks
+
+    Hooks are called for every attempt of a request, in registration order
+    before the request and in reverse order afterwards. `after_response` is
+    called for every response, including 4xx and 5xx ones; `on_error` when
+    the transport raised. Hooks run in the calling thread (or event loop)
+    and must not block.
+
+    Example:
+    ```python
+    class SlowCallLogger(Hook):
+        def after_response(self, context):
+            if context.latency > 1:
+                print(context.method, context.endpoint_template, context.latency)
+
+    killbill = KillBillClient("admin", "password", hooks=[SlowCallLogger()])
+    ```
+    """
+
+    def before_request(self, context: RequestContext):
+        """Called before the request is sent"""
+
+    def after_response(self, context: RequestContext):
+        """Called when a response was received"""
+
+    def on_error(self, context: RequestContext):
+        """Called when the request failed without a response"""
@@ -0,0 +1,111 @@
+import threading
+import uuid
+from typing import Iterable, Optional, Tuple
+
+
+class ExternalKey(str):
+    """External key of an account, accepted wherever an `account_id` is
+
+    Example:
+    ```python
+    from killbill import ExternalKey
+
+    killbill.account.invoices(header, account_id=ExternalKey("customer-42"))
+    ```
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"ExternalKey({str.__repr__(self)})"
+
+
+def _pack(account_id: str):
+    """Store account UUIDs as 16 bytes, anything else as text"""
+
+    try:
+        return uuid.UUID(account_id).bytes
+    except ValueError:
+        return account_id
+
+
+def _unpack(value) -> str:
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+class AccountIndex:
+    """Persistent index from account external key to account id
+
+    The id of an account never changes, so entries are kept forever. The
+    index is stored in SQLite, in memory by default or in the file at `path`
+    to survive restarts. It is filled by `AccountClient.create`, by
+    `AccountClient.retrieve`, when an `ExternalKey` is resolved and in bulk
+    by `AccountClient.warm_index`.
+
+    Args:
+        path (str): SQLite database file, defaults to an in-memory database.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS account_index ("
+            "api_key TEXT NOT NULL, "
+            "external_key TEXT NOT NULL, "
+            "account_id BLOB NOT NULL, "
+            "PRIMARY KEY (api_key, external_key)"
+            ") WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def get(self, api_key: str, external_key: str) -> Optional[str]:
+        """Return the account id of an external key, or None"""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT account_id FROM account_index "
+                "WHERE api_key = ? AND external_key = ?",
+                (api_key or "", str(external_key)),
+            ).fetchone()
+
+        return _unpack(row[0]) if row is not None else None
+
+    def set(self, api_key: str, external_key: str, account_id: str):
+        """Record the account id of an external key"""
+
+        self.update(api_key, ((external_key, account_id),))
+
+    def update(self, api_key: str, entries: Iterable[Tuple[str, str]]) -> int:
+        """Record `(external_key, account_id)` pairs in a single transaction
+
+        Returns:
+            int: Number of pairs recorded.
+        """
+
+        rows = [
+            (api_key or "", str(external_key), _pack(account_id))
+            for external_key, account_id in entries
+            if external_key and account_id
+        ]
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO account_index VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+
+        return len(rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM account_index").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+
+        with self._lock:
+            self._db.close()
@@ -1,16 +1,66 @@
-from killbill.clients.account import AccountClient
-from killbill.clients.bundle import BundleClient
-from killbill.clients.catalog import CatalogClient
-from killbill.clients.credit import CreditClient
-from killbill.clients.invoice import InvoiceClient
-from killbill.clients.overdue import OverdueClient
-from killbill.clients.subscription import SubscriptionClient
-from killbill.clients.tenant import TenantClient
-from killbill.clients.test import TestClient
+from typing import TYPE_CHECKING, Callable, List, Union
+
+from killbill.cache import EntityCache
+from killbill.catalog_index import CatalogIndex
+from killbill.codec import JsonCodec, get_codec
+from killbill.config import ClientConfig, sub_client
+from killbill.header import Header
+from killbill.hooks import Hook
+from killbill.index import AccountIndex
+from killbill.retry import RetryPolicy
+from killbill.transport import Transport
+
+if TYPE_CHECKING:
+    from killbill.clients import (
+        AccountClient,
+        BundleClient,
+        CatalogClient,
+        CreditClient,
+        InvoiceClient,
+        OverdueClient,
+        SubscriptionClient,
+        TenantClient,
+        TestClient,
+    )
+    from killbill.process import ProcessRun
 
 
 class KillBillClient:
-    """Kill Bill Client"""
+    """Kill Bill Client
+
+    All sub-clients share a single transport. The default one is a
+    connection-pooled `requests` session, so TCP connections (and TLS
+    sessions) are reused across every API call. Sub-clients are created on
+    first access from the shared `config`.
+
+    Args:
+        transport (Transport, optional): Transport sending the requests, e.g.
+            `HttpxTransport` or `InProcessTransport`. The pool arguments only
+            apply to the default `RequestsTransport`.
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept per host,
+            size it to the number of threads calling the client.
+        pool_block (bool): Wait for a free connection instead of opening an
+            extra one when the pool is exhausted.
+        keep_alive (bool): Reuse connections between requests.
+        retry (RetryPolicy, optional): Retry policy for transient errors,
+            requests are not retried when None.
+        catalog_cache (bool): Cache retrieved catalogs in memory, see
+            `CatalogClient`.
+        hooks (List[Hook], optional): Ordered request hooks, see `Hook`.
+        coalesce (bool): Share one HTTP call between identical concurrent GET
+            requests.
+        entity_cache (EntityCache, optional): Cache of retrieved accounts,
+            bundles and subscriptions, see `EntityCache`.
+        account_index (AccountIndex, optional): Index from account external
+            key to account id, see `AccountIndex`.
+        codec (str | JsonCodec, optional): JSON codec, `"orjson"`,
+            `"msgspec"`, `"json"` or a `JsonCodec` instance. Defaults to the
+            fastest installed library.
+        catalog_index (CatalogIndex, optional): Indexed catalogs, filled by
+            `catalog.index`, against which subscriptions are checked before
+            being sent, see `CatalogIndex`.
+    """
 
     def __init__(
         self,
@@ -18,13 +68,178 @@ class KillBillClient:
         password: str,
         api_url: str = "http://localhost:8080",
         timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry: RetryPolicy = None,
+        catalog_cache: bool = False,
+        hooks: List[Hook] = None,
+        coalesce: bool = False,
+        entity_cache: EntityCache = None,
+        account_index: AccountIndex = None,
+        codec: Union[str, JsonCodec] = None,
+        catalog_index: CatalogIndex = None,
+        transport: Transport = None,
     ):
-        self.tenant = TenantClient(username, password, api_url, timeout)
-        self.catalog = CatalogClient(username, password, api_url, timeout)
-        self.account = AccountClient(username, password, api_url, timeout)
-        self.subscription = SubscriptionClient(username, password, api_url, timeout)
-        self.bundle = BundleClient(username, password, api_url, timeout)
-        self.overdue = OverdueClient(username, password, api_url, timeout)
-        self.test = TestClient(username, password, api_url, timeout)
-        self.invoice = InvoiceClient(username, password, api_url, timeout)
-        self.credit = CreditClient(username, password, api_url, timeout)
+        if transport is None:
+            from killbill.transport import RequestsTransport
+
+            transport = RequestsTransport(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+            )
+
+        self.config = ClientConfig(
+            username=username,
+            password=password,
+            api_url=api_url,
+            timeout=timeout,
+            transport=transport,
+            retry=retry,
+            hooks=list(hooks or []),
+            catalog_cache=catalog_cache,
+            coalesce=coalesce,
+            entity_cache=entity_cache,
+            account_index=account_index,
+            codec=get_codec(codec),
+            catalog_index=catalog_index,
+        )
+
+    @property
+    def transport(self) -> Transport:
+        return self.config.transport
+
+    @property
+    def hooks(self) -> List[Hook]:
+        return self.config.hooks
+
+    @sub_client
+    def tenant(self) -> "TenantClient":
+        from killbill.clients.tenant import TenantClient
+
+        return TenantClient(**self.config.client_kwargs())
+
+    @sub_client
+    def catalog(self) -> "CatalogClient":
+        from killbill.clients.catalog import CatalogClient
+
+        return CatalogClient(
+            **self.config.client_kwargs(), cache=self.config.catalog_cache
+        )
+
+    @sub_client
+    def account(self) -> "AccountClient":
+        from killbill.clients.account import AccountClient
+
+        return AccountClient(**self.config.client_kwargs())
+
+    @sub_client
+    def subscription(self) -> "SubscriptionClient":
+        from killbill.clients.subscription import SubscriptionClient
+
+        return SubscriptionClient(**self.config.client_kwargs())
+
+    @sub_client
+    def bundle(self) -> "BundleClient":
+        from killbill.clients.bundle import BundleClient
+
+        return BundleClient(**self.config.client_kwargs())
+
+    @sub_client
+    def overdue(self) -> "OverdueClient":
+        from killbill.clients.overdue import OverdueClient
+
+        return OverdueClient(**self.config.client_kwargs())
+
+    @sub_client
+    def test(self) -> "TestClient":
+        from killbill.clients.test import TestClient
+
+        return TestClient(**self.config.client_kwargs())
+
+    @sub_client
+    def invoice(self) -> "InvoiceClient":
+        from killbill.clients.invoice import InvoiceClient
+
+        return InvoiceClient(**self.config.client_kwargs())
+
+    @sub_client
+    def credit(self) -> "CreditClient":
+        from killbill.clients.credit import CreditClient
+
+        return CreditClient(**self.config.client_kwargs())
+
+    def add_hook(self, hook: Hook):
+        """Append a hook to the chain shared by every sub-client"""
+
+        self.hooks.append(hook)
+
+    def map_accounts(
+        self,
+        header: Header,
+        func: Callable,
+        processes: int = None,
+        slice_size: int = 500,
+        threads: int = 4,
+        transport_factory: Callable[[], Transport] = None,
+    ) -> "ProcessRun":
+        """Call `func(killbill, header, account)` on every account in processes
+
+        Use it when decoding and transforming the responses, not the network,
+        is the bottleneck. Each worker creates its own client from this
+        client's settings; the transport, hooks, entity cache and account
+        index are not shared with the workers.
+
+        Args:
+            func (Callable): Module-level function, its results must be
+                picklable.
+            processes (int, optional): Number of worker processes, defaults
+                to the number of CPUs.
+            slice_size (int): Number of accounts handed to a worker at once.
+            threads (int): Number of accounts processed in parallel by each
+                worker.
+            transport_factory (Callable, optional): Picklable function
+                creating the transport of a worker, a pooled
+                `RequestsTransport` by default.
+
+        Returns:
+            ProcessRun: Iterator of `(account_id, result | error)` as the
+            slices complete.
+
+        Example:
+        ```python
+        def unpaid_balance(killbill, header, account):
+            invoices = killbill.account.invoices(header, account["accountId"])
+            return sum(invoice["balance"] for invoice in invoices)
+
+        for account_id, balance in killbill.map_accounts(header, unpaid_balance):
+            ...
+        ```
+        """
+
+        from killbill.process import ProcessRun
+
+        return ProcessRun(
+            func,
+            header,
+            self.config.worker_kwargs(),
+            count=lambda: self.account.count(header),
+            processes=processes,
+            slice_size=slice_size,
+            threads=threads,
+            transport_factory=transport_factory,
+        )
+
+    def close(self):
+        """Close the transport and its pooled connections"""
+
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,248 @@
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Sequence
+
+from killbill.hooks import Hook, RequestContext
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """Counters updated by a single thread"""
+
+    __slots__ = ("requests", "latencies", "retries", "in_flight")
+
+    def __init__(self):
+        self.requests = {}
+        self.latencies = {}
+        self.retries = {}
+        self.in_flight = 0
+
+    def add(self, shard: "_Shard"):
+        """Add the counters of another shard to this one"""
+
+        self.in_flight += shard.in_flight
+
+        for key, value in shard.requests.copy().items():
+            self.requests[key] = self.requests.get(key, 0) + value
+
+        for key, value in shard.retries.copy().items():
+            self.retries[key] = self.retries.get(key, 0) + value
+
+        for key, histogram in shard.latencies.copy().items():
+            total = self.latencies.setdefault(key, [0] * len(histogram))
+            for index, value in enumerate(histogram):
+                total[index] += value
+
+
+class _Owner:
+    """Thread-local token, collected when its thread ends"""
+
+    __slots__ = ("__weakref__",)
+
+
+class Metrics(Hook):
+    """Hook collecting request counters and latency histograms
+
+    Counters are kept per thread and only summed when read, so recording a
+    request takes no lock. The counters of a thread are folded into a
+    common total when the thread ends.
+
+    Args:
+        buckets (Sequence[float]): Upper bounds in seconds of the latency
+            histogram buckets.
+        pool_size (int, optional): Size of the connection pool, used to
+            report its saturation.
+
+    Example:
+    ```python
+    metrics = Metrics(pool_size=10)
+    killbill = KillBillClient("admin", "password", pool_maxsize=10, hooks=[metrics])
+
+    print(metrics.prometheus())
+    ```
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, pool_size=None):
+        self.buckets = tuple(sorted(buckets))
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._shards = set()
+        self._retired = _Shard()
+        # reentrant: dropping a thread-local may retire a shard in place
+        self._lock = threading.RLock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            self._local.owner = _Owner()
+            weakref.finalize(self._local.owner, self._retire, shard)
+            with self._lock:
+                self._shards.add(shard)
+
+        return shard
+
+    def _retire(self, shard: _Shard):
+        """Fold the counters of a finished thread into the common total"""
+
+        with self._lock:
+            if shard in self._shards:
+                self._shards.remove(shard)
+                self._retired.add(shard)
+
+    def before_request(self, context: RequestContext):
+        shard = self._shard()
+        shard.in_flight += 1
+
+        if context.attempt > 1:
+            key = (context.endpoint_template, context.method)
+            shard.retries[key] = shard.retries.get(key, 0) + 1
+
+    def after_response(self, context: RequestContext):
+        self._record(context, str(context.status_code))
+
+    def on_error(self, context: RequestContext):
+        self._record(context, "error")
+
+    def _record(self, context: RequestContext, status: str):
+        shard = self._shard()
+        shard.in_flight -= 1
+
+        key = (context.endpoint_template, context.method)
+        requests_key = key + (status,)
+        shard.requests[requests_key] = shard.requests.get(requests_key, 0) + 1
+
+        histogram = shard.latencies.get(key)
+        if histogram is None:
+            # one counter per bucket plus +Inf, then the sum of latencies
+            histogram = shard.latencies[key] = [0] * (len(self.buckets) + 1) + [0.0]
+
+        histogram[bisect_left(self.buckets, context.latency)] += 1
+        histogram[-1] += context.latency
+
+    def _merge(self):
+        """Sum the counters of every thread"""
+
+        total = _Shard()
+
+        with self._lock:
+            total.add(self._retired)
+            for shard in list(self._shards):
+                total.add(shard)
+
+        return total.requests, total.latencies, total.retries, total.in_flight
+
+    def snapshot(self) -> dict:
+        """Return the metrics as a JSON serializable dict"""
+
+        requests, latencies, retries, in_flight = self._merge()
+
+        histograms = []
+        for (endpoint, method), histogram in sorted(latencies.items()):
+            cumulative, count = {}, 0
+            for bound, value in zip(self.buckets + (float("inf"),), histogram):
+                count += value
+                cumulative[str(bound)] = count
+            histograms.append(
+                {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "buckets": cumulative,
+                    "count": count,
+                    "sum": histogram[-1],
+                }
+            )
+
+        return {
+            "requests": [
+                {"endpoint": e, "method": m, "status": s, "count": n}
+                for (e, m, s), n in sorted(requests.items())
+            ],
+            "latency": histograms,
+            "retries": [
+                {"endpoint": e, "method": m, "count": n}
+                for (e, m), n in sorted(retries.items())
+            ],
+            "in_flight": in_flight,
+            "pool_size": self.pool_size,
+            "pool_saturation": (in_flight / self.pool_size if self.pool_size else None),
+        }
+
+    def prometheus(self, prefix: str = "killbill_client") -> str:
+        """Return the metrics in the Prometheus text exposition format"""
+
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_requests_total Kill Bill API requests.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+
+        for item in snapshot["requests"]:
+            labels = _labels(item["endpoint"], item["method"], status=item["status"])
+            lines.append(f"{prefix}_requests_total{{{labels}}} {item['count']}")
+
+        lines += [
+            f"# HELP {prefix}_request_duration_seconds Kill Bill API request latency.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+
+        for item in snapshot["latency"]:
+            for bound, count in item["buckets"].items():
+                le = "+Inf" if bound == "inf" else bound
+                labels = _labels(item["endpoint"], item["method"], le=le)
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket{{{labels}}} {count}"
+                )
+            labels = _labels(item["endpoint"], item["method"])
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} {item['sum']}"
+            )
+            lines.append(
+                f"{prefix}_request_duration_seconds_count{{{labels}}} {item['count']}"
+            )
+
+        lines += [
+            f"# HELP {prefix}_retries_total Kill Bill API request retries.",
+            f"# TYPE {prefix}_retries_total counter",
+        ]
+
+        for item in snapshot["retries"]:
+            labels = _labels(item["endpoint"], item["method"])
+            lines.append(f"{prefix}_retries_total{{{labels}}} {item['count']}")
+
+        lines += [
+            f"# HELP {prefix}_in_flight_requests Kill Bill API requests in progress.",
+            f"# TYPE {prefix}_in_flight_requests gauge",
+            f"{prefix}_in_flight_requests {snapshot['in_flight']}",
+        ]
+
+        if self.pool_size:
+            lines += [
+                f"# HELP {prefix}_pool_saturation Ratio of in-flight requests to pool size.",
+                f"# TYPE {prefix}_pool_saturation gauge",
+                f"{prefix}_pool_saturation {snapshot['pool_saturation']}",
+            ]
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every recorded value"""
+
+        with self._lock:
+            self._shards = set()
+            self._retired = _Shard()
+            self._local = threading.local()
+
+
+def _labels(endpoint: str, method: str, **extra) -> str:
+    """Format Prometheus labels"""
+
+    labels = {"endpoint": endpoint, "method": method, **extra}
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
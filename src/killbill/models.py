@@ -0,0 +1,439 @@
+import re
+from typing import Iterable, List
+
+_CAMEL = re.compile(r"(?<=[a-z0-9])([A-Z]+)")
+
+# model name -> class, to resolve the models of nested lists
+_MODELS = {}
+
+
+def _snake_case(key: str) -> str:
+    """Return the attribute name of a JSON key, e.g. `accountCBA` -> `account_cba`"""
+
+    return _CAMEL.sub(r"_\1", key).lower()
+
+
+class _Nested:
+    """List of models decoded from the raw JSON on first access"""
+
+    def __init__(self, key: str, model: str):
+        self.key = key
+        self.model = model
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.slot)
+
+        if isinstance(value, list):
+            model = _MODELS[self.model]
+            value = tuple(model.from_json(item) for item in value)
+            setattr(instance, self.slot, value)
+
+        return value
+
+
+class Model:
+    """Compact, `__slots__` based view of a Kill Bill JSON object
+
+    Scalar fields are exposed as snake case attributes, missing fields are
+    None. Nested lists, such as invoice items and audit logs, are kept as
+    raw JSON and decoded into models on first access. Fields unknown to the
+    model are kept in `extra`.
+    """
+
+    __slots__ = ("extra",)
+
+    _fields = ()
+    _nested = ()
+
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        _MODELS[cls.__name__] = cls
+
+        # (JSON key, slot) pairs read by `from_json`
+        cls._slots = tuple((key, _snake_case(key)) for key in cls._fields) + tuple(
+            (nested.key, nested.slot)
+            for nested in vars(cls).values()
+            if isinstance(nested, _Nested)
+        )
+        cls._known = frozenset(key for key, _ in cls._slots)
+
+    @classmethod
+    def from_json(cls, data: dict):
+        """Build the model of a decoded JSON object"""
+
+        model = cls.__new__(cls)
+
+        for key, slot in cls._slots:
+            setattr(model, slot, data.get(key))
+
+        unknown = data.keys() - cls._known
+        model.extra = {key: data[key] for key in unknown} if unknown else None
+
+        return model
+
+    @classmethod
+    def from_json_list(cls, data: Iterable[dict]) -> List["Model"]:
+        """Build the models of a decoded JSON array"""
+
+        return [cls.from_json(item) for item in data]
+
+    def to_json(self) -> dict:
+        """Return the JSON object of the model
+
+        Fields which are None are left out, as `drop_none` does for the
+        payloads, so a model built from a JSON object returns it unchanged.
+        """
+
+        data = dict(self.extra or {})
+
+        for key, slot in self._slots:
+            value = getattr(self, slot)
+            if value is None:
+                continue
+            if isinstance(value, tuple):
+                value = [item.to_json() for item in value]
+            data[key] = value
+
+        return data
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self.to_json() == other.to_json()
+
+    # Models are mutable and compared by value, so they are not hashable
+    __hash__ = None
+
+    def __repr__(self):
+        key, slot = self._slots[0]
+        return f"{type(self).__name__}({slot}={getattr(self, slot)!r})"
+
+
+class AuditLog(Model):
+    """Audit log of a Kill Bill object"""
+
+    __slots__ = (
+        "change_type",
+        "change_date",
+        "object_type",
+        "object_id",
+        "changed_by",
+        "reason_code",
+        "comments",
+        "user_token",
+        "history",
+    )
+
+    _fields = (
+        "changeType",
+        "changeDate",
+        "objectType",
+        "objectId",
+        "changedBy",
+        "reasonCode",
+        "comments",
+        "userToken",
+        "history",
+    )
+
+
+class Account(Model):
+    """Kill Bill account"""
+
+    __slots__ = (
+        "account_id",
+        "name",
+        "first_name_length",
+        "external_key",
+        "email",
+        "bill_cycle_day_local",
+        "currency",
+        "parent_account_id",
+        "is_payment_delegated_to_parent",
+        "payment_method_id",
+        "reference_time",
+        "time_zone",
+        "address1",
+        "address2",
+        "postal_code",
+        "company",
+        "city",
+        "state",
+        "country",
+        "locale",
+        "phone",
+        "notes",
+        "is_migrated",
+        "account_balance",
+        "account_cba",
+        "_audit_logs",
+    )
+
+    _fields = (
+        "accountId",
+        "name",
+        "firstNameLength",
+        "externalKey",
+        "email",
+        "billCycleDayLocal",
+        "currency",
+        "parentAccountId",
+        "isPaymentDelegatedToParent",
+        "paymentMethodId",
+        "referenceTime",
+        "timeZone",
+        "address1",
+        "address2",
+        "postalCode",
+        "company",
+        "city",
+        "state",
+        "country",
+        "locale",
+        "phone",
+        "notes",
+        "isMigrated",
+        "accountBalance",
+        "accountCBA",
+    )
+
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class Subscription(Model):
+    """Kill Bill subscription"""
+
+    __slots__ = (
+        "subscription_id",
+        "account_id",
+        "bundle_id",
+        "bundle_external_key",
+        "external_key",
+        "start_date",
+        "product_name",
+        "product_category",
+        "billing_period",
+        "phase_type",
+        "price_list",
+        "plan_name",
+        "state",
+        "source_type",
+        "cancelled_date",
+        "charged_through_date",
+        "billing_start_date",
+        "billing_end_date",
+        "bill_cycle_day_local",
+        "quantity",
+        "events",
+        "price_overrides",
+        "prices",
+        "_audit_logs",
+    )
+
+    _fields = (
+        "subscriptionId",
+        "accountId",
+        "bundleId",
+        "bundleExternalKey",
+        "externalKey",
+        "startDate",
+        "productName",
+        "productCategory",
+        "billingPeriod",
+        "phaseType",
+        "priceList",
+        "planName",
+        "state",
+        "sourceType",
+        "cancelledDate",
+        "chargedThroughDate",
+        "billingStartDate",
+        "billingEndDate",
+        "billCycleDayLocal",
+        "quantity",
+        "events",
+        "priceOverrides",
+        "prices",
+    )
+
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class Bundle(Model):
+    """Kill Bill bundle, with its subscriptions"""
+
+    __slots__ = (
+        "bundle_id",
+        "account_id",
+        "external_key",
+        "timeline",
+        "_subscriptions",
+        "_audit_logs",
+    )
+
+    _fields = ("bundleId", "accountId", "externalKey", "timeline")
+
+    subscriptions = _Nested("subscriptions", "Subscription")
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class InvoiceItem(Model):
+    """Kill Bill invoice item"""
+
+    __slots__ = (
+        "invoice_item_id",
+        "invoice_id",
+        "linked_invoice_item_id",
+        "account_id",
+        "child_account_id",
+        "bundle_id",
+        "subscription_id",
+        "product_name",
+        "plan_name",
+        "phase_name",
+        "usage_name",
+        "pretty_product_name",
+        "pretty_plan_name",
+        "pretty_phase_name",
+        "pretty_usage_name",
+        "item_type",
+        "description",
+        "start_date",
+        "end_date",
+        "amount",
+        "rate",
+        "currency",
+        "quantity",
+        "item_details",
+        "catalog_effective_date",
+        "_child_items",
+        "_audit_logs",
+    )
+
+    _fields = (
+        "invoiceItemId",
+        "invoiceId",
+        "linkedInvoiceItemId",
+        "accountId",
+        "childAccountId",
+        "bundleId",
+        "subscriptionId",
+        "productName",
+        "planName",
+        "phaseName",
+        "usageName",
+        "prettyProductName",
+        "prettyPlanName",
+        "prettyPhaseName",
+        "prettyUsageName",
+        "itemType",
+        "description",
+        "startDate",
+        "endDate",
+        "amount",
+        "rate",
+        "currency",
+        "quantity",
+        "itemDetails",
+        "catalogEffectiveDate",
+    )
+
+    child_items = _Nested("childItems", "InvoiceItem")
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class Invoice(Model):
+    """Kill Bill invoice, with its items and credits"""
+
+    __slots__ = (
+        "invoice_id",
+        "account_id",
+        "invoice_number",
+        "invoice_date",
+        "target_date",
+        "amount",
+        "currency",
+        "status",
+        "credit_adj",
+        "refund_adj",
+        "balance",
+        "bundle_keys",
+        "tracking_ids",
+        "is_parent_invoice",
+        "parent_invoice_id",
+        "parent_account_id",
+        "_credits",
+        "_items",
+        "_audit_logs",
+    )
+
+    _fields = (
+        "invoiceId",
+        "accountId",
+        "invoiceNumber",
+        "invoiceDate",
+        "targetDate",
+        "amount",
+        "currency",
+        "status",
+        "creditAdj",
+        "refundAdj",
+        "balance",
+        "bundleKeys",
+        "trackingIds",
+        "isParentInvoice",
+        "parentInvoiceId",
+        "parentAccountId",
+    )
+
+    credits = _Nested("credits", "InvoiceItem")
+    items = _Nested("items", "InvoiceItem")
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class CustomField(Model):
+    """Custom field of a Kill Bill object"""
+
+    __slots__ = (
+        "custom_field_id",
+        "object_id",
+        "object_type",
+        "name",
+        "value",
+        "_audit_logs",
+    )
+
+    _fields = ("customFieldId", "objectId", "objectType", "name", "value")
+
+    audit_logs = _Nested("auditLogs", "AuditLog")
+
+
+class Tag(Model):
+    """Tag of a Kill Bill object"""
+
+    __slots__ = (
+        "tag_id",
+        "object_id",
+        "object_type",
+        "tag_definition_id",
+        "tag_definition_name",
+        "_audit_logs",
+    )
+
+    _fields = (
+        "tagId",
+        "objectId",
+        "objectType",
+        "tagDefinitionId",
+        "tagDefinitionName",
+    )
+
+    audit_logs = _Nested("auditLogs", "AuditLog")
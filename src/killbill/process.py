@@ -0,0 +1,167 @@
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Optional
+
+from killbill.bulk import BulkRun, BulkStats
+from killbill.header import Header
+
+# Client of the worker process, created once by `_start_worker`
+_client = None
+
+
+def _start_worker(client_kwargs: dict, transport_factory: Optional[Callable]):
+    from killbill.killbill import KillBillClient
+
+    global _client
+
+    if transport_factory is not None:
+        client_kwargs = {**client_kwargs, "transport": transport_factory()}
+
+    _client = KillBillClient(**client_kwargs)
+
+
+def _run_slice(func: Callable, header: Header, offset: int, size: int, threads: int):
+    """Run `func` over a slice of the accounts, in a worker process"""
+
+    accounts = list(
+        itertools.islice(
+            _client.account.iter_accounts(
+                header, limit=size, offset=offset, prefetch=False
+            ),
+            size,
+        )
+    )
+
+    results = BulkRun(lambda account: func(_client, header, account), accounts, threads)
+
+    return [(accounts[index]["accountId"], result) for index, result in results]
+
+
+class ProcessRun:
+    """Shard the accounts of a tenant across a pool of worker processes
+
+    The accounts pagination range is cut into slices of `slice_size`. Each
+    worker creates its own client, with its own connection pool, reads the
+    accounts of a slice and calls `func(killbill, header, account)` on them
+    with `threads` threads, so the decoding and transformation of the
+    responses is spread over the cores. Results come back one slice at a
+    time and at most `2 * processes` slices are in flight.
+
+    Iterating yields `(account_id, result)` tuples as the slices complete,
+    where `result` is the exception raised for failed accounts. `failed`
+    records the offsets of the slices which could not be read, with their
+    error; without `count`, the enumeration goes on past them and stops at
+    the first short slice read, or after `max_failures` slices failed in a
+    row, e.g. when the server is down. `stats` counts accounts.
+
+    `func` is sent to the workers, it must be a module-level function and
+    its results must be picklable.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        header: Header,
+        client_kwargs: dict,
+        count: Callable[[], Optional[int]] = None,
+        processes: int = None,
+        slice_size: int = 500,
+        threads: int = 4,
+        transport_factory: Callable = None,
+        max_failures: int = 3,
+    ):
+        if slice_size < 1:
+            raise ValueError("slice_size must be greater than 0")
+
+        self.func = func
+        self.header = header
+        self.client_kwargs = client_kwargs
+        self.count = count
+        self.processes = processes
+        self.slice_size = slice_size
+        self.threads = threads
+        self.transport_factory = transport_factory
+        self.max_failures = max_failures
+        self.stats = BulkStats()
+        self.failed = []
+
+    def _offsets(self):
+        """Return the slice offsets, and whether their end is known"""
+
+        total = self.count() if self.count is not None else None
+
+        if total is None:
+            return itertools.count(0, self.slice_size), False
+
+        return iter(range(0, total, self.slice_size)), True
+
+    def __iter__(self):
+        self.stats = BulkStats()
+        self.failed = []
+        offsets, bounded = self._offsets()
+        pending = {}
+        failures = 0
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_start_worker,
+            initargs=(
+                {**self.client_kwargs, "pool_maxsize": self.threads},
+                self.transport_factory,
+            ),
+        )
+
+        try:
+            in_flight = 2 * (self.processes or os.cpu_count() or 1)
+
+            while True:
+                for offset in offsets:
+                    future = executor.submit(
+                        _run_slice,
+                        self.func,
+                        self.header,
+                        offset,
+                        self.slice_size,
+                        self.threads,
+                    )
+                    pending[future] = offset
+                    if len(pending) >= in_flight:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    offset = pending.pop(future)
+
+                    try:
+                        results = future.result()
+                    except Exception as error:
+                        self.failed.append((offset, error))
+                        failures += 1
+                        if not bounded and failures >= self.max_failures:
+                            offsets = iter(())
+                        continue
+
+                    failures = 0
+
+                    # Without the count, slices are read until a short one
+                    if not bounded and len(results) < self.slice_size:
+                        offsets = iter(())
+
+                    for account_id, result in results:
+                        self.stats.submitted += 1
+                        if isinstance(result, Exception):
+                            self.stats.failed += 1
+                        else:
+                            self.stats.succeeded += 1
+                        yield account_id, result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self.stats.finished = time.monotonic()
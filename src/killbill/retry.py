@@ -0,0 +1,115 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+@dataclass
+class RetryPolicy:
+    """Retry policy for transient Kill Bill errors
+
+    Requests are retried on connection errors and on `retry_statuses`
+    responses. Only `retry_methods` are retried: Kill Bill does not
+    deduplicate POST requests, so they are retried only after a connection
+    error raised before the request was sent (see `Transport.unsent`).
+
+    Args:
+        max_attempts (int): Total number of attempts, including the first one.
+        backoff_factor (float): Base delay in seconds, doubled on each attempt.
+        max_backoff (float): Upper bound of a single delay in seconds, a
+            longer `Retry-After` stops the retries.
+        jitter (bool): Randomize each delay between 0 and the backoff (full jitter).
+        total_timeout (float, optional): Time budget in seconds for all attempts.
+        respect_retry_after (bool): Wait for the `Retry-After` response header
+            when present.
+    """
+
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    total_timeout: Optional[float] = None
+    respect_retry_after: bool = True
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_methods: Tuple[str, ...] = ("GET", "PUT", "DELETE")
+
+    def is_retryable(self, method: str, sent: bool = True) -> bool:
+        """Whether a request with this method may be sent again
+
+        Args:
+            sent (bool): Whether the failed attempt may have reached the server.
+        """
+
+        return method in self.retry_methods or not sent
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the next attempt, `attempt` being the one that failed"""
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        status_code: int = None,
+        response_headers=None,
+        sent: bool = True,
+    ) -> Optional[float]:
+        """Return the delay before retrying, or None to stop retrying
+
+        Args:
+            attempt (int): Number of the attempt that just failed.
+            elapsed (float): Seconds spent since the first attempt.
+            status_code (int, optional): Response status, None on connection errors.
+            sent (bool): False when the connection failed before the request
+                was sent.
+        """
+
+        if attempt >= self.max_attempts or not self.is_retryable(method, sent):
+            return None
+
+        if status_code is not None and status_code not in self.retry_statuses:
+            return None
+
+        delay = self.backoff(attempt)
+
+        if self.respect_retry_after and response_headers is not None:
+            retry_after = _parse_retry_after(response_headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.max_backoff:
+                    return None
+                delay = retry_after
+
+        if self.total_timeout is not None and elapsed + delay > self.total_timeout:
+            return None
+
+        return delay
+
+
+def _parse_retry_after(value: str = None) -> Optional[float]:
+    """Parse a `Retry-After` header given in seconds or as an HTTP date"""
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
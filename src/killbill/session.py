@@ -0,0 +1,35 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Create a connection-pooled session for the Kill Bill API
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept per host.
+        pool_block (bool): Wait for a free connection instead of opening an
+            extra one when the pool is exhausted.
+        keep_alive (bool): Reuse connections between requests.
+    """
+
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Mapping
+
+# Headers that identify a single call rather than the tenant, they are left
+# out of the key so that otherwise identical requests are still coalesced
+_CALL_HEADERS = frozenset(
+    (
+        "X-Request-Id",
+        "X-Killbill-CreatedBy",
+        "X-Killbill-Reason",
+        "X-Killbill-Comment",
+    )
+)
+
+_UNSET = object()
+
+
+def request_key(endpoint: str, params: dict, headers: Mapping) -> tuple:
+    """Return the key identifying identical GET requests"""
+
+    return (
+        endpoint,
+        tuple(
+            sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in (params or {}).items()
+            )
+        ),
+        tuple(
+            sorted(
+                (name, value)
+                for name, value in headers.items()
+                if name not in _CALL_HEADERS
+            )
+        ),
+    )
+
+
+class SharedResponse:
+    """Response shared by coalesced requests
+
+    Proxies the transport response and decodes its JSON body only once, with
+    `loads`, so every caller receives the same decoded object. Callers should
+    treat it as read-only.
+    """
+
+    def __init__(self, response, loads: Callable):
+        self._response = response
+        self._loads = loads
+        self._json = _UNSET
+        self._lock = threading.Lock()
+
+    def json(self):
+        if self._json is _UNSET:
+            with self._lock:
+                if self._json is _UNSET:
+                    self._json = self._loads(self._response.content)
+
+        return self._json
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class SingleFlight:
+    """Share one in-flight call between identical concurrent calls
+
+    The first caller of a key runs the call, callers arriving while it is in
+    flight wait for it and receive its result or exception. Nothing is cached
+    once the call has returned.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: tuple, func: Callable):
+        """Run `func`, or wait for the identical call already in flight"""
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = func()
+        except BaseException as error:
+            self._forget(key)
+            call.set_exception(error)
+            raise
+
+        self._forget(key)
+        call.set_result(result)
+
+        return result
+
+    def _forget(self, key: tuple):
+        with self._lock:
+            del self._calls[key]
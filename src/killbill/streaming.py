@@ -0,0 +1,126 @@
+import codecs
+import json
+from typing import AsyncIterable, Iterable
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]" + _WHITESPACE
+
+# Parser states: what the next significant character may be
+_OPEN, _FIRST, _VALUE, _SEPARATOR, _DONE = range(5)
+
+
+class JsonArrayParser:
+    """Incremental parser of a JSON array
+
+    Bytes are fed as they are received and the elements of the array are
+    returned as soon as they are complete. Only the element being parsed is
+    kept in memory, whatever the size of the array.
+
+    An unfinished element is decoded again only once its buffered text has
+    doubled, so a large element costs a linear number of decoded bytes
+    whatever the size of the chunks.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _OPEN
+        # Length of the unfinished element below which it is not decoded again
+        self._retry_at = 0
+
+    def feed(self, chunk: bytes) -> list:
+        """Parse a chunk of the body and return the completed elements"""
+
+        self._buffer += self._utf8.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        """Parse the end of the body and return the last elements"""
+
+        self._buffer += self._utf8.decode(b"", final=True)
+        elements = self._parse(final=True)
+
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON array")
+
+        return elements
+
+    def _parse(self, final: bool) -> list:
+        buffer = self._buffer
+        end = len(buffer)
+        position = 0
+        elements = []
+
+        while self._state != _DONE:
+            while position < end and buffer[position] in _WHITESPACE:
+                position += 1
+
+            if position == end:
+                break
+
+            char = buffer[position]
+
+            if self._state == _OPEN:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self._state = _FIRST
+                position += 1
+            elif char == "]" and self._state in (_FIRST, _SEPARATOR):
+                self._state = _DONE
+                position += 1
+            elif self._state == _SEPARATOR:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' at {char!r}")
+                self._state = _VALUE
+                position += 1
+            else:
+                if not final and end - position < self._retry_at:
+                    break
+
+                try:
+                    element, stop = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    self._retry_at = 2 * (end - position)
+                    break
+
+                # A number may go on in the next chunk until a delimiter is read
+                if not final and (stop == end or buffer[stop] not in _DELIMITERS):
+                    self._retry_at = end - position + 1
+                    break
+
+                self._retry_at = 0
+                elements.append(element)
+                self._state = _SEPARATOR
+                position = stop
+
+        if position:
+            self._buffer = buffer[position:]
+
+        return elements
+
+
+def iter_json_array(chunks: Iterable[bytes]):
+    """Yield the elements of a JSON array body as they are parsed"""
+
+    parser = JsonArrayParser()
+
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]):
+    """Asynchronous counterpart of `iter_json_array`"""
+
+    parser = JsonArrayParser()
+
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+
+    for element in parser.close():
+        yield element
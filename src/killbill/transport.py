@@ -0,0 +1,414 @@
+import json as jsonlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    import requests
+
+# requests and httpx are imported when a transport is created, keeping
+# `import killbill` cheap for short-lived processes
+
+
+def _drop_none(values: dict = None):
+    """Remove the None values that requests would silently skip"""
+
+    if values is None:
+        return None
+
+    return {key: value for key, value in values.items() if value is not None}
+
+
+@dataclass
+class Request:
+    """Request handed to an in-process handler"""
+
+    method: str
+    url: str
+    headers: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    json: object = None
+    data: object = None
+    auth: Optional[Tuple[str, str]] = None
+
+    def __post_init__(self):
+        # The client sends encoded JSON bodies, decode them for the handlers
+        if (
+            self.json is None
+            and isinstance(self.data, bytes)
+            and self.headers.get("Content-Type") == "application/json"
+        ):
+            self.json = jsonlib.loads(self.data)
+
+    @property
+    def path(self) -> str:
+        """Path of the url, e.g. `/1.0/kb/accounts`"""
+
+        return urlparse(self.url).path
+
+
+class Response:
+    """Response returned by an in-process handler
+
+    Args:
+        status_code (int): HTTP status code.
+        body: A `dict` or `list` encoded as JSON, a `str` or `bytes`.
+        headers (dict, optional): Response headers.
+    """
+
+    def __init__(self, status_code: int = 200, body=None, headers: dict = None):
+        from requests.structures import CaseInsensitiveDict
+
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+
+        if body is None:
+            body = b""
+        elif isinstance(body, (dict, list)):
+            body = jsonlib.dumps(body).encode()
+            self.headers.setdefault("Content-Type", "application/json")
+        elif isinstance(body, str):
+            body = body.encode()
+
+        self.content = body
+
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8"""
+
+        return self.content.decode()
+
+    def json(self):
+        """Body decoded as JSON"""
+
+        return jsonlib.loads(self.content)
+
+    def close(self):
+        """Release the response, nothing to do in process"""
+
+
+class Transport:
+    """Base class of the transports used by `KillBillClient`
+
+    A transport sends one request and returns a response object exposing
+    `status_code`, `headers`, `content`, `text` and `json()`.
+    """
+
+    # Exceptions raised when the server could not be reached, used to retry
+    connection_errors: Tuple[type, ...] = (ConnectionError,)
+
+    # Connection errors raised before the request was sent, after which even
+    # a POST is retried
+    unsent_errors: Tuple[type, ...] = (ConnectionRefusedError,)
+
+    def unsent(self, error: Exception) -> bool:
+        """Whether a connection error was raised before the request was sent"""
+
+        return isinstance(error, self.unsent_errors)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        """Send a request and return the response"""
+
+        raise NotImplementedError
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        """Send a request whose body is then read with `iter_bytes`
+
+        Error responses are read entirely so their body can be decoded.
+        Transports which cannot stream return a buffered response.
+        """
+
+        return self.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            json=json,
+            data=data,
+            timeout=timeout,
+            auth=auth,
+        )
+
+    def iter_bytes(self, response, chunk_size: int = 65536):
+        """Yield the body of a streamed response, then release it"""
+
+        try:
+            yield response.content
+        finally:
+            response.close()
+
+    def close(self):
+        """Release the transport resources"""
+
+
+class RequestsTransport(Transport):
+    """Transport backed by a connection-pooled `requests.Session`
+
+    Args:
+        session (requests.Session, optional): Session to use, a pooled one is
+            created from the remaining arguments when None.
+    """
+
+    def __init__(
+        self,
+        session: "requests.Session" = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ):
+        import requests
+
+        from killbill.session import create_session
+
+        if session is None:
+            session = create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+            )
+
+        self.session = session
+        self.connection_errors = (requests.ConnectionError, requests.Timeout)
+        self.unsent_errors = (requests.ConnectTimeout,)
+
+    def unsent(self, error: Exception) -> bool:
+        """Whether a connection error was raised before the request was sent
+
+        requests reports a refused connection as a `ConnectionError` wrapping
+        the urllib3 connection error, which is looked up in its reason.
+        """
+
+        from urllib3.exceptions import ConnectTimeoutError
+
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+
+        return isinstance(error, self.unsent_errors) or isinstance(
+            reason, ConnectTimeoutError
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        return self.session.request(
+            method,
+            url,
+            json=json,
+            data=data,
+            timeout=timeout,
+            auth=auth,
+            headers=headers,
+            params=params,
+        )
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        response = self.session.request(
+            method,
+            url,
+            json=json,
+            data=data,
+            timeout=timeout,
+            auth=auth,
+            headers=headers,
+            params=params,
+            stream=True,
+        )
+
+        # Read error bodies so they can be decoded, releasing the connection
+        if response.status_code >= 400:
+            response.content
+
+        return response
+
+    def iter_bytes(self, response, chunk_size: int = 65536):
+        try:
+            yield from response.iter_content(chunk_size)
+        finally:
+            response.close()
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxTransport(Transport):
+    """Transport backed by `httpx.Client`, with HTTP/2 support
+
+    Requires `pip install python-killbill-client[http2]`.
+
+    Args:
+        http2 (bool): Negotiate HTTP/2 with the server.
+        max_connections (int): Maximum number of concurrent connections.
+        max_keepalive_connections (int): Maximum number of idle connections.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        client (httpx.Client, optional): Client to use instead of creating one.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        client=None,
+    ):
+        import httpx
+
+        if client is None:
+            client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+
+        self.client = client
+        self.connection_errors = (httpx.TransportError,)
+        self.unsent_errors = (
+            httpx.ConnectError,
+            httpx.ConnectTimeout,
+            httpx.PoolTimeout,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        return self.client.request(
+            method,
+            url,
+            json=json,
+            content=data,
+            timeout=timeout,
+            auth=auth,
+            headers=_drop_none(headers),
+            params=_drop_none(params),
+        )
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        request = self.client.build_request(
+            method,
+            url,
+            json=json,
+            content=data,
+            timeout=timeout,
+            headers=_drop_none(headers),
+            params=_drop_none(params),
+        )
+        response = self.client.send(request, auth=auth, stream=True)
+
+        # Read error bodies so they can be decoded, releasing the connection
+        if response.status_code >= 400:
+            response.read()
+
+        return response
+
+    def iter_bytes(self, response, chunk_size: int = 65536):
+        try:
+            yield from response.iter_bytes(chunk_size)
+        finally:
+            response.close()
+
+    def close(self):
+        self.client.close()
+
+
+class InProcessTransport(Transport):
+    """Transport calling a Python handler instead of opening sockets
+
+    Useful to test and benchmark billing code against an in-memory Kill
+    Bill stand-in.
+
+    Example:
+    ```python
+    def handler(request: Request) -> Response:
+        if request.method == "POST" and request.path == "/1.0/kb/accounts":
+            return Response(201, headers={"Location": "/1.0/kb/accounts/1234"})
+        return Response(404, {"message": "not found"})
+
+    killbill = KillBillClient("admin", "password", transport=InProcessTransport(handler))
+    ```
+    """
+
+    def __init__(self, handler: Callable[[Request], Response]):
+        self.handler = handler
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json=None,
+        data=None,
+        timeout: float = None,
+        auth: Tuple[str, str] = None,
+    ):
+        return self.handler(
+            Request(
+                method=method,
+                url=url,
+                headers=_drop_none(headers) or {},
+                params=_drop_none(params) or {},
+                json=json,
+                data=data,
+                auth=auth,
+            )
+        )
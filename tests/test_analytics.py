@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from killbill.analytics import RevenueData  # noqa: E402
+
+MONTHS = ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01", "2024-05-01"]
+
+
+def invoice(start, end, amount):
+    return {
+        "accountId": "account",
+        "currency": "USD",
+        "status": "COMMITTED",
+        "invoiceDate": start,
+        "amount": amount,
+        "balance": 0.0,
+        "items": [
+            {
+                "currency": "USD",
+                "itemType": "RECURRING",
+                "planName": "standard-monthly",
+                "amount": amount,
+                "startDate": start,
+                "endDate": end,
+            }
+        ],
+    }
+
+
+def test_flat_monthly_plan_has_constant_mrr():
+    data = RevenueData()
+    data.extend(invoice(start, end, 100.0) for start, end in zip(MONTHS, MONTHS[1:]))
+
+    for day in ("2024-01-15", "2024-02-15", "2024-03-31", "2024-04-30"):
+        assert data.mrr(day) == {("USD",): pytest.approx(100.0)}
+        assert data.arr(day) == {("USD",): pytest.approx(1200.0)}
+
+
+def test_annual_plan_is_spread_over_twelve_months():
+    data = RevenueData()
+    data.add_invoice(invoice("2024-02-29", "2025-02-28", 1200.0))
+
+    assert data.mrr("2024-07-01") == {("USD",): pytest.approx(100.0)}
+
+
+def test_partial_period_is_prorated_by_days():
+    data = RevenueData()
+    data.add_invoice(invoice("2024-01-15", "2024-02-01", 100.0 * 17 / 31))
+
+    assert data.mrr("2024-01-20") == {("USD",): pytest.approx(100.0)}
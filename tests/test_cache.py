@@ -0,0 +1,46 @@
+from killbill import EntityCache, Header, InProcessTransport, KillBillClient
+from killbill.transport import Response
+
+HEADER = Header("api-key", "api-secret", "tests")
+
+SUBSCRIPTION = {"subscriptionId": "sub", "bundleId": "bundle", "state": "ACTIVE"}
+
+
+def test_stale_generation_is_not_stored():
+    cache = EntityCache()
+    generation = cache.generation("api-key")
+
+    cache.invalidate("api-key", "sub")
+    cache.set(("api-key", "subscriptions", "sub"), SUBSCRIPTION, generation)
+
+    assert cache.get(("api-key", "subscriptions", "sub")) is None
+
+
+def test_other_tenants_keep_their_generation():
+    cache = EntityCache()
+    generation = cache.generation("api-key")
+
+    cache.invalidate("other-key", "sub")
+    cache.set(("api-key", "subscriptions", "sub"), SUBSCRIPTION, generation)
+
+    assert cache.get(("api-key", "subscriptions", "sub")) == SUBSCRIPTION
+
+
+def test_retrieve_racing_a_mutation_is_not_cached():
+    cache = EntityCache()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        # A concurrent cancel lands while the GET is in flight
+        killbill.subscription._invalidate_entity(HEADER, "sub")
+        return Response(200, SUBSCRIPTION)
+
+    killbill = KillBillClient(
+        "admin", "password", transport=InProcessTransport(handler), entity_cache=cache
+    )
+
+    killbill.subscription.retrieve(HEADER, "sub")
+    killbill.subscription.retrieve(HEADER, "sub")
+
+    assert len(calls) == 2
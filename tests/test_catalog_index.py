@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from killbill import Catalog, CatalogIndex, Header, InProcessTransport, KillBillClient
+from killbill.aio import AsyncKillBillClient
+from killbill.aio.transport import AsyncInProcessTransport
+from killbill.exceptions import CatalogValidationError
+from killbill.transport import Response
+
+HEADER = Header("api-key", "api-secret", "tests")
+
+VERSION = "2024-01-01T00:00:00.000Z"
+
+CATALOG = {
+    "effectiveDate": VERSION,
+    "products": [
+        {
+            "name": "Standard",
+            "type": "BASE",
+            "plans": [{"name": "standard-monthly", "billingPeriod": "MONTHLY"}],
+        }
+    ],
+}
+
+
+def catalog_server(versions, calls):
+    def handler(request):
+        calls.append((request.method, request.path))
+        if request.path.endswith("/catalog/versions"):
+            return Response(200, versions)
+        return Response(
+            201, headers={"Location": "/1.0/kb/subscriptions/subscription-id"}
+        )
+
+    return handler
+
+
+def indexed():
+    index = CatalogIndex()
+    index.set(HEADER.api_key, Catalog.from_json(CATALOG))
+    return index
+
+
+def test_valid_subscription_is_not_checked_remotely():
+    calls = []
+    killbill = KillBillClient(
+        "admin",
+        "password",
+        transport=InProcessTransport(catalog_server([VERSION], calls)),
+        catalog_index=indexed(),
+    )
+
+    killbill.subscription.create(HEADER, "account-id", "standard-monthly")
+
+    assert [method for method, _ in calls] == ["POST"]
+
+
+def test_unknown_plan_rejected_when_catalog_unchanged():
+    calls = []
+    killbill = KillBillClient(
+        "admin",
+        "password",
+        transport=InProcessTransport(catalog_server([VERSION], calls)),
+        catalog_index=indexed(),
+    )
+
+    with pytest.raises(CatalogValidationError):
+        killbill.subscription.create(HEADER, "account-id", "premium-monthly")
+
+    assert [method for method, _ in calls] == ["GET"]
+
+
+def test_unknown_plan_sent_when_catalog_changed():
+    calls = []
+    index = indexed()
+    killbill = KillBillClient(
+        "admin",
+        "password",
+        transport=InProcessTransport(
+            catalog_server([VERSION, "2024-06-01T00:00:00.000Z"], calls)
+        ),
+        catalog_index=index,
+    )
+
+    killbill.subscription.create(HEADER, "account-id", "premium-monthly")
+
+    assert [method for method, _ in calls] == ["GET", "POST"]
+    assert index.get(HEADER.api_key) is None
+
+
+def test_async_unknown_plan_sent_when_catalog_changed():
+    calls = []
+
+    async def create():
+        killbill = AsyncKillBillClient(
+            "admin",
+            "password",
+            transport=AsyncInProcessTransport(
+                catalog_server([VERSION, "2024-06-01T00:00:00.000Z"], calls)
+            ),
+            catalog_index=indexed(),
+        )
+        await killbill.subscription.create(HEADER, "account-id", "premium-monthly")
+
+    asyncio.run(create())
+
+    assert [method for method, _ in calls] == ["GET", "POST"]
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+from killbill import Header, InProcessTransport, KillBillClient
+from killbill.aio import AsyncKillBillClient
+from killbill.aio.transport import AsyncInProcessTransport
+from killbill.transport import Response
+
+HEADER = Header("api-key", "api-secret", "tests")
+
+CALLERS = 5
+
+
+def catalog_handler(calls):
+    def handler(request):
+        calls.append(request)
+        time.sleep(0.2)
+        return Response(200, [{"name": "catalog", "products": []}])
+
+    return handler
+
+
+def retrieve_concurrently(killbill, **kwargs):
+    barrier = threading.Barrier(CALLERS)
+    results = []
+
+    def retrieve():
+        barrier.wait()
+        results.append(killbill.catalog.retrieve(HEADER, **kwargs))
+
+    threads = [threading.Thread(target=retrieve) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def test_catalog_retrieve_is_coalesced():
+    calls = []
+    killbill = KillBillClient(
+        "admin",
+        "password",
+        coalesce=True,
+        transport=InProcessTransport(catalog_handler(calls)),
+    )
+
+    results = retrieve_concurrently(killbill, requested_date="2024-01-01")
+
+    assert len(calls) == 1
+    assert calls[0].params == {"requestedDate": "2024-01-01"}
+    assert len(results) == CALLERS
+
+
+def test_catalog_retrieve_without_coalesce():
+    calls = []
+    killbill = KillBillClient(
+        "admin", "password", transport=InProcessTransport(catalog_handler(calls))
+    )
+
+    retrieve_concurrently(killbill)
+
+    assert len(calls) == CALLERS
+
+
+def test_async_catalog_retrieve_is_coalesced():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.2)
+        return Response(200, [{"name": "catalog", "products": []}])
+
+    async def main():
+        killbill = AsyncKillBillClient(
+            "admin",
+            "password",
+            coalesce=True,
+            transport=AsyncInProcessTransport(handler),
+        )
+        return await asyncio.gather(
+            *(killbill.catalog.retrieve(HEADER) for _ in range(CALLERS))
+        )
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert len(results) == CALLERS
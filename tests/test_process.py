@@ -0,0 +1,33 @@
+from killbill import Header, InProcessTransport
+from killbill.process import ProcessRun
+from killbill.transport import Response
+
+HEADER = Header("api-key", "api-secret", "tests")
+
+
+def server_error(request):
+    return Response(500, {"message": "unavailable"})
+
+
+def failing_transport():
+    return InProcessTransport(server_error)
+
+
+def account_id(killbill, header, account):
+    return account["accountId"]
+
+
+def test_unbounded_run_stops_when_every_slice_fails():
+    run = ProcessRun(
+        account_id,
+        HEADER,
+        {"username": "admin", "password": "password"},
+        processes=2,
+        slice_size=10,
+        threads=1,
+        transport_factory=failing_transport,
+    )
+
+    assert list(run) == []
+    assert run.max_failures <= len(run.failed) < run.max_failures + 4
+    assert all(error is not None for _, error in run.failed)
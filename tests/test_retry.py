@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from killbill.retry import RetryPolicy, _parse_retry_after
+
+
+def policy(**kwargs):
+    return RetryPolicy(jitter=False, **kwargs)
+
+
+def test_backoff_doubles_up_to_max_backoff():
+    retry = policy(max_attempts=10, backoff_factor=0.5, max_backoff=3.0)
+
+    delays = [retry.next_delay("GET", attempt, 0.0) for attempt in range(1, 6)]
+
+    assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_jitter_stays_below_backoff():
+    retry = RetryPolicy(backoff_factor=1.0)
+
+    assert all(0 <= retry.next_delay("GET", 2, 0.0) <= 2.0 for _ in range(100))
+
+
+def test_stops_after_max_attempts():
+    retry = policy(max_attempts=3)
+
+    assert retry.next_delay("GET", 2, 0.0) is not None
+    assert retry.next_delay("GET", 3, 0.0) is None
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+def test_retry_statuses(status_code):
+    assert policy().next_delay("GET", 1, 0.0, status_code) == 0.5
+
+
+@pytest.mark.parametrize("status_code", [400, 404, 409])
+def test_client_errors_not_retried(status_code):
+    assert policy().next_delay("GET", 1, 0.0, status_code) is None
+
+
+def test_post_retried_only_when_unsent():
+    retry = policy()
+
+    assert retry.next_delay("POST", 1, 0.0, 503) is None
+    assert retry.next_delay("POST", 1, 0.0) is None
+    assert retry.next_delay("POST", 1, 0.0, sent=False) == 0.5
+
+
+def test_total_timeout():
+    retry = policy(total_timeout=2.0)
+
+    assert retry.next_delay("GET", 1, 1.0) == 0.5
+    assert retry.next_delay("GET", 1, 1.8) is None
+
+
+def test_retry_after_replaces_backoff():
+    retry = policy()
+
+    assert retry.next_delay("GET", 1, 0.0, 503, {"Retry-After": "7"}) == 7.0
+
+
+def test_retry_after_ignored_when_disabled():
+    retry = policy(respect_retry_after=False)
+
+    assert retry.next_delay("GET", 1, 0.0, 503, {"Retry-After": "7"}) == 0.5
+
+
+def test_retry_after_longer_than_max_backoff_stops():
+    retry = policy(max_backoff=30.0)
+
+    assert retry.next_delay("GET", 1, 0.0, 429, {"Retry-After": "3600"}) is None
+
+
+def test_retry_after_bounded_by_total_timeout():
+    retry = policy(total_timeout=5.0)
+
+    assert retry.next_delay("GET", 1, 0.0, 503, {"Retry-After": "10"}) is None
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("120", 120.0), ("1.5", 1.5), ("-3", 0.0), (None, None), ("", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert _parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    date = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    assert 55 <= _parse_retry_after(format_datetime(date, usegmt=True)) <= 60
+
+
+def test_parse_retry_after_past_date():
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_parse_retry_after_invalid():
+    assert _parse_retry_after("soon") is None
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from killbill.streaming import JsonArrayParser, aiter_json_array, iter_json_array
+
+ELEMENTS = [
+    {"accountId": "a1", "name": "Zoë [x] {y}", "notes": 'say "hi" \\ ,]'},
+    [1, [2, [3]], {}],
+    -12.5e3,
+    120,
+    "plain, string]",
+    True,
+    None,
+    {"nested": {"items": [{"amount": 1.5}, {"amount": 0}]}},
+]
+
+BODY = json.dumps(ELEMENTS, ensure_ascii=False, indent=1).encode()
+
+
+def split(body, size):
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+def test_chunk_sizes(size):
+    assert list(iter_json_array(split(BODY, size))) == ELEMENTS
+
+
+def test_every_split_point():
+    for cut in range(len(BODY) + 1):
+        assert list(iter_json_array([BODY[:cut], BODY[cut:]])) == ELEMENTS
+
+
+def test_number_at_chunk_boundary():
+    assert list(iter_json_array([b"[12", b"34, 5", b"6]"])) == [1234, 56]
+
+
+def test_elements_returned_once_complete():
+    parser = JsonArrayParser()
+
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b": 2}") == []
+    assert parser.feed(b", 3") == [{"b": 2}]
+    assert parser.feed(b"]") == [3]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize("body", [b"[]", b" [ ] ", b"[\n]"])
+def test_empty_array(body):
+    assert list(iter_json_array(split(body, 1))) == []
+
+
+@pytest.mark.parametrize("body", [b"", b"[1, 2", b'[{"a": 1}', b"[1,"])
+def test_truncated_body(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"a": 1}']))
+
+
+def test_large_element_decoded_a_linear_number_of_times():
+    element = {"items": [{"invoiceItemId": str(index)} for index in range(20000)]}
+    body = json.dumps([element]).encode()
+    parser = JsonArrayParser()
+    decoder = parser._decoder
+    decoded = []
+
+    def raw_decode(text, position):
+        decoded.append(len(text) - position)
+        return decoder.raw_decode(text, position)
+
+    parser._decoder = type("Decoder", (), {"raw_decode": staticmethod(raw_decode)})
+    elements = []
+    for chunk in split(body, 1024):
+        elements += parser.feed(chunk)
+    elements += parser.close()
+
+    assert elements == [element]
+    assert sum(decoded) < 4 * len(body)
+
+
+def test_async_chunks():
+    async def chunks():
+        for chunk in split(BODY, 5):
+            yield chunk
+
+    async def collect():
+        return [element async for element in aiter_json_array(chunks())]
+
+    assert asyncio.run(collect()) == ELEMENTS